@@ -0,0 +1,85 @@
+"""
+Count the adAnalytics requests issued by `sync_ad_analytics` for one campaign over 90 days, with the
+seed `dateRange`/`pivotValues` request of every date window as before and with `plan_analytics_chunks`.
+
+Usage: python benchmarks/bench_analytics_requests.py
+"""
+import contextlib
+import datetime
+import io
+import logging
+from unittest import mock
+
+from singer import metadata
+from singer.catalog import Catalog, CatalogEntry, Schema
+
+from tap_linkedin_ads.schema import get_schemas
+from tap_linkedin_ads.streams import (ANALYTICS_KEY_FIELDS, MAX_CHUNK_LENGTH, STREAMS, get_analytics_fields,
+                                      split_into_chunks)
+
+STREAM_NAME = 'ad_analytics_by_campaign'
+SYNC_DAYS = 90
+DATE_WINDOW_SIZE = 30
+
+
+class CountingClient:
+    # Returns a record of the window start with the requested fields, and counts the requests
+    profiler = None
+    analytics_cache = None
+
+    def __init__(self):
+        self.request_count = 0
+
+    def get(self, url, endpoint):
+        self.request_count += 1
+        start = {'year': url.params['dateRange.start.year'], 'month': url.params['dateRange.start.month'],
+                 'day': url.params['dateRange.start.day']}
+        fields = url.params['fields'].split(',')
+        return {'elements': [{**{field: 1 for field in fields}, 'dateRange': {'start': start},
+                              'pivotValues': ['urn:li:sponsoredCampaign:1']}]}
+
+
+def legacy_plan_analytics_chunks(fields, chunk_length, available_fields=()):
+    # One `dateRange`/`pivotValues` request plus one request per chunk of fields
+    return [list(ANALYTICS_KEY_FIELDS)] + [list(chunk) + ANALYTICS_KEY_FIELDS
+                                           for chunk in split_into_chunks(fields, chunk_length)]
+
+
+def make_catalog(schema, field_metadata, field_count):
+    mdata = metadata.to_map(field_metadata)
+    fields = [field for field in schema['properties'] if mdata[('properties', field)].get('inclusion') == 'available']
+    for field in fields[:field_count]:
+        mdata[('properties', field)]['selected'] = True
+    for field in fields[field_count:]:
+        mdata[('properties', field)]['selected'] = False
+    return Catalog(streams=[CatalogEntry(stream=STREAM_NAME, tap_stream_id=STREAM_NAME, schema=Schema.from_dict(schema),
+                                         metadata=metadata.to_list(mdata))])
+
+
+def count_requests(catalog):
+    client = CountingClient()
+    start = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=SYNC_DAYS)
+    with contextlib.redirect_stdout(io.StringIO()):
+        STREAMS[STREAM_NAME]().with_params({'campaigns[0]': 'urn:li:sponsoredCampaign:1'}).sync_ad_analytics(
+            client, catalog, start.strftime('%Y-%m-%dT00:00:00Z'), DATE_WINDOW_SIZE, parent_id=1)
+    return client.request_count
+
+
+def main():
+    logging.disable(logging.INFO)
+    schemas, field_metadata = get_schemas()
+    schema, stream_metadata = schemas[STREAM_NAME], field_metadata[STREAM_NAME]
+
+    print('requests per campaign over {} days, {} day windows'.format(SYNC_DAYS, DATE_WINDOW_SIZE))
+    print('{:>16} {:>8} {:>8} {:>8}'.format('selected fields', 'legacy', 'planned', 'saved'))
+    for field_count in (1, 10, 18, 36, 50, len(schema['properties'])):
+        catalog = make_catalog(schema, stream_metadata, field_count)
+        with mock.patch('tap_linkedin_ads.streams.plan_analytics_chunks', legacy_plan_analytics_chunks):
+            legacy = count_requests(catalog)
+        planned = count_requests(catalog)
+        selected = len(get_analytics_fields(catalog, STREAM_NAME))
+        print('{:>16} {:>8} {:>8} {:>7.0%}'.format(selected, legacy, planned, 1 - planned / legacy))
+
+
+if __name__ == '__main__':
+    main()
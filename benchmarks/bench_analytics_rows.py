@@ -0,0 +1,60 @@
+"""
+Compare the memory held by merged analytics records as dicts and as AnalyticsRow.
+
+Usage: python benchmarks/bench_analytics_rows.py [row count]
+"""
+import sys
+import tracemalloc
+
+from tap_linkedin_ads.streams import AnalyticsMerger, MAX_CHUNK_LENGTH, plan_analytics_chunks
+
+FIELDS = ['metric{}'.format(i) for i in range(50)]
+
+
+def make_pages(chunks, row_count):
+    # One page per chunk, the keys are the same in every chunk
+    for chunk in chunks:
+        yield [{**{field: 1 for field in chunk},
+                'dateRange': {'start': {'year': 2024, 'month': 1 + i // 28 % 12, 'day': 1 + i % 28}},
+                'pivotValues': ['urn:li:sponsoredCreative:{}'.format(i // 336)]}
+               for i in range(row_count)]
+
+
+def measure(merge, chunks, row_count):
+    tracemalloc.start()
+    merged = merge(chunks, make_pages(chunks, row_count))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del merged
+    return current
+
+
+def merge_dicts(chunks, pages):
+    full_records = {}
+    for page in pages:
+        for element in page:
+            start = element['dateRange']['start']
+            primary_key = (element['pivotValues'][0], '{}-{}-{}'.format(start['year'], start['month'], start['day']))
+            full_records.setdefault(primary_key, {}).update(element)
+    return full_records
+
+
+def merge_rows(chunks, pages):
+    merger = AnalyticsMerger('CREATIVE', len(chunks), [field for chunk in chunks for field in chunk])
+    for chunk_index, page in enumerate(pages):
+        merger.add_page(chunk_index, page)
+    return merger.pending
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    chunks = plan_analytics_chunks(FIELDS, MAX_CHUNK_LENGTH)
+    dict_bytes = measure(merge_dicts, chunks, row_count)
+    row_bytes = measure(merge_rows, chunks, row_count)
+    print('rows: {}, fields: {}'.format(row_count, len(FIELDS)))
+    print('dict records:  {:>8.0f} bytes/row'.format(dict_bytes / row_count))
+    print('AnalyticsRow:  {:>8.0f} bytes/row'.format(row_bytes / row_count))
+
+
+if __name__ == '__main__':
+    main()
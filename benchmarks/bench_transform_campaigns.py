@@ -0,0 +1,103 @@
+"""
+Compare the time to transform campaigns with large targeting before and after `flatten_facets`,
+and check that both give the same records.
+
+Usage: python benchmarks/bench_transform_campaigns.py [facet count]
+"""
+import copy
+import json
+import sys
+import timeit
+
+from tap_linkedin_ads.transform import string_to_decimal, transform_campaigns
+
+
+def legacy_flatten(or_dict):
+    # The facet keys are listed again for every facet
+    flattened = []
+    ky_cnt = 0
+    num = len(or_dict) - 1
+    while ky_cnt <= num:
+        key = list(or_dict)[ky_cnt]
+        if isinstance(or_dict[key], list):
+            if isinstance(or_dict[key][0], str):
+                val = or_dict[key]
+            elif isinstance(or_dict[key][0], dict):
+                val = []
+                for value in or_dict[key]:
+                    val.append('{}'.format(value))
+        elif isinstance(or_dict[key], dict):
+            val = []
+            val.append('{}'.format(or_dict[key]))
+        flattened.append({'type': key, 'values': val})
+        ky_cnt = ky_cnt + 1
+    return flattened
+
+
+def legacy_transform_campaigns(data_dict):
+    for currency_field in ['daily_budget', 'unit_cost']:
+        val = data_dict.get(currency_field, {}).get('amount')
+        if val:
+            data_dict[currency_field]['amount'] = string_to_decimal(val)
+
+    targeting = data_dict['targeting']
+    for section in ('excluded_targeting_facets', 'included_targeting_facets'):
+        or_dict = targeting.get(section, {})
+        del targeting[section]
+        targeting[section] = legacy_flatten(or_dict)
+
+    targeting_criteria = data_dict['targeting_criteria']
+    or_dict = targeting_criteria.get('exclude', {}).get('or', {})
+    del targeting_criteria['exclude']
+    targeting_criteria['exclude'] = legacy_flatten(or_dict)
+
+    for and_criteria in targeting_criteria.get('include', {}).get('and', {}):
+        or_dict = and_criteria.pop('or', {})
+        for facet in legacy_flatten(or_dict):
+            and_criteria['type'] = facet['type']
+            and_criteria['values'] = facet['values']
+    return data_dict
+
+
+def make_campaign(facet_count):
+    def facets(prefix):
+        # URN lists, with a few facets of dicts such as the audience size facets
+        return {'urn:li:adTargetingFacet:{}{}'.format(prefix, i):
+                [{'min': i, 'max': i * 10}] if i % 10 == 0 else
+                ['urn:li:organization:{}'.format(i * 100 + j) for j in range(20)]
+                for i in range(facet_count)}
+
+    return {
+        'daily_budget': {'amount': '25.00', 'currency_code': 'USD'},
+        'unit_cost': {'amount': '8.19', 'currency_code': 'USD'},
+        'targeting': {'excluded_targeting_facets': facets('excluded'),
+                      'included_targeting_facets': facets('included')},
+        'targeting_criteria': {'exclude': {'or': facets('exclude')},
+                               'include': {'and': [{'or': {key: value}} for key, value
+                                                   in facets('include').items()]}},
+    }
+
+
+def measure(transform, campaign, number):
+    campaigns = [copy.deepcopy(campaign) for _ in range(number)]
+    return timeit.timeit(lambda: transform(campaigns.pop()), number=number) / number
+
+
+def main():
+    facet_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    campaign = make_campaign(facet_count)
+
+    legacy_record = json.dumps(legacy_transform_campaigns(copy.deepcopy(campaign)), default=str)
+    record = json.dumps(transform_campaigns(copy.deepcopy(campaign)), default=str)
+    assert legacy_record == record, 'The transformed campaigns differ'
+
+    number = 20
+    legacy_time = measure(legacy_transform_campaigns, campaign, number)
+    flatten_time = measure(transform_campaigns, campaign, number)
+    print('facets per section: {}'.format(facet_count))
+    print('legacy:          {:>8.3f} ms/campaign'.format(legacy_time * 1000))
+    print('flatten_facets:  {:>8.3f} ms/campaign'.format(flatten_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
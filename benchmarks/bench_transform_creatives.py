@@ -0,0 +1,71 @@
+"""
+Compare the time to transform creatives with large variables before and after the linear
+`transform_creatives`, and check that both give the same records.
+
+Usage: python benchmarks/bench_transform_creatives.py [variable count]
+"""
+import copy
+import json
+import sys
+import timeit
+
+from tap_linkedin_ads.transform import transform_creatives
+
+
+def legacy_transform_creatives(data_dict):
+    # The variable keys are listed again and `data` is walked again for every variable
+    new_dict = data_dict
+    variables = new_dict.get('variables', {}).get('data', {})
+    ky_cnt = 0
+    num = len(variables) - 1
+    while ky_cnt <= num:
+        key = list(variables)[ky_cnt]
+        params = new_dict.get('variables', {}).get('data', {}).get(key, {})
+        new_dict['variables']['type'] = key
+        new_dict['variables']['values'] = []
+
+        pk_cnt = 0
+        pnum = len(params) - 1
+        while pk_cnt <= pnum:
+            param_key = list(params)[pk_cnt]
+            param_value = new_dict.get('variables', {}).get('data', {}).get(key, {}).get(param_key, '')
+            new_dict['variables']['values'].append({'key': param_key, 'value': '{}'.format(param_value)})
+            pk_cnt = pk_cnt + 1
+
+        if 'data' in new_dict['variables']:
+            del new_dict['variables']['data']
+        ky_cnt = ky_cnt + 1
+    return new_dict
+
+
+def make_creative(variable_count):
+    params = {'variable{}'.format(i): {'value': i} if i % 10 == 0 else 'urn:li:share:{}'.format(i)
+              for i in range(variable_count)}
+    return {'id': 1,
+            'variables': {'click_uri': 'https://www.example.com',
+                          'data': {'com.linkedin.ads.SponsoredUpdateCreativeVariables': params}}}
+
+
+def measure(transform, creative, number):
+    creatives = [copy.deepcopy(creative) for _ in range(number)]
+    return timeit.timeit(lambda: transform(creatives.pop()), number=number) / number
+
+
+def main():
+    variable_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    creative = make_creative(variable_count)
+
+    legacy_record = json.dumps(legacy_transform_creatives(copy.deepcopy(creative)))
+    record = json.dumps(transform_creatives(copy.deepcopy(creative)))
+    assert legacy_record == record, 'The transformed creatives differ'
+
+    number = 20
+    legacy_time = measure(legacy_transform_creatives, creative, number)
+    linear_time = measure(transform_creatives, creative, number)
+    print('variables: {}'.format(variable_count))
+    print('legacy:  {:>8.3f} ms/creative'.format(legacy_time * 1000))
+    print('linear:  {:>8.3f} ms/creative'.format(linear_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
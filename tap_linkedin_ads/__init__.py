@@ -8,6 +8,7 @@ from singer import metadata, utils
 from tap_linkedin_ads.client import LinkedinClient, REQUEST_TIMEOUT
 from tap_linkedin_ads.discover import discover as _discover
 from tap_linkedin_ads.sync import sync as _sync
+from tap_linkedin_ads.profiling import SyncProfiler, PROFILERS
 
 
 LOGGER = singer.get_logger()
@@ -28,8 +29,20 @@ def do_discover(client, config):
     LOGGER.info('Finished discover')
 
 
+def parse_profile_args():
+    """
+    Parse and remove the profiling options from the command line, which are not known by singer.utils.parse_args.
+    """
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument('--profile', help='Directory where the profile of the sync of each stream is written')
+    parser.add_argument('--profiler', choices=PROFILERS, default='cprofile', help='Profiler of the --profile option')
+    profile_args, sys.argv[1:] = parser.parse_known_args(sys.argv[1:])
+    return profile_args
+
+
 @singer.utils.handle_top_exception(LOGGER)
 def main():
+    profile_args = parse_profile_args()
     parsed_args = singer.utils.parse_args(REQUIRED_CONFIG_KEYS)
     config = parsed_args.config
 
@@ -46,15 +59,23 @@ def main():
         if parsed_args.state:
             state = parsed_args.state
 
+        # The accounts search of check_accounts is the first page of the accounts stream
+        client.cache_endpoints('accounts')
         client.check_accounts(config)
 
         if parsed_args.discover:
             do_discover(client, config)
         elif parsed_args.catalog:
-            _sync(client=client,
-                  config=config,
-                  catalog=parsed_args.catalog,
-                  state=state)
+            if profile_args.profile:
+                client.profiler = SyncProfiler(profile_args.profile, profile_args.profiler)
+            try:
+                _sync(client=client,
+                      config=config,
+                      catalog=parsed_args.catalog,
+                      state=state)
+            finally:
+                if client.profiler is not None:
+                    client.profiler.write_reports()
 
 
 if __name__ == '__main__':
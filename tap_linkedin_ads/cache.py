@@ -0,0 +1,57 @@
+import json
+import sqlite3
+import threading
+import datetime
+import singer
+
+LOGGER = singer.get_logger()
+
+# Number of days after which the analytics of a day are no longer restated by LinkedIn
+ANALYTICS_CACHE_IMMUTABLE_DAYS = 30
+
+class AnalyticsCache:
+    """
+    On-disk SQLite cache of the analytics responses of date windows which can no longer change.
+    A response is keyed by the pivot, the campaign, the date range and the field chunk of its request.
+    """
+    def __init__(self, path, immutable_days=ANALYTICS_CACHE_IMMUTABLE_DAYS):
+        self.immutable_days = immutable_days
+        self.__lock = threading.Lock()
+        # The chunks of a date window are fetched from several threads
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS analytics_pages ('
+            'pivot TEXT, campaign TEXT, start_date TEXT, end_date TEXT, fields TEXT, pages TEXT, '
+            'PRIMARY KEY (pivot, campaign, start_date, end_date, fields))')
+        self.__connection.commit()
+        LOGGER.info('Using analytics cache %s for the days older than %s days', path, immutable_days)
+
+    def is_immutable(self, end_date, today=None):
+        """
+        Return True if the analytics of the date window ending at end_date can no longer change.
+        """
+        today = today or datetime.date.today()
+        return end_date <= today - datetime.timedelta(days=self.immutable_days)
+
+    def get(self, key):
+        """
+        Return the cached pages of the key, or None if they are not cached.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT pages FROM analytics_pages '
+                'WHERE pivot = ? AND campaign = ? AND start_date = ? AND end_date = ? AND fields = ?',
+                key).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, pages):
+        """
+        Cache the pages of the key.
+        """
+        with self.__lock:
+            self.__connection.execute('INSERT OR REPLACE INTO analytics_pages VALUES (?, ?, ?, ?, ?, ?)',
+                                      (*key, json.dumps(pages)))
+            self.__connection.commit()
+
+    def close(self):
+        self.__connection.close()
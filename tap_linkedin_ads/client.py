@@ -1,4 +1,7 @@
 from datetime import datetime, timedelta
+from collections import OrderedDict
+import copy
+import threading
 import time
 import json
 import backoff
@@ -6,6 +9,8 @@ import requests
 
 from singer import metrics
 import singer
+from tap_linkedin_ads import telemetry
+from tap_linkedin_ads.telemetry import Metric
 
 LOGGER = singer.get_logger()
 BASE_URL = 'https://api.linkedin.com/rest'
@@ -15,6 +20,8 @@ LINKEDIN_VERSION = '202511'
 
 # set default timeout of 300 seconds
 REQUEST_TIMEOUT = 300
+# Maximum number of responses kept by the in-process response cache
+RESPONSE_CACHE_SIZE = 64
 
 class LinkedInError(Exception):
     pass
@@ -119,7 +126,125 @@ def raise_for_error(response):
         exc = Server5xxError
     else:
         exc = ERROR_CODE_EXCEPTION_MAPPING.get(error_code, {}).get("raise_exception", LinkedInError)
-    raise exc(message) from None
+    error = exc(message)
+    # The retries of the requests are counted by status code
+    error.status_code = error_code
+    raise error from None
+
+class ApiRequest:
+    """
+    A GET request of the API made of its URL path and its ordered query parameters, whose values
+    are already encoded, and whether the query is tunneled in the body of a POST request.
+    The query string is built once and the pagination replaces a parameter instead of editing the URL.
+    """
+    __slots__ = ('path', 'params', 'tunnel', '_query')
+
+    def __init__(self, path, params=None, tunnel=True, query=None):
+        self.path = path
+        self.params = dict(params or {})
+        self.tunnel = tunnel
+        self._query = query
+
+    @classmethod
+    def from_url(cls, url, tunnel=True):
+        """
+        Build the request of a URL, its query string is kept as is.
+        """
+        path, _, query = url.partition('?')
+        params = dict(param.partition('=')[::2] for param in query.split('&') if param)
+        return cls(path, params, tunnel, query)
+
+    @property
+    def query(self):
+        if self._query is None:
+            self._query = '&'.join(['%s=%s' % (key, value) for (key, value) in self.params.items()])
+        return self._query
+
+    @property
+    def url(self):
+        return '{}?{}'.format(self.path, self.query) if self.query else self.path
+
+    def with_param(self, key, value):
+        """
+        Return a copy of the request with the query parameter set to value.
+        """
+        params = dict(self.params)
+        params[key] = value
+        return ApiRequest(self.path, params, self.tunnel)
+
+    def __eq__(self, other):
+        return isinstance(other, ApiRequest) and self.url == other.url
+
+    def __hash__(self):
+        return hash(self.url)
+
+    def __str__(self):
+        return self.url
+
+    def __repr__(self):
+        return 'ApiRequest({!r})'.format(self.url)
+
+def normalize_request_key(method, url, body=None):
+    """
+    Return the cache key of a request, the query parameters are sorted so that
+    the same request built with a different parameter order has the same key.
+    """
+    base_url, _, query = (url or '').partition('?')
+    return (method.upper(), base_url, '&'.join(sorted(query.split('&'))) if query else '',
+            json.dumps(body, sort_keys=True) if body is not None else None)
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of responses with single-flight coalescing: concurrent
+    requests of the same key wait for the response of the first one instead of
+    issuing their own request. Failed requests are not cached, the waiting requests
+    then issue their own request.
+    """
+    def __init__(self, max_size=RESPONSE_CACHE_SIZE):
+        self.max_size = max_size
+        self.__responses = OrderedDict()
+        self.__in_flight = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__responses)
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Return a copy of the cached response of the key, or the response returned by fetch.
+        """
+        with self.__lock:
+            if key in self.__responses:
+                self.__responses.move_to_end(key)
+                return copy.deepcopy(self.__responses[key])
+            in_flight = self.__in_flight.get(key)
+            if in_flight is None:
+                in_flight = self.__in_flight[key] = threading.Event()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            # Wait for the request of the same key in flight and return its response
+            in_flight.wait()
+            with self.__lock:
+                if key in self.__responses:
+                    return copy.deepcopy(self.__responses[key])
+            # The request in flight failed, fetch the response without coalescing
+            return fetch()
+
+        try:
+            response = fetch()
+            with self.__lock:
+                self.__responses[key] = copy.deepcopy(response)
+                self.__responses.move_to_end(key)
+                while len(self.__responses) > self.max_size:
+                    self.__responses.popitem(last=False)
+            return response
+        finally:
+            with self.__lock:
+                del self.__in_flight[key]
+            in_flight.set()
 
 class LinkedinClient: # pylint: disable=too-many-instance-attributes
     def __init__(self, # pylint: disable=too-many-arguments
@@ -145,7 +270,23 @@ class LinkedinClient: # pylint: disable=too-many-instance-attributes
         else: # If value is 0,"0" or "" then set default to 300 seconds.
             request_timeout = REQUEST_TIMEOUT
         self.request_timeout = request_timeout
-
+        # Responses of the endpoints opted in with cache_endpoints are cached for the run
+        self.response_cache = ResponseCache()
+        self.cached_endpoints = set()
+        # On-disk cache of the analytics responses, set by the sync if configured
+        self.analytics_cache = None
+        # Profiler of the sync of the streams, set by the --profile option
+        self.profiler = None
+        # Per endpoint number of responses, bytes received on the wire and decoded bytes
+        self.transfer_stats = {}
+        self.__transfer_stats_lock = threading.Lock()
+
+    def cache_endpoints(self, *endpoints):
+        """
+        Opt the GET requests of the endpoints in the in-process response cache.
+        Only endpoints whose identical requests are issued more than once in a run should be cached.
+        """
+        self.cached_endpoints.update(endpoints)
 
     @property
     def access_token(self):
@@ -307,8 +448,9 @@ class LinkedinClient: # pylint: disable=too-many-instance-attributes
 
             urn_list = ["urn%3Ali%3AsponsoredAccount%3A{}".format(a) for a in account_list]
             search_param = "(id:(values:List({})))".format(','.join(urn_list))
-            accounts_check_url = 'https://api.linkedin.com/rest/adAccounts?pageSize={}&q=search&search={}'.format(
-                len(account_list), search_param
+            # Same request as the first page of the accounts stream, so that its response can be reused
+            accounts_check_url = 'https://api.linkedin.com/rest/adAccounts?pageSize=1000&q=search&search={}'.format(
+                search_param
             )
             response = self.get(
                 url=accounts_check_url,
@@ -334,13 +476,15 @@ class LinkedinClient: # pylint: disable=too-many-instance-attributes
         # "Data limit for all queries over a 5 min interval: 45 million metric values(where metric value is the value for a metric specified in the fields parameter)."
         max_time=600, # seconds
         jitter=backoff.full_jitter,
+        on_backoff=telemetry.log_backoff,
     )
     # backoff for 'Timeout' error
     @backoff.on_exception(
         backoff.expo,
         requests.exceptions.Timeout,
         max_tries=5,
-        factor=2
+        factor=2,
+        on_backoff=telemetry.log_backoff,
     )
     def request(self, method, url=None, path=None, **kwargs):
 
@@ -356,8 +500,8 @@ class LinkedinClient: # pylint: disable=too-many-instance-attributes
         else:
             endpoint = None
 
-        if 'headers' not in kwargs:
-            kwargs['headers'] = {}
+        # The headers of the caller are copied, they may be shared by the requests of several threads
+        kwargs['headers'] = dict(kwargs.get('headers') or {})
         kwargs['headers']['Authorization'] = 'Bearer {}'.format(self.__access_token)
         kwargs['headers']['Accept'] = 'application/json'
         kwargs['headers']['LinkedIn-Version'] = LINKEDIN_VERSION
@@ -369,24 +513,74 @@ class LinkedinClient: # pylint: disable=too-many-instance-attributes
         if method == 'POST':
             kwargs['headers']['Content-Type'] = 'application/json'
 
-        # Use query tunneling to allow large URIs
-        # https://learn.microsoft.com/en-us/linkedin/shared/api-guide/concepts/query-tunneling?context=linkedin/context
-        if method == 'GET':
+        if isinstance(url, str):
+            url = ApiRequest.from_url(url)
+
+        http_method = 'POST'
+        if method == 'GET' and url and not url.tunnel:
+            http_method = 'GET'
+            url = url.url
+        elif method == 'GET':
+            # Use query tunneling to allow large URIs
+            # https://learn.microsoft.com/en-us/linkedin/shared/api-guide/concepts/query-tunneling?context=linkedin/context
             if url:
-                url, query = url.split('?', 1)
-                kwargs['data'] = query
+                kwargs['data'] = url.query
+                url = url.path
             kwargs['headers']['Content-Type'] = 'application/x-www-form-urlencoded'
             kwargs['headers']['X-HTTP-Method-Override'] = 'GET'
+        elif url:
+            url = url.url
 
         with metrics.http_request_timer(endpoint) as timer:
-            response = self.__session.request('POST', url, timeout=self.request_timeout, **kwargs)
+            # Tagged with the stream, account and parent ID being synced
+            timer.tags.update(telemetry.get_metric_tags())
+            response = self.__session.request(http_method, url, timeout=self.request_timeout, **kwargs)
             timer.tags[metrics.Tag.http_status_code] = response.status_code
+            wire_bytes, decoded_bytes = self.record_transfer(endpoint, response)
+            timer.tags['content_encoding'] = response.headers.get('Content-Encoding', 'identity')
+        telemetry.increment_counter(Metric.http_request_count, endpoint=endpoint,
+                                    **{metrics.Tag.http_status_code: response.status_code})
+        telemetry.increment_counter(Metric.http_wire_bytes, wire_bytes, endpoint=endpoint)
+        telemetry.increment_counter(Metric.http_decoded_bytes, decoded_bytes, endpoint=endpoint)
 
         if response.status_code != 200:
             raise_for_error(response)
-        return response.json()
+        with telemetry.timer(Metric.json_decode_duration, endpoint=endpoint):
+            return response.json()
+
+    def record_transfer(self, endpoint, response):
+        """
+        Add the size of the response on the wire and once decoded to the stats of the endpoint.
+        """
+        decoded_bytes = len(response.content)
+        wire_bytes = None
+        raw = getattr(response, 'raw', None)
+        if raw is not None and hasattr(raw, 'tell'):
+            # Number of (compressed) bytes read from the connection
+            wire_bytes = raw.tell()
+        if not isinstance(wire_bytes, int) or not wire_bytes:
+            wire_bytes = int(response.headers.get('Content-Length', decoded_bytes))
+        with self.__transfer_stats_lock:
+            stats = self.transfer_stats.setdefault(endpoint, {'responses': 0, 'wire_bytes': 0, 'decoded_bytes': 0})
+            stats['responses'] += 1
+            stats['wire_bytes'] += wire_bytes
+            stats['decoded_bytes'] += decoded_bytes
+        return wire_bytes, decoded_bytes
+
+    def log_transfer_stats(self):
+        """
+        Log the bytes received on the wire against the decoded bytes of each endpoint.
+        """
+        for endpoint, stats in sorted(self.transfer_stats.items(), key=lambda item: str(item[0])):
+            LOGGER.info('%s: %s responses, %s bytes on the wire, %s bytes decoded (%.1f%% saved)',
+                        endpoint, stats['responses'], stats['wire_bytes'], stats['decoded_bytes'],
+                        100 * (1 - stats['wire_bytes'] / stats['decoded_bytes']) if stats['decoded_bytes'] else 0)
 
     def get(self, url=None, path=None, **kwargs):
+        if kwargs.get('endpoint') in self.cached_endpoints:
+            key = normalize_request_key('GET', str(url or path), kwargs.get('data'))
+            return self.response_cache.get_or_fetch(
+                key, lambda: self.request('GET', url=url, path=path, **kwargs))
         return self.request('GET', url=url, path=path, **kwargs)
 
     def post(self, url=None, path=None, **kwargs):
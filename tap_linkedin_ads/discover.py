@@ -92,6 +92,8 @@ def discover(client) -> Catalog:
     the credentials cannot read are excluded from the returned catalog.
     """
     schemas, field_metadata = get_schemas()
+    # check_access and get_first_id of a parent stream request the same probe URL
+    client.cache_endpoints(*STREAMS)
     _apply_access_checks(client, schemas, field_metadata)
     catalog = Catalog([])
 
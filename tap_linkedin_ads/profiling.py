@@ -0,0 +1,173 @@
+import os
+import io
+import json
+import cProfile
+import pstats
+import threading
+import contextlib
+import singer
+
+LOGGER = singer.get_logger()
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+# Functions whose cumulative time makes up each phase of the time split of a stream,
+# as (file path suffix, function name)
+PROFILE_PHASES = {
+    'network': [('requests/sessions.py', 'request')],
+    'json_decode': [('requests/models.py', 'json')],
+    'transform_json': [('tap_linkedin_ads/transform.py', 'transform_json')],
+    'singer_transformer': [('singer/transform.py', 'transform')],
+    'stdout': [('singer/messages.py', 'write_message')],
+    # The sync thread waiting for the analytics chunks and the video_ads pages fetched by the
+    # worker threads, whose own time is split between the phases above
+    'worker_wait': [('concurrent/futures/_base.py', 'result'), ('queue.py', 'get')],
+}
+
+def get_phase_times(stats):
+    """
+    Return the time split between the phases of the sync, in seconds, from the pstats.Stats of a stream.
+    The time spent outside of the phases is reported as `other`. The total is the time of the sync thread
+    and of the worker threads, the `worker_wait` of the sync thread overlaps the phases of the workers.
+    """
+    phase_times = {phase: 0.0 for phase in PROFILE_PHASES}
+    for (file_path, _, function_name), (_, _, _, cumulative_time, _) in stats.stats.items():
+        file_path = file_path.replace(os.sep, '/')
+        for phase, functions in PROFILE_PHASES.items():
+            if any(file_path.endswith(suffix) and function_name == name for suffix, name in functions):
+                phase_times[phase] += cumulative_time
+    phase_times['other'] = max(stats.total_tt - sum(phase_times.values()), 0.0)
+    phase_times['total'] = stats.total_tt
+    return {phase: round(phase_time, 6) for phase, phase_time in phase_times.items()}
+
+class SyncProfiler:
+    """
+    Profile the sync of each stream and write its report to a directory.
+    The profile of a stream excludes its child streams, the profile of the parent stream
+    is paused while a child stream is synced. With cprofile, the requests of the worker
+    threads are profiled apart and added to the profile of their stream.
+    """
+    def __init__(self, directory, profiler='cprofile'):
+        if profiler not in PROFILERS:
+            raise Exception('The profiler ({}) is invalid, expected one of {}'.format(profiler, ', '.join(PROFILERS)))
+        if profiler == 'pyinstrument':
+            try:
+                import pyinstrument # pylint: disable=import-outside-toplevel,unused-import
+            except ImportError:
+                raise Exception('The pyinstrument profiler is not installed') from None
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.profiler = profiler
+        self.profiles = {}
+        self.active_streams = []
+        # Merged pstats.Stats of the worker threads, by stream
+        self.worker_stats = {}
+        self.__lock = threading.Lock()
+
+    def new_profile(self):
+        if self.profiler == 'pyinstrument':
+            import pyinstrument # pylint: disable=import-outside-toplevel,import-error
+            return pyinstrument.Profiler()
+        return cProfile.Profile()
+
+    def start(self, stream_name):
+        profile = self.profiles.get(stream_name)
+        if profile is None:
+            profile = self.profiles[stream_name] = self.new_profile()
+        if self.profiler == 'pyinstrument':
+            profile.start()
+        else:
+            profile.enable()
+
+    def stop(self, stream_name):
+        profile = self.profiles[stream_name]
+        if self.profiler == 'pyinstrument':
+            profile.stop()
+        else:
+            profile.disable()
+
+    @contextlib.contextmanager
+    def profile(self, stream_name):
+        """
+        Profile the block as the sync of the stream, the profiles of a stream are accumulated.
+        """
+        if self.active_streams:
+            self.stop(self.active_streams[-1])
+        self.active_streams.append(stream_name)
+        self.start(stream_name)
+        try:
+            yield
+        finally:
+            self.stop(stream_name)
+            self.active_streams.pop()
+            if self.active_streams:
+                self.start(self.active_streams[-1])
+
+    @contextlib.contextmanager
+    def profile_worker(self, stream_name):
+        """
+        Profile the block run by a worker thread for the sync of the stream.
+        """
+        if self.profiler != 'cprofile':
+            yield
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # From Python 3.12, a single cProfile can be enabled at a time and it profiles all the threads
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self.__lock:
+                if stream_name in self.worker_stats:
+                    self.worker_stats[stream_name].add(profile)
+                else:
+                    self.worker_stats[stream_name] = pstats.Stats(profile)
+
+    def write_reports(self):
+        """
+        Write the profile of each stream:
+            - cprofile: <stream>.prof, readable by pstats or snakeviz, and <stream>.txt, the time split
+              between the phases and the functions sorted by cumulative time.
+            - pyinstrument: <stream>.html
+        """
+        for stream_name, profile in self.profiles.items():
+            path = os.path.join(self.directory, stream_name)
+            if self.profiler == 'pyinstrument':
+                with open(path + '.html', 'w', encoding='utf-8') as report:
+                    report.write(profile.output_html())
+                LOGGER.info('Profile of %s written to %s.html', stream_name, path)
+                continue
+
+            output = io.StringIO()
+            stats = pstats.Stats(profile, stream=output)
+            if stream_name in self.worker_stats:
+                stats.add(self.worker_stats[stream_name])
+            stats.dump_stats(path + '.prof')
+            phase_times = get_phase_times(stats)
+            output.write('Time split (seconds): {}\n\n'.format(json.dumps(phase_times)))
+            stats.sort_stats('cumulative').print_stats(50)
+            with open(path + '.txt', 'w', encoding='utf-8') as report:
+                report.write(output.getvalue())
+            LOGGER.info('Profile of %s written to %s.prof, time split (seconds): %s', stream_name, path, phase_times)
+
+def profile_stream(profiler, stream_name):
+    """
+    Return the context profiling the sync of the stream, or a no-op context when profiling is disabled.
+    """
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.profile(stream_name)
+
+def profile_worker(profiler, stream_name):
+    """
+    Return the context profiling a worker thread of the sync of the stream, or a no-op context
+    when profiling is disabled.
+    """
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.profile_worker(stream_name)
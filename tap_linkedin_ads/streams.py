@@ -1,14 +1,27 @@
 import urllib.parse
-import re
 import copy
+import time
+import contextlib
+import contextvars
+import queue
+import threading
 import datetime
+import decimal
 from datetime import timedelta
+from concurrent import futures as concurrent_futures
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 import singer
 from singer import metrics, metadata, utils
 from singer import Transformer, should_sync_field, UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING
 from singer.utils import strptime_to_utc, strftime
-from tap_linkedin_ads.transform import transform_json, snake_case_to_camel_case
-from tap_linkedin_ads.client import LinkedInForbiddenError, LinkedInNotFoundError
+from tap_linkedin_ads.transform import (transform_json, transform_record, convert, convert_json, convert_array,
+                                        snake_case_to_camel_case)
+from tap_linkedin_ads.profiling import profile_stream, profile_worker
+from tap_linkedin_ads import telemetry
+from tap_linkedin_ads.telemetry import Metric
+from tap_linkedin_ads.client import (ApiRequest, LinkedInError, LinkedInForbiddenError, LinkedInNotFoundError,
+                                     LinkedInBadRequestError)
 
 LOGGER = singer.get_logger()
 
@@ -28,7 +41,51 @@ FIELDS_UNAVAILABLE_FOR_AD_ANALYTICS = {
 
 CURSOR_BASED_PAGINATION_STREAMS = ["accounts", "campaign_groups", "campaigns", "creatives"]
 NEW_PATH_STREAMS = ["campaign_groups", "campaigns", "creatives"]
+# Streams whose records are projected on the synced fields with the `fields` param. The accounts are
+# not projected, their first page is the response of check_accounts cached by the client
+FIELD_PROJECTION_STREAMS = ["account_users", "campaign_groups", "campaigns", "creatives"]
+# Fields of a record created by the transformations of transform.py, by the fields of the
+# response they are created from. The `<urn field>_id` fields are handled by `get_projection`.
+PROJECTION_SOURCE_FIELDS = {
+    'created_time': ['change_audit_stamps'],
+    'last_modified_time': ['change_audit_stamps'],
+    # The targeting facets are only abstracted by transform_campaigns if both fields are returned
+    'targeting': ['targeting', 'targeting_criteria'],
+    'targeting_criteria': ['targeting', 'targeting_criteria'],
+}
 BASE_URL = 'https://api.linkedin.com/rest'
+ANALYTICS_STREAMS = ('ad_analytics_by_campaign', 'ad_analytics_by_creative')
+# LinkedIn has a max of 20 fields per request. We cap the chunks at 18
+# to make sure there's always room for us to append `dateRange`, and `pivotValues`
+MAX_CHUNK_LENGTH = 18
+# Fields appended to every analytics chunk so that we can create the composite primary key
+# for the record and merge the multiple responses based on this primary key
+ANALYTICS_KEY_FIELDS = ['dateRange', 'pivotValues']
+# Maximum number of field chunk requests issued in parallel for one analytics date window
+MAX_CHUNK_WORKERS = 4
+# Number of days re-synced before the bookmark of an analytics stream, as LinkedIn restates recent metrics
+ANALYTICS_LOOKBACK_DAYS = 7
+# Campaign statuses which can no longer deliver, their analytics are settled once the lookback window is over
+SETTLED_CAMPAIGN_STATUSES = {'ARCHIVED', 'CANCELED', 'REMOVED'}
+# Metrics of a campaign which are not the sum of the metrics of its creatives, as the same
+# member can be reached by several creatives
+NON_ADDITIVE_ANALYTICS_FIELDS = {
+    'approximateMemberReach',
+    'approximateUniqueImpressions',
+    'audiencePenetration',
+    'averageDailyReachMetrics',
+    'averagePreviousSevenDayReachMetrics',
+    'averagePreviousThirtyDayReachMetrics'
+}
+# Fields of a derived campaign analytics record which are not summed
+ANALYTICS_DIMENSION_FIELDS = {'date_range', 'pivot', 'pivot_value', 'pivot_values'}
+# Minimum number of seconds between two state messages of the checkpoints of a stream
+CHECKPOINT_INTERVAL = 60
+
+class LinkedInAnalyticsRowLimitError(LinkedInError):
+    """
+    An analytics response returned as many records as its `count`, records may be missing from it.
+    """
 
 # adAnalytics requires dateRange — compute a rolling 5-day probe window ending today.
 def _build_ad_analytics_probe_date_range():
@@ -46,6 +103,23 @@ def _build_ad_analytics_probe_date_range():
         'dateRange.end.year': end.year,
     }
 
+def parse_bookmark(value):
+    """
+    Parse a date-time bookmark to a UTC datetime. The `%Y-%m-%dT%H:%M:%SZ` and `%Y-%m-%dT%H:%M:%S.%fZ`
+    date-times written by the singer Transformer and transform_analytics are parsed by position,
+    any other format by strptime_to_utc.
+    """
+    if len(value) in (20, 27) and value[4] == value[7] == '-' and value[10] == 'T' and \
+        value[13] == value[16] == ':' and value[-1] == 'Z' and (len(value) == 20 or value[19] == '.'):
+        try:
+            return datetime.datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                                     int(value[11:13]), int(value[14:16]), int(value[17:19]),
+                                     int(value[20:26]) if len(value) == 27 else 0,
+                                     tzinfo=datetime.timezone.utc)
+        except ValueError:
+            pass
+    return strptime_to_utc(value)
+
 def write_bookmark(state, value, stream_name):
     """
     Write the bookmark in the state corresponding to the stream.
@@ -56,6 +130,101 @@ def write_bookmark(state, value, stream_name):
     LOGGER.info('Write state for stream: %s, value: %s', stream_name, value)
     singer.write_state(state)
 
+def get_checkpoint(state, stream_name):
+    """
+    Return the checkpoint of the stream if its previous sync was interrupted, otherwise None.
+    """
+    return (state or {}).get('checkpoints', {}).get(stream_name)
+
+def write_checkpoint(state, stream_name, checkpoint, emit=True):
+    """
+    Write the checkpoint of an in-progress stream in the state, so that an interrupted
+    sync can resume from the last completed page, parent record and analytics window.
+    If emit is False, the checkpoint is only emitted with the next state message.
+    """
+    if 'checkpoints' not in state:
+        state['checkpoints'] = {}
+    state['checkpoints'][stream_name] = checkpoint
+    if emit:
+        singer.write_state(state)
+
+class CheckpointThrottle:
+    """
+    Limit the state messages of the checkpoints of a stream to one every interval seconds,
+    the first checkpoint is always emitted.
+    """
+    def __init__(self, interval=None):
+        self.interval = CHECKPOINT_INTERVAL if interval is None else interval
+        self.last_emit_time = None
+
+    def ready(self):
+        """
+        Return True if the checkpoint should be emitted.
+        """
+        now = time.monotonic()
+        if self.last_emit_time is not None and now - self.last_emit_time < self.interval:
+            return False
+        self.last_emit_time = now
+        return True
+
+def clear_checkpoint(state, stream_name):
+    """
+    Remove the checkpoint of a completed stream from the state.
+    """
+    checkpoints = state.get('checkpoints', {})
+    checkpoints.pop(stream_name, None)
+    if not checkpoints:
+        state.pop('checkpoints', None)
+
+def get_parent_bookmarks(state, stream_name):
+    """
+    Return the map of parent ID to the date through which the child stream is synced for it,
+    or None if the per-parent bookmarks of the stream are not yet available in the state.
+    """
+    return (state or {}).get('parent_bookmarks', {}).get(stream_name)
+
+def write_parent_bookmarks(state, stream_name, parent_bookmarks):
+    """
+    Set the per-parent bookmarks of the child stream in the state.
+    They are emitted with the next bookmark of the parent stream.
+    """
+    if 'parent_bookmarks' not in state:
+        state['parent_bookmarks'] = {}
+    state['parent_bookmarks'][stream_name] = parent_bookmarks
+
+def is_settled_parent(parent_record, synced_through):
+    """
+    Return True if the parent campaign can no longer deliver and its analytics were synced
+    beyond the lookback window following its last modification.
+    """
+    last_modified_time = parent_record.get('last_modified_time')
+    if parent_record.get('status') not in SETTLED_CAMPAIGN_STATUSES or last_modified_time is None:
+        return False
+    last_modified_dttm = datetime.datetime.fromtimestamp(last_modified_time / 1000, tz=datetime.timezone.utc)
+    return last_modified_dttm < strptime_to_utc(synced_through) - timedelta(days=ANALYTICS_LOOKBACK_DAYS)
+
+def get_analytics_start(parent_bookmarks, parent_record, stream_bookmark, start_date):
+    """
+    Return the bookmark from which the analytics of the parent record are synced,
+    or None if the analytics of the parent are settled and there is nothing to sync.
+    """
+    if parent_bookmarks is None:
+        # No per-parent bookmarks yet, continue from the bookmark of the stream
+        return stream_bookmark
+    parent_id = str(parent_record.get('id'))
+    if parent_id in parent_bookmarks:
+        return parent_bookmarks[parent_id]
+    # The parent is either new or was pruned from the map once its analytics were settled
+    if is_settled_parent(parent_record, max(parent_bookmarks.values(), default=stream_bookmark)):
+        return None
+    # Backfill a new parent from its creation, no analytics can exist before it
+    created_time = parent_record.get('created_time')
+    if created_time is not None:
+        created_dttm = datetime.datetime.fromtimestamp(created_time / 1000, tz=datetime.timezone.utc)
+        if created_dttm > strptime_to_utc(start_date):
+            return strftime(created_dttm)
+    return start_date
+
 def selected_fields(catalog_for_stream):
     """
     Get all selected fields of given streams
@@ -72,6 +241,46 @@ def selected_fields(catalog_for_stream):
 
     return selected_fields_list
 
+def written_fields(catalog_for_stream):
+    """
+    Get the fields of given streams kept in the records by the singer Transformer: unlike `selected_fields`,
+    the fields without `selected` metadata are kept.
+    """
+    mdata = metadata.to_map(catalog_for_stream.metadata)
+    written_fields_list = []
+    for field in catalog_for_stream.schema.properties.keys():
+        field_metadata = mdata.get(('properties', field), {})
+        inclusion = field_metadata.get('inclusion')
+        if inclusion == 'unsupported' or (field_metadata.get('selected') is False and inclusion != 'automatic'):
+            continue
+        written_fields_list.append(field)
+    return written_fields_list
+
+def get_projection(stream_fields, fields):
+    """
+    Return the Rest.li `fields` projection of the response fields from which the given fields of
+    a record are transformed. stream_fields are the fields of the schema of the stream.
+
+    Example:
+
+    Args: stream_fields = ['id', 'account', 'account_id', 'change_audit_stamps', 'last_modified_time'],
+          fields = ['id', 'account_id', 'last_modified_time']
+    Return: 'id,account,changeAuditStamps'
+    """
+    projection = []
+    for field in fields:
+        for source_field in PROJECTION_SOURCE_FIELDS.get(field, [field]):
+            if source_field.endswith('_id'):
+                # The ID fields of the URNs are created from the URN field by transform_urn, e.g.
+                # `account_id` from `account` and `reference_organization_id` from `reference`
+                words = source_field.split('_')[:-1]
+                source_field = next(('_'.join(words[:index]) for index in range(len(words), 0, -1)
+                                     if '_'.join(words[:index]) in stream_fields), source_field)
+            api_field = snake_case_to_camel_case(source_field)
+            if api_field not in projection:
+                projection.append(api_field)
+    return ','.join(projection)
+
 def split_into_chunks(fields, chunk_length):
     """
     Return list of chunk_length fields for total fields.
@@ -82,54 +291,145 @@ def split_into_chunks(fields, chunk_length):
     """
     return (fields[x:x+chunk_length] for x in range(0, len(fields), chunk_length))
 
-def sync_analytics_endpoint(client, stream_name, path, query_string):
+def plan_analytics_chunks(fields, chunk_length, available_fields=()):
+    """
+    Return the list of field chunks to request for one analytics date window.
+    available_fields are the fields of the stream which the API accepts.
+
+    When testing the API, if the fields in `field` all return `0` then
+    the API returns its empty response. However, the API distinguishes
+    between a day with non-null values (even if this means the values are
+    all `0`) and a day with null values. Requesting only `dateRange` and
+    `pivotValues` gives you the days with non-null values.
+
+    That seed request is only dropped when the chunks request every available
+    field, as a day with non-null values is then returned by the chunks too.
+
+    Example:
+
+    Args: fields = ['clicks', 'likes'], chunk_length = 18, available_fields = ['clicks', 'likes']
+    Return: [['clicks', 'likes', 'dateRange', 'pivotValues']]
+    """
+    fields = [field for field in fields if field not in ANALYTICS_KEY_FIELDS]
+    chunks = [list(chunk) + ANALYTICS_KEY_FIELDS for chunk in split_into_chunks(fields, chunk_length)]
+
+    available_fields = {field for field in available_fields if field not in ANALYTICS_KEY_FIELDS}
+    if not available_fields or not available_fields.issubset(fields):
+        chunks.insert(0, list(ANALYTICS_KEY_FIELDS))
+    return chunks
+
+def get_analytics_fields(catalog, stream_name, selected_only=True):
+    """
+    Return the API names of the selected fields, or of all the fields if selected_only is False,
+    of an analytics stream which the API accepts in the `fields` param.
+    """
+    # Here, the selected fields are a list of fields that the user has selected.
+    # API accepts these fields in the parameter and returns its value in the response.
+    catalog_for_stream = catalog.get_stream(stream_name)
+    fields = selected_fields(catalog_for_stream) if selected_only else catalog_for_stream.schema.properties.keys()
+    return [snake_case_to_camel_case(field)
+            for field in fields
+            if snake_case_to_camel_case(field) not in FIELDS_UNAVAILABLE_FOR_AD_ANALYTICS]
+
+def can_derive_campaign_analytics(catalog, selected_streams, children):
+    """
+    Return True if the campaign analytics can be summed from the creative analytics of the campaign:
+    both analytics streams are synced for each campaign and only additive metrics are selected.
+    """
+    if not all(stream_name in selected_streams and stream_name in children for stream_name in ANALYTICS_STREAMS):
+        return False
+    return not NON_ADDITIVE_ANALYTICS_FIELDS.intersection(get_analytics_fields(catalog, 'ad_analytics_by_campaign'))
+
+def sum_analytics_records(total, record):
+    """
+    Add the metrics of an analytics record to the total record of the same day.
+    The decimal metrics are returned as strings, they are summed as decimals.
+    """
+    for field, value in record.items():
+        if field in ANALYTICS_DIMENSION_FIELDS or value is None:
+            continue
+        total_value = total.get(field)
+        if total_value is None:
+            total[field] = value
+        elif isinstance(value, str) or isinstance(total_value, str):
+            total[field] = str(decimal.Decimal(str(total_value)) + decimal.Decimal(str(value)))
+        else:
+            total[field] = total_value + value
+    return total
+
+def sync_analytics_endpoint(client, stream_name, request):
     """
     Call API for analytics endpoint and return all pages of records.
     """
     page = 1
-    next_url = 'https://api.linkedin.com/rest/{}?{}'.format(path, query_string)
+    next_request = request
 
     # Loop until the last page
-    while next_url:
-        LOGGER.info('URL for %s: %s', stream_name, next_url)
+    while next_request:
+        LOGGER.info('URL for %s: %s', stream_name, next_request)
 
-        data = client.get(url=next_url, endpoint=stream_name)
+        data = client.get(url=next_request, endpoint=stream_name)
         yield data
         # Fetch next page
-        next_url = get_next_url(stream_name, next_url, data)
+        next_request = get_next_url(stream_name, next_request, data)
 
         LOGGER.info('%s: Synced page %s', stream_name, page)
         page = page + 1
 
-def get_next_url(stream_name, next_url, data):
+def fetch_analytics_chunk(client, stream_name, request, data_key, merger, chunk_index, cache_key=None, row_limit=None):
     """
-    Prepare and return the URL to fetch the next page of records.
+    Call API for a single field chunk of an analytics endpoint and fold all its pages into the merger.
+    If a cache_key is given, the pages are read from or written to the analytics cache of the client.
+    A page of row_limit records raises LinkedInAnalyticsRowLimitError before it is added to the merger.
+    """
+    with profile_worker(client.profiler, stream_name):
+        cached_pages = client.analytics_cache.get(cache_key) if cache_key else None
+        if cached_pages is not None:
+            for page in cached_pages:
+                merger.add_page(chunk_index, page)
+            merger.finish_chunk(chunk_index)
+            return
+
+        pages = []
+        for page in sync_analytics_endpoint(client, stream_name, request):
+            telemetry.increment_counter(Metric.page_count, stream=stream_name)
+            if row_limit and len(page.get(data_key) or []) >= row_limit:
+                raise LinkedInAnalyticsRowLimitError('{}: {} records returned for {}'.format(
+                    stream_name, row_limit, request))
+            if not page.get(data_key):
+                telemetry.increment_counter(Metric.empty_response_count, stream=stream_name)
+            else:
+                merger.add_page(chunk_index, page.get(data_key))
+                pages.append(page.get(data_key))
+        merger.finish_chunk(chunk_index)
+        if cache_key:
+            client.analytics_cache.set(cache_key, pages)
+
+def get_next_url(stream_name, request, data):
+    """
+    Prepare and return the request of the next page of records, None after the last page.
     """
     if stream_name in CURSOR_BASED_PAGINATION_STREAMS:
         next_page_token = data.get('metadata', {}).get('nextPageToken', None)
         if next_page_token:
-            if 'pageToken=' in next_url:
-                next_url = re.sub(r'pageToken=[^&]+', 'pageToken={}'.format(next_page_token), next_url)
-            else:
-                next_url = next_url + "&pageToken={}".format(next_page_token)
-        else:
-            next_url = None
-    else:
-        # handles index based paination
-        next_url = None
-        links = data.get('paging', {}).get('links', [])
-        for link in links:
-            rel = link.get('rel')
-            if rel == 'next':
-                href = link.get('href')
-                if href:
-                    # url must be kept encoded for the creatives endpoint.
-                    # Ref - https://learn.microsoft.com/en-us/linkedin/marketing/integrations/ads/account-structure/create-and-manage-creatives?view=li-lms-2023-01&tabs=http#sample-request-3
-                    if "rest/creatives" in href or "rest/posts" in href:
-                        return 'https://api.linkedin.com{}'.format(href)
-                    # Prepare next page URL
-                    next_url = 'https://api.linkedin.com{}'.format(urllib.parse.unquote(href))
-    return next_url
+            return request.with_param('pageToken', next_page_token)
+        return None
+
+    # handles index based paination
+    next_request = None
+    links = data.get('paging', {}).get('links', [])
+    for link in links:
+        rel = link.get('rel')
+        if rel == 'next':
+            href = link.get('href')
+            if href:
+                # url must be kept encoded for the creatives endpoint.
+                # Ref - https://learn.microsoft.com/en-us/linkedin/marketing/integrations/ads/account-structure/create-and-manage-creatives?view=li-lms-2023-01&tabs=http#sample-request-3
+                if "rest/creatives" in href or "rest/posts" in href:
+                    return ApiRequest.from_url('https://api.linkedin.com{}'.format(href))
+                # Prepare next page URL
+                next_request = ApiRequest.from_url('https://api.linkedin.com{}'.format(urllib.parse.unquote(href)))
+    return next_request
 
 def shift_sync_window(params, today, date_window_size, forced_window_size=None):
     """
@@ -152,30 +452,130 @@ def shift_sync_window(params, today, date_window_size, forced_window_size=None):
                   'dateRange.end.year': new_end.year,}
     return current_end, new_end, new_params
 
+# Marks a field of an analytics row that no chunk has returned
+_MISSING = object()
+
+class AnalyticsRow:
+    """
+    Compact representation of a merged analytics record. The values are stored in the
+    field order of the merger layout instead of a dict with repeated string keys.
+    """
+    __slots__ = ('values', 'chunks')
+
+    def __init__(self, size):
+        self.values = [_MISSING] * size
+        # Bit mask of the chunks which have returned this record
+        self.chunks = 0
+
+class AnalyticsMerger:
+    """
+    Merge the responses of the field chunks of an analytics date window.
+    The primary key is a combination of pivotValue and start date fields value.
+
+    Each primary key keeps an AnalyticsRow with the values returned by every chunk,
+    so the raw pages can be dropped as soon as they are added. A primary key is
+    completed once every chunk has either contributed to it or returned all its pages.
+    Pages may be added from multiple threads.
+    """
+
+    def __init__(self, pivot, chunk_count=1, fields=()):
+        self.pivot = pivot
+        self.all_chunks = (1 << chunk_count) - 1
+        self.finished_chunks = 0
+        self.pending = {}
+        self.lock = threading.Lock()
+        # Field order of the rows, fields missing from the layout are appended when first returned
+        self.fields = []
+        self.field_index = {}
+        self.snake_case_fields = []
+        for field in fields:
+            self._position(field)
+
+    def _position(self, field):
+        index = self.field_index.get(field)
+        if index is None:
+            index = self.field_index[field] = len(self.fields)
+            self.fields.append(field)
+            self.snake_case_fields.append(convert(field))
+        return index
+
+    def add_page(self, chunk_index, page):
+        """
+        Add the records of a page returned for the chunk at chunk_index.
+        """
+        with self.lock:
+            for element in page:
+                temp_start = element['dateRange']['start']
+                temp_pivotValue = element['pivotValues'][0]
+                string_start = '{}-{}-{}'.format(temp_start['year'], temp_start['month'], temp_start['day'])
+                primary_key = (temp_pivotValue, string_start)
+
+                row = self.pending.get(primary_key)
+                if row is None:
+                    row = self.pending[primary_key] = AnalyticsRow(len(self.fields))
+                row.chunks |= 1 << chunk_index
+                values = row.values
+                # Update existing record with same primary key
+                for field, value in element.items():
+                    index = self._position(field)
+                    if index >= len(values):
+                        values.extend([_MISSING] * (index + 1 - len(values)))
+                    values[index] = value
+
+    def finish_chunk(self, chunk_index):
+        """
+        Mark the chunk at chunk_index as having returned all its pages.
+        """
+        with self.lock:
+            self.finished_chunks |= 1 << chunk_index
+
+    def pop_completed(self):
+        """
+        Remove the completed primary keys and return a list of (primary key, AnalyticsRow),
+        in the order the primary keys were first returned by the API.
+        """
+        with self.lock:
+            completed = [primary_key for primary_key, row in self.pending.items()
+                         if row.chunks | self.finished_chunks == self.all_chunks]
+            return [(primary_key, self.pending.pop(primary_key)) for primary_key in completed]
+
+    def materialize(self, row, snake_case=False):
+        """
+        Return the record of an AnalyticsRow as a dict with the API field names, or
+        with the snake_case field names `convert_json` would produce.
+        """
+        if snake_case:
+            names = self.snake_case_fields
+            record = {}
+            for index, value in enumerate(row.values):
+                if value is _MISSING:
+                    continue
+                # Only `dateRange` and `pivotValues` are nested, metrics are plain values
+                if isinstance(value, dict):
+                    value = convert_json(value)
+                elif isinstance(value, list):
+                    value = convert_array(value)
+                record[names[index]] = value
+        else:
+            names = self.fields
+            record = {names[index]: value for index, value in enumerate(row.values) if value is not _MISSING}
+        # adding pivot and pivot_value to make it compatible with the previous tap version
+        record['pivot'] = self.pivot
+        record['pivot_value'] = record[names[self.field_index['pivotValues']]][0]
+        return record
+
 def merge_responses(pivot, data):
     """
     Prepare map with key as primary key and value as the record itself for analytics streams.
     The primary key is a combination of pivotValue and start date fields value.
     Update existing records with the same primary key value.
     """
-    full_records = {}
+    merger = AnalyticsMerger(pivot)
     # Loop through each page of data
     for page in data:
-        # Loop through each record of the page
-        for element in page:
-            temp_start = element['dateRange']['start']
-            temp_pivotValue = element['pivotValues'][0]
-            # adding pivot and pivot_value to make it compatible with the previous tap version
-            element['pivot'] = pivot
-            element["pivot_value"] = temp_pivotValue
-            string_start = '{}-{}-{}'.format(temp_start['year'], temp_start['month'], temp_start['day'])
-            primary_key = (temp_pivotValue, string_start)
-            if primary_key in full_records:
-                # Update existing record with same primary key
-                full_records[primary_key].update(element)
-            else:
-                full_records[primary_key] = element
-    return full_records
+        merger.add_page(0, page)
+    merger.finish_chunk(0)
+    return {primary_key: merger.materialize(row) for primary_key, row in merger.pop_completed()}
 
 class LinkedInAds:
     """
@@ -189,14 +589,18 @@ class LinkedInAds:
         path                 : API endpoint relative path, when added to the base URL, creates the full path
         account_filter       : Method for Account filtering. Each uses a different query pattern/parameter:
             search_id_values_param, search_account_values_param, accounts_param
-        params               : Query, sort, and other endpoint specific parameters
+        params               : Query, sort, and other endpoint specific parameters, read-only. The params of
+            a stream are never updated in place, `with_params` returns a copy of the stream with updated params
+        headers              : Endpoint specific request headers, read-only
         data_key             : JSON element containing the records for the endpoint
         bookmark_query_field : Typically a date-time field is used for filtering the query
         bookmark_field       : Replication key field, typically a date-time, used for filtering the results
             and setting the state
         foreign_key          : Primary key of the Parent stream.
+        parent_fields        : On each of the children, fields of the parent records used to sync the children
         children             : A collection of child endpoints (where the endpoint path includes the parent id)
         parent               : On each of the children, name of the parent stream
+        parent_batch_size    : On a child, number of parent records whose children are fetched by one request
 
     """
     tap_stream_id = None
@@ -204,14 +608,16 @@ class LinkedInAds:
     replication_keys = None
     key_properties = []
     foreign_key = None
+    parent_fields = []
     account_filter = None
     path = None
     parent = None
     data_key = None
     children = []
+    parent_batch_size = 1
     count = None
-    params = {}
-    headers = {}
+    params = MappingProxyType({})
+    headers = MappingProxyType({})
 
     @property
     def access_probe_extra_params(self):
@@ -227,11 +633,7 @@ class LinkedInAds:
         """
         if self.tap_stream_id in NEW_PATH_STREAMS:
             if self.parent and parent_id:
-                probe_params = {
-                    k: v.format(parent_id) if isinstance(v, str) and '{}' in v else v
-                    for k, v in self.params.items()
-                }
-                probe_params['pageSize'] = 1
+                probe_params = {**self.params, **self.get_parent_params([parent_id]), 'pageSize': 1}
                 querystring = '&'.join(['{}={}'.format(k, v) for k, v in probe_params.items()])
                 return '{}/adAccounts/{}/{}?{}'.format(BASE_URL, account_list[0], self.path, querystring)
             return '{}/adAccounts/{}/{}?q=search&pageSize=1'.format(BASE_URL, account_list[0], self.path)
@@ -366,10 +768,16 @@ class LinkedInAds:
         stream = catalog.get_stream(self.tap_stream_id)
         schema = stream.schema.to_dict()
         stream_metadata = metadata.to_map(stream.metadata)
-        with metrics.record_counter(self.tap_stream_id) as counter:
+        write_duration = 0.0
+        # The bookmarks are compared as datetimes, parsed once for the last_datetime and the max_bookmark_value
+        last_dttm = parse_bookmark(last_datetime) if bookmark_field and last_datetime is not None else None
+        max_bookmark_dttm = parse_bookmark(max_bookmark_value) if max_bookmark_value is not None else None
+        with metrics.record_counter(self.tap_stream_id) as counter, \
+            telemetry.timer(Metric.process_records_duration, stream=self.tap_stream_id):
             for record in records:
-                # If child object, add parent_id to record
-                if parent_id and self.parent:
+                # If child object, add parent_id to record. The records of the children
+                # fetched for a batch of parents already carry the ID of their parent.
+                if parent_id and self.parent and not isinstance(parent_id, list):
                     record[self.parent + '_id'] = parent_id
 
                 # Transform record for Singer.io
@@ -381,23 +789,122 @@ class LinkedInAds:
                         stream_metadata)
                     # Check replication key value if it is available in the record
                     if bookmark_field and (bookmark_field in transformed_record):
+                        bookmark_dttm = parse_bookmark(transformed_record[bookmark_field])
                         # Reset max_bookmark_value to new value if higher
-                        if max_bookmark_value is None or strptime_to_utc(transformed_record[bookmark_field]) > strptime_to_utc(max_bookmark_value):
+                        if max_bookmark_dttm is None or bookmark_dttm > max_bookmark_dttm:
                             max_bookmark_value = transformed_record[bookmark_field]
+                            max_bookmark_dttm = bookmark_dttm
 
-                        last_dttm = strptime_to_utc(last_datetime)
-                        bookmark_dttm = strptime_to_utc(transformed_record[bookmark_field])
                         # Keep only records whose bookmark is after the last_datetime
-                        if bookmark_dttm >= last_dttm:
-                            self.write_record(transformed_record, time_extracted=time_extracted)
-                            counter.increment()
-                    else:
-                        # Write record if replication key is not available in the record
-                        self.write_record(transformed_record, time_extracted=time_extracted)
-                        counter.increment()
+                        if last_dttm is not None and bookmark_dttm < last_dttm:
+                            continue
+
+                    # Write record if its bookmark is after the last_datetime or if replication
+                    # key is not available in the record
+                    write_start = time.time()
+                    self.write_record(transformed_record, time_extracted=time_extracted)
+                    write_duration += time.time() - write_start
+                    counter.increment()
 
+            telemetry.log_timer(Metric.write_duration, write_duration, stream=self.tap_stream_id)
             return max_bookmark_value, counter.value
 
+    def with_params(self, params):
+        """
+        Return a copy of the stream whose params are updated with the given params.
+        The stream itself is left unchanged, so it can be shared by the workers syncing its parents.
+        """
+        if not params:
+            return self
+        stream = copy.copy(self)
+        stream.params = MappingProxyType({**self.params, **params})
+        return stream
+
+    def without_children(self, child_streams):
+        """
+        Return a copy of the stream which does not sync the given child streams.
+        """
+        if not set(child_streams) & set(self.children):
+            return self
+        stream = copy.copy(self)
+        stream.children = [child for child in self.children if child not in child_streams]
+        return stream
+
+    def get_projection_params(self, catalog, selected_streams):
+        """
+        Return the `fields` param projecting the records on the selected fields, the key and replication
+        key fields, and the fields of the parent records used by the selected children.
+        """
+        catalog_entry = catalog.get_stream(self.tap_stream_id)
+        if self.tap_stream_id not in FIELD_PROJECTION_STREAMS or catalog_entry is None:
+            return {}
+
+        fields = [*self.key_properties, *(self.replication_keys or [])]
+        if self.tap_stream_id in selected_streams:
+            fields += written_fields(catalog_entry)
+        for child_stream_name in self.children:
+            if child_stream_name in selected_streams:
+                child_stream = STREAMS[child_stream_name]
+                fields += [child_stream.foreign_key, *child_stream.parent_fields]
+        return {'fields': get_projection(catalog_entry.schema.properties, fields)}
+
+    def get_parent_params(self, parent_ids):
+        """
+        Return the params filtering the requests of a child stream by the IDs of its parent records.
+        """
+        return {}
+
+    def get_page(self, client, request):
+        """
+        Fetch a page of records of the stream.
+        """
+        return client.get(url=request, endpoint=self.tap_stream_id, headers=self.headers)
+
+    def prefetch_pages(self, client, page_size, parent_ids):
+        """
+        Start fetching the pages of the given parent IDs ahead of their sync.
+        Only implemented by the child streams whose pages can be fetched concurrently.
+        """
+
+    def stop_prefetch(self):
+        """
+        Stop fetching the pages started by prefetch_pages.
+        """
+
+    def get_requests(self, page_size, parent_id=None, account_list=None):
+        """
+        Return the (account, request) of the first page of each account to sync, the account is None
+        for the endpoints which are not fetched per account.
+        """
+        start = 0 # Starting offset value for each batch API call
+        if self.tap_stream_id in CURSOR_BASED_PAGINATION_STREAMS:
+            # hardcoding the pagesize to 1000 for stream - accounts, as search and pageToken param can't be present at the same time.
+            if self.tap_stream_id == "accounts":
+                page_size = 1000
+            endpoint_params = {
+                'pageSize': page_size,
+                **self.params
+            }
+        else:
+            endpoint_params = {
+                'start': start,
+                'count': page_size,
+                **self.params # adds in endpoint specific, sort, filter params
+            }
+
+        requests = []
+        if self.tap_stream_id in NEW_PATH_STREAMS:
+            # As per the latest linkedin version, few url formats are modified, it expects advertiser
+            # account_id in each url path
+            for account in account_list:
+                path = "{}/adAccounts/{}/{}".format(BASE_URL, account, self.path)
+                requests.append((account, ApiRequest(path, endpoint_params)))
+        else:
+            if self.path == 'posts':
+                endpoint_params['dscAdAccount'] = 'urn%3Ali%3AsponsoredAccount%3A{}'.format(parent_id)
+            requests.append((None, ApiRequest('{}/{}'.format(BASE_URL, self.path), endpoint_params)))
+        return requests
+
     # pylint: disable=too-many-branches,too-many-statements,too-many-arguments,too-many-locals,too-many-nested-blocks
     def sync_endpoint(self,
                       client,
@@ -408,19 +915,39 @@ class LinkedInAds:
                       selected_streams,
                       date_window_size,
                       parent_id=None,
-                      account_list=None):
+                      account_list=None,
+                      stream_params=None,
+                      analytics_executor=None):
         """
         Sync a specific parent or child endpoint.
+        The parent_id of a child is the list of parent IDs if its parent records are synced in batches.
+        The stream_params are the params set from the config of the child streams, by stream name.
+        The analytics_executor fetches the field chunks of the analytics children, see `sync_analytics_streams`.
         """
+        stream_params = stream_params or {}
         # Get the latest bookmark for the stream and set the last_datetime
         last_datetime = self.get_bookmark(state, start_date)
         max_bookmark_value = last_datetime
         LOGGER.info('%s: bookmark last_datetime = %s', self.tap_stream_id, max_bookmark_value)
 
+        # Only the streams synced at the top level are checkpointed, child streams
+        # are resumed through the checkpoint of their parent
+        checkpointing = parent_id is None
+        resume_checkpoint = get_checkpoint(state, self.tap_stream_id) if checkpointing else None
+        checkpoint_throttle = CheckpointThrottle()
+
         bookmark_field = next(iter(self.replication_keys))
         # Initialize child_max_bookmarks
         child_max_bookmarks = {}
+        # Per-parent bookmarks of the analytics children and the parents seen in this sync. The
+        # bookmarks updated by this sync are set in the state once the parents are synced, so that
+        # the checkpoints do not carry a map growing with each parent
+        child_parent_bookmarks = {}
+        synced_parent_ids = set()
+        updated_parent_bookmarks = set()
         children = self.children
+        # Whether the campaign analytics can be summed from the creative analytics of the same request
+        derive_campaign_analytics = can_derive_campaign_analytics(catalog, selected_streams, children)
         # Loop through all children
         for child_stream_name in children:
 
@@ -433,56 +960,71 @@ class LinkedInAds:
                     child_last_datetime = child_obj.get_bookmark(state, start_date)
                     # Add the last bookmark of child stream in the `child_max_bookmarks` map
                     child_max_bookmarks[child_stream_name] = child_last_datetime
+                if child_stream_name in ANALYTICS_STREAMS:
+                    # Keep the bookmarks read from the state apart from the ones updated by this sync,
+                    # a parent missing from the former is a new parent
+                    parent_bookmarks = get_parent_bookmarks(state, child_stream_name)
+                    child_parent_bookmarks[child_stream_name] = (parent_bookmarks, dict(parent_bookmarks or {}))
+
+        checkpoint = {}
+        if resume_checkpoint:
+            # Restore the bookmarks reached before the interruption
+            max_bookmark_value = resume_checkpoint.get('max_bookmark', max_bookmark_value)
+            for child_stream_name, child_bookmark in resume_checkpoint.get('child_bookmarks', {}).items():
+                if child_stream_name in child_max_bookmarks:
+                    child_max_bookmarks[child_stream_name] = child_bookmark
 
         # Pagination reference:
         # https://docs.microsoft.com/en-us/linkedin/shared/api-guide/concepts/pagination?context=linkedin/marketing/context
         # Each page has a "start" (offset value) and a "count" (batch size, number of records)
         # Increase the "start" by the "count" for each batch.
         # Continue until the "start" exceeds the total_records.
-        start = 0 # Starting offset value for each batch API call
         total_records = 0
         page = 1
 
-        if self.tap_stream_id in CURSOR_BASED_PAGINATION_STREAMS:
-            # hardcoding the pagesize to 1000 for stream - accounts, as search and pageToken param can't be present at the same time.
-            if self.tap_stream_id == "accounts":
-                page_size = 1000
-            endpoint_params = {
-                'pageSize': page_size,
-                **self.params
-            }
-        else:
-            endpoint_params = {
-                'start': start,
-                'count': page_size,
-                **self.params # adds in endpoint specific, sort, filter params
-            }
-
-        querystring = '&'.join(['%s=%s' % (key, value) for (key, value) in endpoint_params.items()])
-
-        urllist = []
-        if self.tap_stream_id in NEW_PATH_STREAMS:
-            # As per the latest linkedin version, few url formats are modified, it expects advertiser
-            # account_id in each url path
-            for account in account_list:
-                url = "{}/adAccounts/{}/{}?{}".format(BASE_URL, account, self.path, querystring)
-                urllist.append((account, url))
-        else:
-            if self.path == 'posts':
-                url = '{}/{}?{}&dscAdAccount=urn%3Ali%3AsponsoredAccount%3A{}'.format(BASE_URL, self.path, querystring, parent_id)
+        # Only the synced fields of the records are requested
+        request_list = self.with_params(self.get_projection_params(catalog, selected_streams)) \
+            .get_requests(page_size, parent_id, account_list)
+
+        resume_request = None
+        if resume_checkpoint:
+            resume_accounts = [acct_id for acct_id, _ in request_list]
+            if resume_checkpoint.get('account') in resume_accounts:
+                # Skip the accounts completed before the interruption and resume from the checkpointed page
+                resume_index = resume_accounts.index(resume_checkpoint.get('account'))
+                if resume_checkpoint.get('page_url'):
+                    resume_request = ApiRequest.from_url(resume_checkpoint['page_url'])
+                    request_list = [(request_list[resume_index][0], resume_request, request_list[resume_index][1])] + \
+                        [(acct_id, request, request) for acct_id, request in request_list[resume_index + 1:]]
+                else:
+                    request_list = [(acct_id, request, request) for acct_id, request in request_list[resume_index + 1:]]
+                LOGGER.info('%s: resuming from account %s, page url %s',
+                            self.tap_stream_id, resume_checkpoint.get('account'), resume_request)
             else:
-                url = '{}/{}?{}'.format(BASE_URL, self.path, querystring)
-            urllist.append((None, url))
+                resume_checkpoint = None
+        if not resume_checkpoint:
+            request_list = [(acct_id, request, request) for acct_id, request in request_list]
+        # The parents of the pages synced before an interruption are not seen again
+        all_parents_synced = not resume_checkpoint
 
-        for acct_id, next_url in urllist:
-            while next_url: #pylint: disable=too-many-nested-blocks
-                LOGGER.info('URL for %s: %s', self.tap_stream_id, next_url)
+        for acct_id, next_request, first_request in request_list:
+            while next_request: #pylint: disable=too-many-nested-blocks
+                LOGGER.info('URL for %s: %s', self.tap_stream_id, next_request)
 
                 # Get data, API request
-                data = client.get(
-                    url=next_url,
-                    endpoint=self.tap_stream_id,
-                    headers=self.headers)
+                try:
+                    with telemetry.metric_tags(stream=self.tap_stream_id, account=acct_id, parent_id=parent_id):
+                        data = self.get_page(client, next_request)
+                except LinkedInBadRequestError:
+                    # The page cursor of the checkpoint may have expired
+                    if next_request != resume_request:
+                        raise
+                    LOGGER.warning('%s: unable to resume from the checkpointed page, restarting from the first page',
+                                   self.tap_stream_id)
+                    next_request = first_request
+                    resume_request = None
+                    resume_checkpoint = None
+                    continue
                 # time_extracted: datetime when the data was extracted from the API
                 time_extracted = utils.now()
 
@@ -492,11 +1034,15 @@ class LinkedInAds:
                 #  converts camelCase to snake_case for fieldname keys.
                 # For the Linkedin Ads API, 'elements' is always the root data_key for records.
                 # The data_key identifies the collection of records below the <root> element
+                page_tags = {'stream': self.tap_stream_id, 'account': acct_id, 'parent_id': parent_id}
+                telemetry.increment_counter(Metric.page_count, **page_tags)
                 transformed_data = [] # initialize the record list
                 if self.data_key in data:
-                    transformed_data = transform_json(data, self.tap_stream_id)[self.data_key]
+                    with telemetry.timer(Metric.transform_json_duration, **page_tags):
+                        transformed_data = transform_json(data, self.tap_stream_id)[self.data_key]
                 if not transformed_data or transformed_data is None:
                     LOGGER.info('No transformed_data')
+                    telemetry.increment_counter(Metric.empty_response_count, **page_tags)
                     break # No data results
 
                 pre_singer_transformed_data = copy.deepcopy(transformed_data)
@@ -513,71 +1059,189 @@ class LinkedInAds:
                     LOGGER.info('%s, records processed: %s', self.tap_stream_id, record_count)
                     total_records = total_records + record_count
 
+                if checkpointing:
+                    checkpoint = {'account': acct_id,
+                                  'page_url': next_request.url,
+                                  'completed_parents': {},
+                                  'max_bookmark': max_bookmark_value,
+                                  'child_bookmarks': child_max_bookmarks}
+                    if resume_checkpoint and next_request == resume_request:
+                        # Children completed for the parent records of this page before the interruption
+                        checkpoint['completed_parents'] = dict(resume_checkpoint.get('completed_parents', {}))
+                        checkpoint['window'] = resume_checkpoint.get('window')
+
+                # The campaign analytics of the parents whose creative analytics are still to be synced
+                # from the same start are deferred and derived from the creative analytics
+                deferred_parent_ids = set()
+                pending_creative_parent_ids = set()
+                if derive_campaign_analytics:
+                    page_parent_ids = [record.get('id') for record in pre_singer_transformed_data]
+                    creative_completed_id = checkpoint.get('completed_parents', {}).get('ad_analytics_by_creative')
+                    if creative_completed_id in page_parent_ids:
+                        page_parent_ids = page_parent_ids[page_parent_ids.index(creative_completed_id) + 1:]
+                    pending_creative_parent_ids = set(page_parent_ids)
+
                 # Loop thru parent batch records for each children objects
                 for child_stream_name in children:
                     if child_stream_name in selected_streams:
                         # For each parent record
-                        child_obj = STREAMS[child_stream_name]()
-
-                        for record in pre_singer_transformed_data:
-
-                            parent_id = record.get(child_obj.foreign_key)
-
-                            child_stream_params = child_obj.params
-                            # Add children filter params based on parent IDs
-                            if self.tap_stream_id == 'accounts':
-                                account = 'urn:li:sponsoredAccount:{}'.format(parent_id)
-                            elif self.tap_stream_id == 'campaigns':
-                                campaign = 'urn:li:sponsoredCampaign:{}'.format(parent_id)
-                                if child_stream_name == 'creatives':
-                                    # The value of the campaigns in the query params should be passed in the encoded format.
-                                    # Ref - https://learn.microsoft.com/en-us/linkedin/marketing/integrations/ads/account-structure/create-and-manage-creatives?view=li-lms-2023-01&tabs=http#sample-request-3
-                                    child_stream_params['campaigns'] = 'List(urn%3Ali%3AsponsoredCampaign%3A{})'.format(parent_id)
-                                elif child_stream_name in ('ad_analytics_by_campaign', 'ad_analytics_by_creative'):
-                                    child_stream_params['campaigns[0]'] = campaign
-
-                            # Update params for the child stream
-                            child_obj.params = child_stream_params
-                            LOGGER.info('Syncing: %s, parent_stream: %s, parent_id: %s',
-                                        child_stream_name,
-                                        self.tap_stream_id,
-                                        parent_id)
-
-                            # Call sync method for the child stream
-                            if child_stream_name in {'ad_analytics_by_campaign', 'ad_analytics_by_creative'}:
-                                child_total_records, child_batch_bookmark_value = child_obj.sync_ad_analytics(
-                                    client=client,
-                                    catalog=catalog,
-                                    last_datetime=child_obj.get_bookmark(state, start_date),
-                                    date_window_size=date_window_size,
-                                    parent_id=parent_id)
-                            else:
-                                child_total_records, child_batch_bookmark_value = child_obj.sync_endpoint(
-                                    client=client,
-                                    catalog=catalog,
-                                    state=state,
-                                    page_size=page_size,
-                                    start_date=start_date,
-                                    selected_streams=selected_streams,
-                                    date_window_size=date_window_size,
-                                    parent_id=parent_id,
-                                    account_list=[acct_id])
-
-                            child_batch_bookmark_dttm = strptime_to_utc(child_batch_bookmark_value)
-                            child_max_bookmark = child_max_bookmarks.get(child_stream_name)
-                            child_max_bookmark_dttm = strptime_to_utc(child_max_bookmark)
-                            if child_batch_bookmark_dttm > child_max_bookmark_dttm:
-                                # Update bookmark for child stream.
-                                child_max_bookmarks[child_stream_name] = strftime(child_batch_bookmark_dttm)
-
-                            LOGGER.info('Synced: %s, parent_id: %s, total_records: %s',
-                                        child_stream_name,
-                                        parent_id,
-                                        child_total_records)
-                            LOGGER.info('FINISHED Syncing: %s', child_stream_name)
-
-                # Pagination: Get next_url
-                next_url = get_next_url(self.tap_stream_id, next_url, data)
+                        child_obj = STREAMS[child_stream_name]().with_params(stream_params.get(child_stream_name, {}))
+
+                        parent_records = pre_singer_transformed_data
+                        completed_parent_id = checkpoint.get('completed_parents', {}).get(child_stream_name)
+                        completed_parent_ids = [record.get(child_obj.foreign_key) for record in parent_records]
+                        if completed_parent_id in completed_parent_ids:
+                            # Skip the parent records completed before the interruption
+                            parent_records = parent_records[completed_parent_ids.index(completed_parent_id) + 1:]
+
+                        # Start fetching the children pages of the parent records ahead of their sync
+                        child_obj.prefetch_pages(client, page_size,
+                                                 [record.get(child_obj.foreign_key) for record in parent_records])
+                        try:
+                            for batch_start in range(0, len(parent_records), child_obj.parent_batch_size):
+                                # The children of a batch of parent records are fetched together,
+                                # the last record of the batch is checkpointed once they are synced
+                                batch_records = parent_records[batch_start:batch_start + child_obj.parent_batch_size]
+                                record = batch_records[-1]
+                                batch_parent_id = record.get(child_obj.foreign_key)
+                                batch_parent_ids = [batch_record.get(child_obj.foreign_key) for batch_record in batch_records]
+                                child_parent_id = batch_parent_ids if child_obj.parent_batch_size > 1 else batch_parent_id
+
+                                # Add children filter params based on parent IDs
+                                parent_child_obj = child_obj.with_params(child_obj.get_parent_params(batch_parent_ids))
+                                LOGGER.info('Syncing: %s, parent_stream: %s, parent_id: %s',
+                                            child_stream_name,
+                                            self.tap_stream_id,
+                                            child_parent_id)
+
+                                # Call sync method for the child stream
+                                derived_stream = None
+                                if child_stream_name in ANALYTICS_STREAMS:
+                                    synced_parent_ids.add(str(batch_parent_id))
+                                    parent_bookmarks, synced_parent_bookmarks = child_parent_bookmarks[child_stream_name]
+                                    child_last_datetime = get_analytics_start(parent_bookmarks,
+                                                                              record,
+                                                                              child_obj.get_bookmark(state, start_date),
+                                                                              start_date)
+                                    if child_last_datetime is None:
+                                        LOGGER.info('Skipping: %s, parent_id: %s, analytics are settled',
+                                                    child_stream_name, batch_parent_id)
+                                        continue
+
+                                    if child_stream_name == 'ad_analytics_by_campaign' and \
+                                        batch_parent_id in pending_creative_parent_ids and \
+                                        child_last_datetime == get_analytics_start(
+                                            child_parent_bookmarks['ad_analytics_by_creative'][0],
+                                            record,
+                                            STREAMS['ad_analytics_by_creative']().get_bookmark(state, start_date),
+                                            start_date):
+                                        LOGGER.info('Deferring: %s, parent_id: %s, derived from %s',
+                                                    child_stream_name, batch_parent_id, 'ad_analytics_by_creative')
+                                        deferred_parent_ids.add(batch_parent_id)
+                                        continue
+                                    if child_stream_name == 'ad_analytics_by_creative' and batch_parent_id in deferred_parent_ids:
+                                        derived_stream = STREAMS['ad_analytics_by_campaign']()
+
+                                    resume_date = None
+                                    window = checkpoint.get('window') or {}
+                                    if window.get('stream') == child_stream_name and window.get('parent_id') == batch_parent_id:
+                                        resume_date = datetime.date.fromisoformat(window['end'])
+
+                                    def write_window_checkpoint(window_end_date, child_stream_name=child_stream_name,
+                                                                batch_parent_id=batch_parent_id):
+                                        if checkpointing:
+                                            checkpoint['window'] = {'stream': child_stream_name,
+                                                                    'parent_id': batch_parent_id,
+                                                                    'end': window_end_date.isoformat()}
+                                            write_checkpoint(state, self.tap_stream_id, checkpoint,
+                                                             emit=checkpoint_throttle.ready())
+
+                                    with profile_stream(client.profiler, child_stream_name), \
+                                        telemetry.metric_tags(stream=child_stream_name, account=acct_id,
+                                                              parent_id=child_parent_id):
+                                        analytics_args = {'client': client,
+                                                          'catalog': catalog,
+                                                          'last_datetime': child_last_datetime,
+                                                          'date_window_size': date_window_size,
+                                                          'parent_id': batch_parent_id,
+                                                          'resume_date': resume_date,
+                                                          'on_window_synced': write_window_checkpoint,
+                                                          'analytics_executor': analytics_executor}
+                                        if derived_stream is None:
+                                            synced_streams = {child_stream_name:
+                                                              parent_child_obj.sync_ad_analytics(**analytics_args)}
+                                        else:
+                                            # The campaign analytics are derived from the same requests
+                                            synced_streams = parent_child_obj.sync_analytics_streams(
+                                                derived_stream=derived_stream, **analytics_args)
+
+                                    # The analytics of the parent are synced through today, settled parents are pruned
+                                    synced_through = datetime.date.today().isoformat()
+                                    for synced_stream_name in synced_streams:
+                                        synced_parent_bookmarks = child_parent_bookmarks[synced_stream_name][1]
+                                        if is_settled_parent(record, synced_through):
+                                            synced_parent_bookmarks.pop(str(batch_parent_id), None)
+                                        else:
+                                            synced_parent_bookmarks[str(batch_parent_id)] = synced_through
+                                        updated_parent_bookmarks.add(synced_stream_name)
+                                else:
+                                    with profile_stream(client.profiler, child_stream_name), \
+                                        telemetry.metric_tags(stream=child_stream_name, account=acct_id,
+                                                              parent_id=child_parent_id):
+                                        child_total_records, child_batch_bookmark_value = parent_child_obj.sync_endpoint(
+                                            client=client,
+                                            catalog=catalog,
+                                            state=state,
+                                            page_size=page_size,
+                                            start_date=start_date,
+                                            selected_streams=selected_streams,
+                                            date_window_size=date_window_size,
+                                            parent_id=child_parent_id,
+                                            account_list=[acct_id],
+                                            stream_params=stream_params,
+                                            analytics_executor=analytics_executor)
+                                    synced_streams = {child_stream_name: (child_total_records, child_batch_bookmark_value)}
+
+                                for synced_stream_name, (child_total_records, child_batch_bookmark_value) \
+                                    in synced_streams.items():
+                                    child_batch_bookmark_dttm = strptime_to_utc(child_batch_bookmark_value)
+                                    child_max_bookmark = child_max_bookmarks.get(synced_stream_name)
+                                    child_max_bookmark_dttm = strptime_to_utc(child_max_bookmark)
+                                    if child_batch_bookmark_dttm > child_max_bookmark_dttm:
+                                        # Update bookmark for child stream.
+                                        child_max_bookmarks[synced_stream_name] = strftime(child_batch_bookmark_dttm)
+
+                                    LOGGER.info('Synced: %s, parent_id: %s, total_records: %s',
+                                                synced_stream_name,
+                                                child_parent_id,
+                                                child_total_records)
+                                    LOGGER.info('FINISHED Syncing: %s', synced_stream_name)
+
+                                    # The campaign analytics of a page with deferred parents are checkpointed once
+                                    # they are derived, as every campaign before the parent is then completed
+                                    if checkpointing and (synced_stream_name != 'ad_analytics_by_campaign'
+                                                          or not deferred_parent_ids or derived_stream is not None):
+                                        # Checkpoint the last parent record whose child stream is completed
+                                        checkpoint['completed_parents'][synced_stream_name] = batch_parent_id
+                                if checkpointing:
+                                    checkpoint['window'] = None
+                                    write_checkpoint(state, self.tap_stream_id, checkpoint,
+                                                     emit=checkpoint_throttle.ready())
+                        finally:
+                            child_obj.stop_prefetch()
+
+                # Pagination: Get next_request
+                next_request = get_next_url(self.tap_stream_id, next_request, data)
+
+                if checkpointing:
+                    # Checkpoint the cursor of the next page once this page is completed
+                    write_checkpoint(state, self.tap_stream_id, {'account': acct_id,
+                                                                 'page_url': next_request.url if next_request else None,
+                                                                 'completed_parents': {},
+                                                                 'max_bookmark': max_bookmark_value,
+                                                                 'child_bookmarks': child_max_bookmarks},
+                                     emit=checkpoint_throttle.ready())
+                    checkpoint = {}
 
                 if self.tap_stream_id in selected_streams:
                     LOGGER.info('%s: Synced page %s, this page: %s. Total records processed: %s',
@@ -587,28 +1251,55 @@ class LinkedInAds:
                                 total_records)
                 page = page + 1
 
+        for child_stream_name, (parent_bookmarks, synced_parent_bookmarks) in child_parent_bookmarks.items():
+            if parent_bookmarks is None and child_stream_name not in updated_parent_bookmarks:
+                continue
+            # The parents filtered out by a search of the records are not seen
+            if all_parents_synced and 'search' not in self.params:
+                # Prune the bookmarks of the parents which no longer exist
+                synced_parent_bookmarks = {key: val for key, val in synced_parent_bookmarks.items()
+                                           if key in synced_parent_ids}
+            write_parent_bookmarks(state, child_stream_name, synced_parent_bookmarks)
+
         # Write child stream's bookmarks
         for key, val in list(child_max_bookmarks.items()):
             write_bookmark(state, val, key)
 
         return total_records, max_bookmark_value
 
-    # pylint: disable=too-many-branches,too-many-statements,unused-argument
-    def sync_ad_analytics(self, client, catalog, last_datetime, date_window_size, parent_id=None):
+    def sync_ad_analytics(self, client, catalog, last_datetime, date_window_size, parent_id=None,
+                          resume_date=None, on_window_synced=None, analytics_executor=None):
         """
         Sync method for ad_analytics_by_campaign, ad_analytics_by_creative
+        If resume_date is given, the date windows before it were already synced by an interrupted sync.
+        on_window_synced is called with the end date of each synced date window.
         """
-        # LinkedIn has a max of 20 fields per request. We cap the chunks at 18
-        # to make sure there's always room for us to append `dateRange`, and `pivotValues`
-        MAX_CHUNK_LENGTH = 18
+        return self.sync_analytics_streams(client, catalog, last_datetime, date_window_size, parent_id=parent_id,
+                                           resume_date=resume_date,
+                                           on_window_synced=on_window_synced,
+                                           analytics_executor=analytics_executor)[self.tap_stream_id]
 
+    # pylint: disable=too-many-branches,too-many-statements,unused-argument
+    def sync_analytics_streams(self, client, catalog, last_datetime, date_window_size, parent_id=None,
+                               resume_date=None, on_window_synced=None, derived_stream=None, analytics_executor=None):
+        """
+        Sync the analytics of the stream and, if derived_stream is given, the campaign analytics of the
+        parent campaign summed from the creative analytics, with a single request per field chunk.
+        The field chunks are fetched by the analytics_executor shared by the sync, or by an
+        executor of this call if none is given.
+        Return the (total_records, max_bookmark_value) of each synced stream, by stream name.
+        """
         bookmark_field = next(iter(self.replication_keys))
 
         max_bookmark_value = last_datetime
-        last_datetime_dt = strptime_to_utc(last_datetime) - timedelta(days=7)
+        derived_total_records = 0
+        derived_max_bookmark_value = last_datetime
+        last_datetime_dt = strptime_to_utc(last_datetime) - timedelta(days=ANALYTICS_LOOKBACK_DAYS)
 
         # Prepare date window for API call
         window_start_date = last_datetime_dt.date()
+        if resume_date and resume_date > window_start_date:
+            window_start_date = resume_date
         window_end_date = window_start_date + timedelta(days=date_window_size)
         today = datetime.date.today()
 
@@ -624,30 +1315,21 @@ class LinkedInAds:
                          'dateRange.end.month': window_end_date.month,
                          'dateRange.end.year': window_end_date.year,}
 
-        # Here, valid_selected_fields is a list of fields that the user has selected.
-        # API accepts these fields in the parameter and returns its value in the response.
-        valid_selected_fields = [snake_case_to_camel_case(field)
-                                 for field in selected_fields(catalog.get_stream(self.tap_stream_id))
-                                 if snake_case_to_camel_case(field) not in FIELDS_UNAVAILABLE_FOR_AD_ANALYTICS]
-
-        # When testing the API, if the fields in `field` all return `0` then
-        # the API returns its empty response.
-
-        # However, the API distinguishes between a day with non-null values
-        # (even if this means the values are all `0`) and a day with null
-        # values. We found that requesting these fields gives you the days with
-        # non-null values
-        first_chunk = [['dateRange', 'pivotValues']]
-
-        chunks = first_chunk + list(split_into_chunks(valid_selected_fields, MAX_CHUNK_LENGTH))
-
-        # We have to append these fields in order to ensure we get them back
-        # so that we can create the composite primary key for the record and
-        # to merge the multiple responses based on this primary key
-        for chunk in chunks:
-            for field in ['dateRange', 'pivotValues']:
-                if field not in chunk:
-                    chunk.append(field)
+        valid_selected_fields = get_analytics_fields(catalog, self.tap_stream_id)
+        request_fields = valid_selected_fields
+        excluded_fields = set()
+        derived_fields = set()
+        if derived_stream is not None:
+            # The fields of both streams are requested, the fields selected only for the
+            # derived stream are removed from the records of this stream
+            derived_selected_fields = get_analytics_fields(catalog, derived_stream.tap_stream_id)
+            request_fields = valid_selected_fields + [field for field in derived_selected_fields
+                                                      if field not in valid_selected_fields]
+            excluded_fields = {convert(field) for field in request_fields if field not in valid_selected_fields}
+            derived_fields = {convert(field) for field in derived_selected_fields} | ANALYTICS_DIMENSION_FIELDS
+
+        chunks = plan_analytics_chunks(request_fields, MAX_CHUNK_LENGTH,
+                                       get_analytics_fields(catalog, self.tap_stream_id, selected_only=False))
 
         ############### PAGINATION (for these 2 streams) ###############
         # The Tap requests LinkedIn with one Campaign ID at one time.
@@ -657,54 +1339,136 @@ class LinkedInAds:
         # Considering the maximum permitted size of Ads are created, "3000" records will be returned in an API response.
         # If “count=100” and records=100 in the API are the same then the next URL will be returned and if we hit that URL, 400 error code will be returned.
         # This case is unreachable because here “count” is 10000 and at maximum, only 3000 records will be returned in an API response.
+        # The account scoped analytics return the records of all the campaigns of the accounts, a date window
+        # whose response reaches the "count" is halved and requested again until its records fit in a response.
+        row_limit = static_params.get('count')
+        window_size = date_window_size
 
         total_records = 0
-        while window_end_date <= today:
-            responses = []
-            for chunk in chunks:
-                static_params['fields'] = ','.join(chunk)
-                params = {"start": 0,
-                          **static_params}
-                query_string = '&'.join(['%s=%s' % (key, value) for (key, value) in params.items()])
+        pivot = static_params.get('pivot')
+        analytics_cache = client.analytics_cache
+        # The campaign, or the accounts facet of the account scoped analytics
+        analytics_scope = static_params.get('campaigns[0]') or ','.join(
+            value for key, value in static_params.items() if key.startswith('accounts['))
+        if analytics_executor is not None:
+            executor_context = contextlib.nullcontext(analytics_executor)
+        else:
+            executor_context = ThreadPoolExecutor(max_workers=min(len(chunks), MAX_CHUNK_WORKERS))
+        with executor_context as executor:
+            while window_end_date <= today:
                 LOGGER.info('Syncing %s from %s to %s', parent_id, window_start_date, window_end_date)
-                for page in sync_analytics_endpoint(client, self.tap_stream_id, self.path, query_string):
-                    if page.get(self.data_key):
-                        responses.append(page.get(self.data_key))
-            pivot = params["pivot"] if "pivot" in params.keys() else None
-            raw_records = merge_responses(pivot, responses)
-            time_extracted = utils.now()
-
-            # While we broke the ad_analytics streams out from
-            # `sync_endpoint()`, we want to process them the same. And
-            # transform_json() expects a dictionary with a key equal to
-            # `data_key` and its value is the response from the API
-
-            # Note that `transform_json()` returns the same structure we pass
-            # in. `sync_endpoint()` grabs `data_key` from the return value, so
-            # we mirror that here
-            transformed_data = transform_json({self.data_key: list(raw_records.values())},
-                                              self.tap_stream_id)[self.data_key]
-            if not transformed_data:
-                LOGGER.info('No transformed_data')
-            else:
-                max_bookmark_value, record_count = self.process_records(
-                    catalog=catalog,
-                    records=transformed_data,
-                    time_extracted=time_extracted,
-                    bookmark_field=bookmark_field,
-                    max_bookmark_value=last_datetime,
-                    last_datetime=strftime(last_datetime_dt),
-                    parent_id=parent_id)
-                LOGGER.info('%s, records processed: %s', self.tap_stream_id, record_count)
-                LOGGER.info('%s: max_bookmark: %s', self.tap_stream_id, max_bookmark_value)
-                total_records += record_count
-
-            window_start_date, window_end_date, static_params = shift_sync_window(static_params, today, date_window_size)
-
-            if window_start_date == window_end_date:
-                break
+                # Issue the requests of all the chunks of this window in parallel
+                merger = AnalyticsMerger(pivot, len(chunks), [field for chunk in chunks for field in chunk])
+                # The responses of the windows which can no longer change are cached on disk
+                cached_window = analytics_cache is not None and analytics_cache.is_immutable(window_end_date, today)
+                futures = []
+                for chunk_index, chunk in enumerate(chunks):
+                    params = {"start": 0,
+                              **static_params,
+                              'fields': ','.join(chunk)}
+                    request = ApiRequest('{}/{}'.format(BASE_URL, self.path), params)
+                    cache_key = None
+                    if cached_window:
+                        cache_key = (pivot, analytics_scope, window_start_date.isoformat(),
+                                     window_end_date.isoformat(), params['fields'])
+                    # The chunks are fetched in the metric tags of the parent
+                    futures.append(executor.submit(contextvars.copy_context().run, fetch_analytics_chunk,
+                                                   client, self.tap_stream_id, request, self.data_key, merger,
+                                                   chunk_index, cache_key, row_limit))
+
+                # Write the records completed by each chunk in chunk order, so that only the
+                # rows of the pending primary keys are kept in memory
+                window_record_count = 0
+                # Derived records of the window by start date
+                derived_records = {}
+
+                def window_records(rows, derived_records=derived_records):
+                    for (_, start), row in rows:
+                        record = merger.materialize(row, snake_case=True)
+                        if derived_stream is not None:
+                            derived_record = {field: value for field, value in record.items() if field in derived_fields}
+                            if start in derived_records:
+                                sum_analytics_records(derived_records[start], derived_record)
+                            else:
+                                derived_records[start] = derived_record
+                        for field in excluded_fields:
+                            record.pop(field, None)
+                        yield transform_record(record, self.tap_stream_id)
+                try:
+                    for future in futures:
+                        future.result()
+                        rows = merger.pop_completed()
+                        if not rows:
+                            continue
+                        time_extracted = utils.now()
+
+                        # While we broke the ad_analytics streams out from
+                        # `sync_endpoint()`, we want to process them the same.
+                        # The rows already use the snake_case field names, so they are
+                        # only materialized to a dict and transformed while being written.
+                        records = window_records(rows)
+                        max_bookmark_value, record_count = self.process_records(
+                            catalog=catalog,
+                            records=records,
+                            time_extracted=time_extracted,
+                            bookmark_field=bookmark_field,
+                            max_bookmark_value=max_bookmark_value,
+                            last_datetime=strftime(last_datetime_dt),
+                            parent_id=parent_id)
+                        LOGGER.info('%s, records processed: %s', self.tap_stream_id, record_count)
+                        LOGGER.info('%s: max_bookmark: %s', self.tap_stream_id, max_bookmark_value)
+                        window_record_count += record_count
+
+                except LinkedInAnalyticsRowLimitError as error:
+                    # The rows of a capped chunk are never completed, so no record of the window was written
+                    concurrent_futures.wait(futures)
+                    window_size = (window_end_date - window_start_date).days // 2
+                    if window_size < 1:
+                        raise LinkedInAnalyticsRowLimitError('{}, the date window can not be shrunk further. The '
+                                                             'campaign analytics_scope requests each campaign '
+                                                             'apart.'.format(error)) from None
+                    window_end_date = window_start_date + timedelta(days=window_size)
+                    LOGGER.warning('%s: the response reached the %s records of a request, syncing from %s to %s',
+                                   self.tap_stream_id, row_limit, window_start_date, window_end_date)
+                    static_params = {**static_params,
+                                     'dateRange.end.day': window_end_date.day,
+                                     'dateRange.end.month': window_end_date.month,
+                                     'dateRange.end.year': window_end_date.year}
+                    continue
+
+                if not window_record_count:
+                    LOGGER.info('No transformed_data')
+                total_records += window_record_count
+
+                if derived_records:
+                    # The campaign analytics of the day are the sum of the analytics of its creatives
+                    campaign_urn = 'urn:li:sponsoredCampaign:{}'.format(parent_id)
+                    for derived_record in derived_records.values():
+                        derived_record.update(pivot='CAMPAIGN', pivot_value=campaign_urn, pivot_values=[campaign_urn])
+                    derived_max_bookmark_value, record_count = derived_stream.process_records(
+                        catalog=catalog,
+                        records=[transform_record(derived_record, derived_stream.tap_stream_id)
+                                 for derived_record in derived_records.values()],
+                        time_extracted=utils.now(),
+                        bookmark_field=bookmark_field,
+                        max_bookmark_value=derived_max_bookmark_value,
+                        last_datetime=strftime(last_datetime_dt),
+                        parent_id=parent_id)
+                    LOGGER.info('%s, records derived: %s', derived_stream.tap_stream_id, record_count)
+                    derived_total_records += record_count
 
-        return total_records, max_bookmark_value
+                if on_window_synced:
+                    on_window_synced(window_end_date)
+
+                window_start_date, window_end_date, static_params = shift_sync_window(static_params, today, window_size)
+
+                if window_start_date == window_end_date:
+                    break
+
+        results = {self.tap_stream_id: (total_records, max_bookmark_value)}
+        if derived_stream is not None:
+            results[derived_stream.tap_stream_id] = (derived_total_records, derived_max_bookmark_value)
+        return results
 
 class Accounts(LinkedInAds):
     """
@@ -718,10 +1482,10 @@ class Accounts(LinkedInAds):
     path = "adAccounts"
     data_key = "elements"
     children = ["video_ads"]
-    params = {
+    params = MappingProxyType({
         "q": "search"
-    }
-    headers = {'X-Restli-Protocol-Version': "2.0.0"}
+    })
+    headers = MappingProxyType({'X-Restli-Protocol-Version': "2.0.0"})
 
 class VideoAds(LinkedInAds):
     """
@@ -735,12 +1499,103 @@ class VideoAds(LinkedInAds):
     path = "posts"
     data_key = "elements"
     parent = "accounts"
-    params = {
+    params = MappingProxyType({
         "q": "dscAdAccount",
         "dscAdTypes": "List(VIDEO)",
         "count":100
-    }
-    headers = {'X-Restli-Protocol-Version': "2.0.0"}
+    })
+    headers = MappingProxyType({'X-Restli-Protocol-Version': "2.0.0"})
+    # Number of accounts whose posts are fetched concurrently, ahead of their sync
+    prefetch_workers = 4
+    # Number of pages buffered for each account fetched ahead of its sync
+    prefetch_buffer_size = 2
+
+    def __init__(self):
+        # Queue of the pages of the account chain serving each request, by request
+        self.page_queues = {}
+        # Event stopping the chain of each account, by account
+        self.prefetch_stops = {}
+        self.prefetch_executor = None
+
+    def get_page(self, client, request):
+        """
+        Return the page fetched ahead of the sync if available, otherwise fetch the page.
+        """
+        account, page_queue = self.page_queues.pop(request, (None, None))
+        if page_queue is None:
+            return super().get_page(client, request)
+
+        data, error, next_request = page_queue.get()
+        if error is not None:
+            raise error
+        if next_request:
+            # The next page of the account is fetched by the same chain
+            self.page_queues[next_request] = (account, page_queue)
+        return data
+
+    def fetch_pages(self, client, request, page_queue, stop):
+        """
+        Fetch the pages of an account one after the other into the page_queue,
+        until the last page, an error or the chain is stopped.
+        """
+        while request and not stop.is_set():
+            next_request = None
+            try:
+                with profile_worker(client.profiler, self.tap_stream_id):
+                    data = super().get_page(client, request)
+                next_request = get_next_url(self.tap_stream_id, request, data)
+                item = (data, None, next_request)
+            except Exception as error: # pylint: disable=broad-except
+                item = (None, error, None)
+            # Wait for the sync to consume the buffered pages of the account
+            while not stop.is_set():
+                try:
+                    page_queue.put(item, timeout=1)
+                    break
+                except queue.Full:
+                    continue
+            request = next_request
+
+    def prefetch_pages(self, client, page_size, parent_ids):
+        """
+        Fetch the posts of the accounts concurrently while the accounts are synced one by one.
+        The executor runs the chains in the order of the accounts and the chain of an account is
+        stopped once the account is synced, so the chain of the account being synced always runs.
+        """
+        self.stop_prefetch()
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=self.prefetch_workers)
+        for parent_id in parent_ids:
+            _, request = self.get_requests(page_size, parent_id)[0]
+            page_queue = queue.Queue(maxsize=self.prefetch_buffer_size)
+            stop = self.prefetch_stops[parent_id] = threading.Event()
+            self.page_queues[request] = (parent_id, page_queue)
+            with telemetry.metric_tags(stream=self.tap_stream_id, parent_id=parent_id):
+                self.prefetch_executor.submit(contextvars.copy_context().run, self.fetch_pages,
+                                              client, request, page_queue, stop)
+
+    def cancel_prefetch(self, parent_id):
+        """
+        Stop the chain of the account, its pages which were not synced are dropped.
+        """
+        stop = self.prefetch_stops.pop(parent_id, None)
+        if stop is not None:
+            stop.set()
+        for request, (account, _) in list(self.page_queues.items()):
+            if account == parent_id:
+                del self.page_queues[request]
+
+    def stop_prefetch(self):
+        """
+        Stop the chains of the accounts, the pages which were not synced are dropped.
+        """
+        for stop in self.prefetch_stops.values():
+            stop.set()
+        if self.prefetch_executor is not None:
+            self.prefetch_executor.shutdown(wait=False)
+            self.prefetch_executor = None
+        # The copies of the stream made by with_params share the chains
+        self.prefetch_stops.clear()
+        self.page_queues.clear()
 
     def check_access(self, client, parent_id=None):
         """
@@ -784,6 +1639,9 @@ class VideoAds(LinkedInAds):
                 # total record count (zero), initial bookmark returned to supress this failure
                 return 0, self.get_bookmark(kwargs.get("state"), kwargs.get("start_date"))
             raise error
+        finally:
+            # The sync of the account may stop before its last page, free the worker of its chain
+            self.cancel_prefetch(kwargs.get("parent_id"))
 
 class AccountUsers(LinkedInAds):
     """
@@ -796,9 +1654,9 @@ class AccountUsers(LinkedInAds):
     account_filter = "accounts_param"
     path = "adAccountUsers"
     data_key = "elements"
-    params = {
+    params = MappingProxyType({
         "q": "accounts"
-    }
+    })
 
 class CampaignGroups(LinkedInAds):
     """
@@ -811,9 +1669,9 @@ class CampaignGroups(LinkedInAds):
     account_filter = "search_account_values_param"
     path = "adCampaignGroups"
     data_key = "elements"
-    params = {
+    params = MappingProxyType({
         "q": "search"
-    }
+    })
 
 class Campaigns(LinkedInAds):
     """
@@ -827,9 +1685,9 @@ class Campaigns(LinkedInAds):
     path = "adCampaigns"
     data_key = "elements"
     children = ["ad_analytics_by_campaign", "creatives", "ad_analytics_by_creative"]
-    params = {
+    params = MappingProxyType({
         "q": "search"
-    }
+    })
 
 class Creatives(LinkedInAds):
     """
@@ -843,19 +1701,68 @@ class Creatives(LinkedInAds):
     foreign_key = "id"
     data_key = "elements"
     parent = "campaigns"
-    # The value of the campaigns in the query params should be passed in the encoded format.
-    # Ref - https://learn.microsoft.com/en-us/linkedin/marketing/integrations/ads/account-structure/create-and-manage-creatives?view=li-lms-2023-01&tabs=http#sample-request-3
-    params = {
+    # Without the campaigns criteria of get_parent_params, the finder returns all the creatives of the account
+    params = MappingProxyType({
         "q": "criteria",
-        "campaigns": "List(urn%3Ali%3AsponsoredCampaign%3A{})",
         "sortOrder": "ASCENDING"
-    }
+    })
     # Requires this specific headers for creatives endpoint.
     # Ref - https://learn.microsoft.com/en-us/linkedin/marketing/integrations/ads/account-structure/create-and-manage-creatives?view=li-lms-2023-01&tabs=http#search-for-creatives
-    headers = {'X-Restli-Protocol-Version': "2.0.0",
-               "X-RestLi-Method": "FINDER"}
+    headers = MappingProxyType({'X-Restli-Protocol-Version': "2.0.0",
+                                "X-RestLi-Method": "FINDER"})
+    # The campaigns criteria accepts a List of campaigns, each creative is attributed to
+    # its campaign through its `campaign` URN
+    parent_batch_size = 50
+
+    def get_parent_params(self, parent_ids):
+        # The value of the campaigns in the query params should be passed in the encoded format.
+        # Ref - https://learn.microsoft.com/en-us/linkedin/marketing/integrations/ads/account-structure/create-and-manage-creatives?view=li-lms-2023-01&tabs=http#sample-request-3
+        return {'campaigns': 'List({})'.format(
+            ','.join('urn%3Ali%3AsponsoredCampaign%3A{}'.format(parent_id) for parent_id in parent_ids))}
+
+class AdAnalytics(LinkedInAds):
+    """
+    Base class of the analytics streams, which are synced for each campaign or, when they
+    are account scoped, for all the accounts at once with the accounts facet of their params.
+    """
+    @property
+    def access_probe_extra_params(self):
+        return _build_ad_analytics_probe_date_range()
+
+    # The settled campaigns and the creation of the new campaigns are read from the campaign records
+    parent_fields = ['status', 'created_time', 'last_modified_time']
+
+    def get_parent_params(self, parent_ids):
+        return {'campaigns[0]': 'urn:li:sponsoredCampaign:{}'.format(parent_ids[-1])}
 
-class AdAnalyticsByCampaign(LinkedInAds):
+    def sync_endpoint(self, client, catalog, state, page_size, start_date, selected_streams, date_window_size,
+                      parent_id=None, account_list=None, stream_params=None, analytics_executor=None):
+        """
+        Sync the analytics of the accounts without walking the campaigns, the date windows
+        are checkpointed so that an interrupted sync resumes from the last synced window.
+        """
+        checkpoint = get_checkpoint(state, self.tap_stream_id) or {}
+        resume_date = None
+        if checkpoint.get('window'):
+            resume_date = datetime.date.fromisoformat(checkpoint['window']['end'])
+            LOGGER.info('%s: resuming from date window ending %s', self.tap_stream_id, resume_date)
+
+        checkpoint_throttle = CheckpointThrottle()
+
+        def write_window_checkpoint(window_end_date):
+            write_checkpoint(state, self.tap_stream_id, {'window': {'stream': self.tap_stream_id,
+                                                                    'end': window_end_date.isoformat()}},
+                             emit=checkpoint_throttle.ready())
+
+        return self.sync_ad_analytics(client=client,
+                                      catalog=catalog,
+                                      last_datetime=self.get_bookmark(state, start_date),
+                                      date_window_size=date_window_size,
+                                      resume_date=resume_date,
+                                      on_window_synced=write_window_checkpoint,
+                                      analytics_executor=analytics_executor)
+
+class AdAnalyticsByCampaign(AdAnalytics):
     """
     https://docs.microsoft.com/en-us/linkedin/marketing/integrations/ads-reporting/ads-reporting#analytics-finder
     """
@@ -868,17 +1775,14 @@ class AdAnalyticsByCampaign(LinkedInAds):
     foreign_key = "id"
     data_key = "elements"
     parent = "campaigns"
-    params = {
+    params = MappingProxyType({
         "q": "analytics",
         "pivot": "CAMPAIGN",
         "timeGranularity": "DAILY",
         "count": 10000
-    }
-    @property
-    def access_probe_extra_params(self):
-        return _build_ad_analytics_probe_date_range()
+    })
 
-class AdAnalyticsByCreative(LinkedInAds):
+class AdAnalyticsByCreative(AdAnalytics):
     """
     https://docs.microsoft.com/en-us/linkedin/marketing/integrations/ads-reporting/ads-reporting#analytics-finder
     """
@@ -891,15 +1795,12 @@ class AdAnalyticsByCreative(LinkedInAds):
     foreign_key = "id"
     data_key = "elements"
     parent = "campaigns"
-    params = {
+    params = MappingProxyType({
         "q": "analytics",
         "pivot": "CREATIVE",
         "timeGranularity": "DAILY",
         "count": 10000
-    }
-    @property
-    def access_probe_extra_params(self):
-        return _build_ad_analytics_probe_date_range()
+    })
 
 # Dictionary of the stream classes
 STREAMS = {
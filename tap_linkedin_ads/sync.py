@@ -1,11 +1,29 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor
 import singer
-from tap_linkedin_ads.streams import STREAMS, write_bookmark
+from tap_linkedin_ads.cache import AnalyticsCache, ANALYTICS_CACHE_IMMUTABLE_DAYS
+from tap_linkedin_ads.profiling import profile_stream
+from tap_linkedin_ads.telemetry import metric_tags, flush_counters
+from tap_linkedin_ads.streams import STREAMS, MAX_CHUNK_WORKERS, write_bookmark, clear_checkpoint
 
 LOGGER = singer.get_logger()
 
 LOOKBACK_WINDOW = 7
 DATE_WINDOW_SIZE = 30 # days
 PAGE_SIZE = 100
+VIDEO_ADS_PAGE_SIZE = 100
+# `account`: the child streams of campaigns are synced for the accounts, `campaign`: for each campaign
+SCOPES = ('account', 'campaign')
+# Config parameter and default scope of the child streams which can be synced without their parent
+STREAM_SCOPES = {
+    'creatives': ('creatives_scope', 'campaign'),
+    'ad_analytics_by_campaign': ('analytics_scope', 'campaign'),
+    'ad_analytics_by_creative': ('analytics_scope', 'campaign'),
+}
+# Streams whose searches can be filtered by the status of the records
+STATUS_FILTER_STREAMS = ('campaign_groups', 'campaigns')
+# Days between the full refreshes of the status filtered streams, which sync the records of every status
+FULL_REFRESH_DAYS = 7
 
 def update_currently_syncing(state, stream_name):
     """
@@ -23,10 +41,25 @@ def update_currently_syncing(state, stream_name):
         singer.set_currently_syncing(state, stream_name)
     singer.write_state(state)
 
-def get_streams_to_sync(selected_streams):
+def get_account_scoped_streams(config):
+    """
+    Get the child streams synced for each account rather than for each of their parent records.
+    """
+    account_scoped_streams = []
+    for stream_name, (config_key, default_scope) in STREAM_SCOPES.items():
+        scope = config.get(config_key) or default_scope
+        if scope not in SCOPES:
+            raise Exception("The entered {} ({}) is invalid, expected one of {}".format(
+                config_key.replace('_', ' '), scope, ', '.join(SCOPES)))
+        if scope == 'account':
+            account_scoped_streams.append(stream_name)
+    return account_scoped_streams
+
+def get_streams_to_sync(selected_streams, account_scoped_streams=()):
     """
     Get lists of streams to call the sync method.
     For children, ensure that dependent parent_stream is included even if it is not selected.
+    The account scoped children are synced like the parent streams.
     """
     streams_to_sync = []
 
@@ -34,7 +67,7 @@ def get_streams_to_sync(selected_streams):
     for stream_name in selected_streams:
         stream_obj = STREAMS[stream_name]
         # If the stream has a parent_stream, then it is a child stream
-        parent_stream = hasattr(stream_obj, 'parent') and stream_obj.parent
+        parent_stream = stream_name not in account_scoped_streams and stream_obj.parent
 
         # Append selected parent streams
         if not parent_stream:
@@ -46,25 +79,82 @@ def get_streams_to_sync(selected_streams):
 
     return streams_to_sync
 
-def get_page_size(config):
+def get_status_filter(config):
     """
-    Get page size from config.
+    Get the statuses of the campaign groups and campaigns to sync from the config,
+    an empty list if the records of every status are synced.
+    """
+    return [status.strip().upper() for status in config.get('status_filter', '').split(',') if status.strip()]
+
+def get_full_refresh_streams(config, state):
+    """
+    Get the status filtered streams whose last full refresh is older than the full refresh days,
+    they are synced without the status filter and from the start date to capture the records
+    which changed to a filtered out status since then.
+    """
+    if not get_status_filter(config):
+        return []
+    full_refresh_days = int(config.get('full_refresh_days') or FULL_REFRESH_DAYS)
+    due_date = (datetime.date.today() - datetime.timedelta(days=full_refresh_days)).isoformat()
+    full_refreshes = state.get('full_refreshes', {})
+    return [stream_name for stream_name in STATUS_FILTER_STREAMS if full_refreshes.get(stream_name, '') <= due_date]
+
+def get_positive_integer(config, key, default):
+    """
+    Get a positive integer parameter from config.
     Return the default value if an empty string is given and raise an exception if an invalid value is given.
     """
-    page_size = config.get('page_size', PAGE_SIZE)
-    if page_size == "":
-        return PAGE_SIZE
+    value = config.get(key, default)
+    if value == "":
+        return default
     try:
-        if isinstance(page_size, float):
+        if isinstance(value, float):
             raise Exception
 
-        page_size = int(page_size)
-        if page_size <= 0:
-            # Raise an exception if negative page_size is given in the config.
+        value = int(value)
+        if value <= 0:
+            # Raise an exception if negative value is given in the config.
             raise Exception
-        return page_size
+        return value
     except Exception:
-        raise Exception("The entered page size ({}) is invalid".format(page_size))
+        raise Exception("The entered {} ({}) is invalid".format(key.replace('_', ' '), value))
+
+def get_page_size(config, key='page_size', default=PAGE_SIZE):
+    """
+    Get page size from config.
+    """
+    return get_positive_integer(config, key, default)
+
+def get_stream_params(config, account_list, stream_names, full_refresh_streams=()):
+    """
+    Get the query params set from the config, by stream name: the account filter of the given
+    streams, the status filter of the status filtered streams out of a full refresh and the page size of video_ads.
+    """
+    # The posts finder of video_ads has its own page size
+    stream_params = {'video_ads': {'count': get_page_size(config, 'video_ads_page_size', VIDEO_ADS_PAGE_SIZE)}}
+    status_filter = get_status_filter(config)
+    if status_filter:
+        for stream_name in STATUS_FILTER_STREAMS:
+            if stream_name not in full_refresh_streams:
+                stream_params[stream_name] = {'search': '(status:(values:List({})))'.format(','.join(status_filter))}
+    if not config.get('accounts') or not account_list:
+        return stream_params
+
+    for stream_name in stream_names:
+        # Add appropriate account_filter query parameters based on account_filter type
+        account_filter = STREAMS[stream_name].account_filter
+        params = {}
+        if account_filter == 'search_id_values_param':
+            # Convert account IDs to URN format
+            urn_list = ["urn%3Ali%3AsponsoredAccount%3A{}".format(account_id) for account_id in account_list]
+            # Create the query parameter string
+            params['search'] = "(id:(values:List({})))".format(','.join(urn_list))
+        elif account_filter == 'accounts_param':
+            for idx, account in enumerate(account_list):
+                params['accounts[{}]'.format(idx)] = 'urn:li:sponsoredAccount:{}'.format(account)
+        if params:
+            stream_params[stream_name] = params
+    return stream_params
 
 def sync(client, config, catalog, state):
     """
@@ -99,52 +189,83 @@ def sync(client, config, catalog, state):
     # last_stream = Previous currently synced stream, if the load was interrupted
     last_stream = singer.get_currently_syncing(state)
     LOGGER.info('last/currently syncing stream: %s', last_stream)
+    # Only the checkpoint of the interrupted stream can be resumed
+    for checkpoint_stream in list(state.get('checkpoints', {})):
+        if checkpoint_stream != last_stream:
+            clear_checkpoint(state, checkpoint_stream)
 
     # Get the list of streams(to sync stream itself or its child stream) for which
     # sync method needs to be called
-    stream_to_sync = get_streams_to_sync(selected_streams)
+    account_scoped_streams = get_account_scoped_streams(config)
+    stream_to_sync = get_streams_to_sync(selected_streams, account_scoped_streams)
 
-    # Loop through all `stream_to_sync` streams
-    for stream_name in stream_to_sync:
-        stream_obj = STREAMS[stream_name]()
+    # Resume an interrupted sync from the currently syncing stream, the streams
+    # synced before it are synced after the remaining streams
+    if last_stream in stream_to_sync:
+        last_index = stream_to_sync.index(last_stream)
+        stream_to_sync = stream_to_sync[last_index:] + stream_to_sync[:last_index]
 
-        # Add appropriate account_filter query parameters based on account_filter type
-        account_filter = stream_obj.account_filter
-        if config.get("accounts") and account_filter is not None:
-            if len(account_list) > 0:
-                params = stream_obj.params
-                if account_filter == 'search_id_values_param':
-                    # Convert account IDs to URN format
-                    urn_list = ["urn%3Ali%3AsponsoredAccount%3A{}".format(account_id) for account_id in account_list]
-                    # Create the query parameter string
-                    param_value = "(id:(values:List({})))".format(','.join(urn_list))
-                    params['search'] = param_value
-                elif account_filter == 'accounts_param':
-                    for idx, account in enumerate(account_list):
-                        params['accounts[{}]'.format(idx)] = \
-                            'urn:li:sponsoredAccount:{}'.format(account)
-                # Update params of specific stream
-                stream_obj.params = params
-
-        LOGGER.info('START Syncing: %s', stream_name)
-        update_currently_syncing(state, stream_name)
-
-        # Write schema for parent streams
-        if stream_name in selected_streams:
-            stream_obj.write_schema(catalog)
-
-        total_records, max_bookmark_value = stream_obj.sync_endpoint(
-            client=client, catalog=catalog,
-            state=state, page_size=page_size,
-            start_date=start_date,
-            selected_streams=selected_streams,
-            date_window_size=date_window_size,
-            account_list=account_list)
-
-        # Write parent stream's bookmarks
-        if stream_obj.replication_keys and stream_name in selected_streams:
-            write_bookmark(state, max_bookmark_value, stream_name)
-
-        update_currently_syncing(state, None)
-        LOGGER.info('Synced: %s, total_records: %s', stream_name, total_records)
-        LOGGER.info('FINISHED Syncing: %s', stream_name)
+    # The params set from the config are built once for all the streams
+    full_refresh_streams = get_full_refresh_streams(config, state)
+    stream_params = get_stream_params(config, account_list, stream_to_sync, full_refresh_streams)
+
+    # Opt-in on-disk cache of the analytics of the past days
+    if config.get('analytics_cache_path'):
+        client.analytics_cache = AnalyticsCache(
+            config['analytics_cache_path'],
+            get_positive_integer(config, 'analytics_cache_immutable_days', ANALYTICS_CACHE_IMMUTABLE_DAYS))
+
+    # The field chunks of the analytics windows are fetched by the same threads for all the streams
+    analytics_executor = ThreadPoolExecutor(max_workers=MAX_CHUNK_WORKERS)
+    try:
+        # Loop through all `stream_to_sync` streams
+        for stream_name in stream_to_sync:
+            stream_obj = STREAMS[stream_name]().with_params(stream_params.get(stream_name, {})) \
+                .without_children(account_scoped_streams)
+
+            LOGGER.info('START Syncing: %s', stream_name)
+            update_currently_syncing(state, stream_name)
+
+            # Write schema for parent streams
+            if stream_name in selected_streams:
+                stream_obj.write_schema(catalog)
+
+            if stream_name in full_refresh_streams:
+                # The records whose status was filtered out may be older than the bookmark
+                LOGGER.info('%s: full refresh of all the statuses from the start date', stream_name)
+                state.get('bookmarks', {}).pop(stream_name, None)
+
+            with profile_stream(client.profiler, stream_name), metric_tags(stream=stream_name):
+                total_records, max_bookmark_value = stream_obj.sync_endpoint(
+                    client=client, catalog=catalog,
+                    state=state, page_size=page_size,
+                    start_date=start_date,
+                    selected_streams=selected_streams,
+                    date_window_size=date_window_size,
+                    account_list=account_list,
+                    stream_params=stream_params,
+                    analytics_executor=analytics_executor)
+
+            # Write parent stream's bookmarks
+            if stream_obj.replication_keys and stream_name in selected_streams:
+                write_bookmark(state, max_bookmark_value, stream_name)
+
+            # Emit the counters of the stream
+            flush_counters()
+
+            if stream_name in full_refresh_streams:
+                state.setdefault('full_refreshes', {})[stream_name] = datetime.date.today().isoformat()
+
+            # The stream is completed, remove its checkpoint
+            clear_checkpoint(state, stream_name)
+            update_currently_syncing(state, None)
+            LOGGER.info('Synced: %s, total_records: %s', stream_name, total_records)
+            LOGGER.info('FINISHED Syncing: %s', stream_name)
+    finally:
+        analytics_executor.shutdown()
+        if client.analytics_cache is not None:
+            client.analytics_cache.close()
+            client.analytics_cache = None
+
+    client.log_transfer_stats()
+    flush_counters()
@@ -0,0 +1,111 @@
+import time
+import threading
+import contextlib
+import contextvars
+import singer
+from singer import metrics
+
+LOGGER = singer.get_logger()
+
+class Metric:
+    """
+    Names of the metrics of the phases of a sync, emitted as singer metrics
+    in addition to the `http_request_duration` and `record_count` of singer.
+    """
+    json_decode_duration = 'json_decode_duration'
+    transform_json_duration = 'transform_json_duration'
+    process_records_duration = 'process_records_duration'
+    write_duration = 'write_duration'
+    backoff_duration = 'backoff_duration'
+    http_request_count = 'http_request_count'
+    page_count = 'page_count'
+    empty_response_count = 'empty_response_count'
+    retry_count = 'retry_count'
+    http_wire_bytes = 'http_wire_bytes'
+    http_decoded_bytes = 'http_decoded_bytes'
+
+class Tag:
+    stream = 'stream'
+    account = 'account'
+    parent_id = 'parent_id'
+    error = 'error'
+
+# Tags added to the metrics emitted in the current context, the worker threads
+# run in a copy of the context of the thread submitting them
+METRIC_TAGS = contextvars.ContextVar('metric_tags', default=None)
+
+def get_metric_tags(**tags):
+    """
+    Return the tags of the current context updated with the given tags, without the empty tags.
+    The parent IDs of a batch of parents are joined by commas.
+    """
+    tags = {**(METRIC_TAGS.get() or {}), **tags}
+    return {key: ','.join(str(item) for item in value) if isinstance(value, list) else value
+            for key, value in tags.items() if value is not None}
+
+@contextlib.contextmanager
+def metric_tags(**tags):
+    """
+    Add the tags to all the metrics emitted in the block.
+    """
+    token = METRIC_TAGS.set(get_metric_tags(**tags))
+    try:
+        yield
+    finally:
+        METRIC_TAGS.reset(token)
+
+def timer(metric, **tags):
+    """
+    Return a singer timer of the block, tagged with the tags of the current context.
+    """
+    return metrics.Timer(metric, get_metric_tags(**tags))
+
+def log_timer(metric, value, **tags):
+    """
+    Emit a timer metric of an already measured duration, in seconds.
+    """
+    metrics.log(LOGGER, metrics.Point('timer', metric, value, get_metric_tags(**tags)))
+
+class MetricCounters:
+    """
+    Counters aggregated by metric and tags, which are emitted every log_interval seconds and when flushed.
+    Unlike singer.metrics.Counter, the counters can be incremented from several threads.
+    """
+    def __init__(self, log_interval=metrics.DEFAULT_LOG_INTERVAL):
+        self.log_interval = log_interval
+        self.values = {}
+        self.last_log_time = time.time()
+        self.__lock = threading.Lock()
+
+    def increment(self, metric, amount=1, **tags):
+        key = (metric, tuple(sorted(get_metric_tags(**tags).items())))
+        with self.__lock:
+            self.values[key] = self.values.get(key, 0) + amount
+            ready_to_log = time.time() - self.last_log_time > self.log_interval
+        if ready_to_log:
+            self.flush()
+
+    def flush(self):
+        with self.__lock:
+            values, self.values = self.values, {}
+            self.last_log_time = time.time()
+        for (metric, tags), value in values.items():
+            metrics.log(LOGGER, metrics.Point('counter', metric, value, dict(tags)))
+
+COUNTERS = MetricCounters()
+
+def increment_counter(metric, amount=1, **tags):
+    COUNTERS.increment(metric, amount, **tags)
+
+def flush_counters():
+    COUNTERS.flush()
+
+def log_backoff(details):
+    """
+    Backoff handler counting the retries of the requests by status and emitting the time slept before the retry.
+    """
+    error = details.get('exception')
+    tags = {Tag.error: type(error).__name__ if error else None,
+            metrics.Tag.http_status_code: getattr(error, 'status_code', None)}
+    increment_counter(Metric.retry_count, **tags)
+    log_timer(Metric.backoff_duration, details.get('wait', 0), **tags)
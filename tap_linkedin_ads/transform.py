@@ -1,5 +1,5 @@
 import re
-from re import sub
+import functools
 from decimal import Decimal
 
 from datetime import datetime, timedelta
@@ -54,11 +54,31 @@ def convert_json(this_json):
     return out
 
 
+# Characters removed from the other currency strings, such as currency symbols and thousands separators
+NON_DECIMAL_CHARACTERS = re.compile(r'[^\d.]')
+DECIMAL_CHARACTER = re.compile(r'[\d.]')
+# Number of the decoded currency strings kept, the same amounts such as "0" are repeated over the records
+DECIMAL_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=DECIMAL_CACHE_SIZE)
+def decode_decimal(val):
+    # Plain decimal literals, such as "-12.5", are decoded as is
+    unsigned_val = val[1:] if val.startswith('-') else val
+    if unsigned_val.replace('.', '', 1).isdecimal():
+        return Decimal(val)
+    digits = NON_DECIMAL_CHARACTERS.sub('', val)
+    # The amount is negative if a minus sign precedes its digits, e.g. "-$1,234.50"
+    first_digit = DECIMAL_CHARACTER.search(val)
+    if first_digit and '-' in val[:first_digit.start()]:
+        digits = '-' + digits
+    return Decimal(digits)
+
+
 # convert string/currency number to decimal
 def string_to_decimal(val):
     try:
-        new_val = Decimal(sub(r'[^\d.]', '', val))
-        return new_val
+        return decode_decimal(val)
     except Exception:
         return None
 
@@ -112,7 +132,23 @@ def transform_analytics(data_dict):
     return data_dict
 
 
-def transform_campaigns(data_dict): #pylint: disable=too-many-branches,too-many-statements
+# Abstract the facets of a targeting section to a list of type/values
+def flatten_facets(facets):
+    flattened = []
+    for facet_type, facet_values in facets.items():
+        if isinstance(facet_values, dict):
+            values = ['{}'.format(facet_values)]
+        elif facet_values and isinstance(facet_values, list) and isinstance(facet_values[0], dict):
+            values = ['{}'.format(value) for value in facet_values]
+        elif isinstance(facet_values, list):
+            values = facet_values
+        else:
+            values = ['{}'.format(facet_values)]
+        flattened.append({'type': facet_type, 'values': values})
+    return flattened
+
+
+def transform_campaigns(data_dict):
     # convert string numbers to float/decimal numbers
     currency_fields = ['daily_budget', 'unit_cost']
     for currency_field in currency_fields:
@@ -123,136 +159,44 @@ def transform_campaigns(data_dict): #pylint: disable=too-many-branches,too-many-
     if 'targeting' not in data_dict or 'targeting_criteria' not in data_dict:
         return data_dict
 
-    new_dict = data_dict
-    # Abstract targeting excludes
-    or_dict = data_dict.get('targeting', {}).get('excluded_targeting_facets', {})
-    if 'excluded_targeting_facets' in new_dict['targeting']:
-        del new_dict['targeting']['excluded_targeting_facets']
-    new_dict['targeting']['excluded_targeting_facets'] = []
-    ky_cnt = 0
-    num = len(or_dict) - 1
-    while ky_cnt <= num:
-        key = list(or_dict)[ky_cnt]
-        if isinstance(or_dict[key], list):
-            if isinstance(or_dict[key][0], str):
-                val = or_dict[key]
-            elif isinstance(or_dict[key][0], dict):
-                val = []
-                for value in or_dict[key]:
-                    val.append('{}'.format(value))
-        elif isinstance(or_dict[key], dict):
-            val = []
-            val.append('{}'.format(or_dict[key]))
-        append_dict = {'type': key,
-                       'values': val}
-        new_dict['targeting']['excluded_targeting_facets'].append(append_dict)
-        ky_cnt = ky_cnt + 1
-
-    # Abstract targeting includes
-    or_dict = data_dict.get('targeting', {}).get('included_targeting_facets', {})
-    if 'excluded_targeting_facets' in new_dict['targeting']:
-        del new_dict['targeting']['included_targeting_facets']
-    new_dict['targeting']['included_targeting_facets'] = []
-    ky_cnt = 0
-    num = len(or_dict) - 1
-    while ky_cnt <= num:
-        key = list(or_dict)[ky_cnt]
-        if isinstance(or_dict[key], list):
-            if isinstance(or_dict[key][0], str):
-                val = or_dict[key]
-            elif isinstance(or_dict[key][0], dict):
-                val = []
-                for value in or_dict[key]:
-                    val.append('{}'.format(value))
-        elif isinstance(or_dict[key], dict):
-            val = []
-            val.append('{}'.format(or_dict[key]))
-        append_dict = {'type': key,
-                       'values': val}
-        new_dict['targeting']['included_targeting_facets'].append(append_dict)
-        ky_cnt = ky_cnt + 1
+    # Abstract targeting excludes and includes, the abstracted facets are moved to the end of targeting
+    targeting = data_dict['targeting']
+    for section in ('excluded_targeting_facets', 'included_targeting_facets'):
+        targeting[section] = flatten_facets(targeting.pop(section, {}))
 
     # Abstract targeting_criteria excludes
-    or_dict = data_dict.get('targeting_criteria', {}).get('exclude', {}).get('or', {})
-    if 'exclude' in new_dict['targeting_criteria']:
-        del new_dict['targeting_criteria']['exclude']
-    new_dict['targeting_criteria']['exclude'] = []
-    ky_cnt = 0
-    num = len(or_dict) - 1
-    while ky_cnt <= num:
-        key = list(or_dict)[ky_cnt]
-        if isinstance(or_dict[key], list):
-            if isinstance(or_dict[key][0], str):
-                val = or_dict[key]
-            elif isinstance(or_dict[key][0], dict):
-                val = []
-                for value in or_dict[key]:
-                    val.append('{}'.format(value))
-        elif isinstance(or_dict[key], dict):
-            val = []
-            val.append('{}'.format(or_dict[key]))
-        append_dict = {'type': key,
-                       'values': val}
-        new_dict['targeting_criteria']['exclude'].append(append_dict)
-        ky_cnt = ky_cnt + 1
-
-    # Abstract targeting_criteria includes
-    and_list = data_dict.get('targeting_criteria', {}).get('include', {}).get('and', {})
-    for idx, and_criteria in enumerate(and_list):
-        or_dict = and_criteria.get('or', {})
-        if 'or' in new_dict['targeting_criteria']['include']['and'][idx]:
-            del new_dict['targeting_criteria']['include']['and'][idx]['or']
-        ky_cnt = 0
-        num = len(or_dict) - 1
-        while ky_cnt <= num:
-            key = list(or_dict)[ky_cnt]
-            if isinstance(or_dict[key], list):
-                if isinstance(or_dict[key][0], str):
-                    val = or_dict[key]
-                elif isinstance(or_dict[key][0], dict):
-                    val = []
-                    for value in or_dict[key]:
-                        val.append('{}'.format(value))
-            elif isinstance(or_dict[key], dict):
-                val = []
-                val.append('{}'.format(or_dict[key]))
-            new_dict['targeting_criteria']['include']['and'][idx]['type'] = key
-            new_dict['targeting_criteria']['include']['and'][idx]['values'] = val
-            ky_cnt = ky_cnt + 1
+    targeting_criteria = data_dict['targeting_criteria']
+    targeting_criteria['exclude'] = flatten_facets(targeting_criteria.pop('exclude', {}).get('or', {}))
 
-    return new_dict
+    # Abstract targeting_criteria includes, each criteria keeps the type/values of its last facet
+    for and_criteria in targeting_criteria.get('include', {}).get('and', {}):
+        flattened = flatten_facets(and_criteria.pop('or', {}))
+        if flattened:
+            and_criteria['type'] = flattened[-1]['type']
+            and_criteria['values'] = flattened[-1]['values']
+
+    return data_dict
 
 # Abstract variables to type with key/value pairs
 def transform_creatives(data_dict):
     if 'variables' not in data_dict:
         return data_dict
 
-    new_dict = data_dict
-    variables = new_dict.get('variables', {}).get('data', {})
-    ky_cnt = 0
-    num = len(variables) - 1
-    while ky_cnt <= num:
-        key = list(variables)[ky_cnt]
-        params = new_dict.get('variables', {}).get('data', {}).get(key, {})
-        new_dict['variables']['type'] = key
-        new_dict['variables']['values'] = []
-
-        pk_cnt = 0
-        pnum = len(params) - 1
-        while pk_cnt <= pnum:
-            param_key = list(params)[pk_cnt]
-            param_value = new_dict.get('variables', {}).get('data', {}).get(key, {})\
-                .get(param_key, '')
-            val = {'key': param_key,
-                   'value': '{}'.format(param_value)}
-            new_dict['variables']['values'].append(val)
-            pk_cnt = pk_cnt + 1
-
-        if 'data' in new_dict['variables']:
-            del new_dict['variables']['data']
-        ky_cnt = ky_cnt + 1
+    variables = data_dict['variables']
+    data = variables.get('data', {})
+    if not data:
+        return data_dict
 
-    return new_dict
+    # `data` holds a single variables type, the union member of the creative. If several types
+    # are returned, the last type is kept without values, as the values are only read from `data`
+    # for the first type before `data` is removed.
+    for index, (variable_type, params) in enumerate(data.items()):
+        variables['type'] = variable_type
+        variables['values'] = [{'key': param_key, 'value': '{}'.format(param_value)}
+                               for param_key, param_value in params.items()] if index == 0 else []
+    del variables['data']
+
+    return data_dict
 
 
 # Copy audit fields to root level
@@ -314,25 +258,27 @@ def transform_video_ads(data_dict):
         data_dict['created_time'] = data_dict["created_at"]
     return data_dict
 
+def transform_record(record, stream_name):
+    this_dict = record
+    if stream_name.startswith('ad_analytics_by_'):
+        this_dict = transform_analytics(this_dict)
+    elif stream_name == 'accounts':
+        this_dict = transform_accounts(this_dict)
+    elif stream_name == 'campaigns':
+        this_dict = transform_campaigns(this_dict)
+    elif stream_name == 'creatives':
+        this_dict = transform_creatives(this_dict)
+    elif stream_name == 'video_ads':
+        this_dict = transform_video_ads(this_dict)
+    this_dict = transform_urn(this_dict)
+    this_dict = transform_audit_fields(this_dict)
+    return this_dict
+
 def transform_data(data_dict, stream_name):
     new_dict = data_dict
     i = 0
     for record in data_dict['elements']:
-        this_dict = record
-        if stream_name.startswith('ad_analytics_by_'):
-            this_dict = transform_analytics(this_dict)
-        elif stream_name == 'accounts':
-            this_dict = transform_accounts(this_dict)
-        elif stream_name == 'campaigns':
-            this_dict = transform_campaigns(this_dict)
-        elif stream_name == 'creatives':
-            this_dict = transform_creatives(this_dict)
-        elif stream_name == 'video_ads':
-            this_dict = transform_video_ads(this_dict)
-        this_dict = transform_urn(this_dict)
-        this_dict = transform_audit_fields(this_dict)
-
-        new_dict['elements'][i] = this_dict
+        new_dict['elements'][i] = transform_record(record, stream_name)
         i = i + 1
     return new_dict
 
@@ -0,0 +1,47 @@
+import datetime
+import os
+import tempfile
+import unittest
+from parameterized import parameterized
+from tap_linkedin_ads.cache import AnalyticsCache
+
+class TestAnalyticsCache(unittest.TestCase):
+    """
+    Test the on-disk cache of the analytics responses.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'analytics.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cached_pages_persisted(self):
+        """
+        Test that the cached pages are read back by another cache on the same file.
+        """
+        key = ('CAMPAIGN', 'urn:li:sponsoredCampaign:1', '2022-01-01', '2022-01-31', 'clicks,dateRange,pivotValues')
+        pages = [[{'clicks': 1, 'pivotValues': ['urn:li:sponsoredCampaign:1']}], []]
+        cache = AnalyticsCache(self.path)
+        cache.set(key, pages)
+        cache.close()
+
+        cache = AnalyticsCache(self.path)
+        # Verify the cached pages of the key and that other keys are not cached
+        self.assertEqual(cache.get(key), pages)
+        self.assertIsNone(cache.get(key[:4] + ('impressions,dateRange,pivotValues',)))
+        cache.close()
+
+    @parameterized.expand([
+        ['test_window_ended_before_horizon', datetime.date(2022, 1, 31), True],
+        ['test_window_ended_on_horizon', datetime.date(2022, 2, 1), True],
+        ['test_window_ended_after_horizon', datetime.date(2022, 2, 2), False],
+    ])
+    def test_is_immutable(self, name, end_date, expected_immutable):
+        """
+        Test that only the windows ended `immutable_days` before today are immutable.
+        """
+        cache = AnalyticsCache(self.path, immutable_days=30)
+
+        self.assertEqual(cache.is_immutable(end_date, today=datetime.date(2022, 3, 3)), expected_immutable)
+        cache.close()
@@ -3,6 +3,11 @@ import tap_linkedin_ads.client as _client
 import tap_linkedin_ads
 import unittest
 import requests
+import threading
+import gzip
+import io
+import json
+import urllib3
 from datetime import datetime, timedelta
 import calendar
 
@@ -158,3 +163,175 @@ class TestLinkedInClient(unittest.TestCase):
 
         client.get_token_expires()
         self.assertEqual(mock_logger.warning.call_count, 0)
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Test the in-process response cache of the client.
+    """
+
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.request", return_value={'elements': [{'id': 1}]})
+    def test_cached_endpoint(self, mock_request):
+        """
+        Test that the identical requests of an opted-in endpoint are fetched once, whatever
+        the order of their query parameters, and that other endpoints are not cached.
+        """
+        client = _client.LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        client.cache_endpoints('accounts')
+
+        first = client.get(url='https://api.linkedin.com/rest/adAccounts?q=search&pageSize=1000', endpoint='accounts')
+        first['elements'].append({'id': 2})
+        second = client.get(url='https://api.linkedin.com/rest/adAccounts?pageSize=1000&q=search', endpoint='accounts')
+        client.get(url='https://api.linkedin.com/rest/adCampaigns?q=search', endpoint='campaigns')
+        client.get(url='https://api.linkedin.com/rest/adCampaigns?q=search', endpoint='campaigns')
+
+        # Verify that the cached response is not changed by the callers
+        self.assertEqual(second, {'elements': [{'id': 1}]})
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used response is evicted once the cache is full.
+        """
+        cache = _client.ResponseCache(max_size=2)
+        fetch = mock.Mock(side_effect=lambda: {'value': fetch.call_count})
+
+        cache.get_or_fetch('a', fetch)
+        cache.get_or_fetch('b', fetch)
+        cache.get_or_fetch('a', fetch)
+        cache.get_or_fetch('c', fetch)
+        cache.get_or_fetch('a', fetch)
+        cache.get_or_fetch('b', fetch)
+
+        # Verify that 'b' is evicted when 'c' is added and is fetched again
+        self.assertEqual(fetch.call_count, 4)
+        self.assertEqual(len(cache), 2)
+
+    def test_single_flight(self):
+        """
+        Test that concurrent requests of the same key wait for the request in flight.
+        """
+        cache = _client.ResponseCache()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fetch():
+            started.set()
+            release.wait()
+            return {'elements': []}
+
+        leader = threading.Thread(target=cache.get_or_fetch, args=('a', fetch))
+        leader.start()
+        started.wait()
+        follower_fetch = mock.Mock(return_value={'elements': [1]})
+        results = []
+        follower = threading.Thread(target=lambda: results.append(cache.get_or_fetch('a', follower_fetch)))
+        follower.start()
+        release.set()
+        leader.join()
+        follower.join()
+
+        # Verify that the follower gets the response of the leader without fetching
+        self.assertEqual(results, [{'elements': []}])
+        self.assertFalse(follower_fetch.called)
+
+    def test_failed_request_not_cached(self):
+        """
+        Test that the error of a request is not cached.
+        """
+        cache = _client.ResponseCache()
+        fetch = mock.Mock(side_effect=[_client.Server5xxError('error'), {'elements': []}])
+
+        with self.assertRaises(_client.Server5xxError):
+            cache.get_or_fetch('a', fetch)
+
+        self.assertEqual(cache.get_or_fetch('a', fetch), {'elements': []})
+
+class TestResponseCompression(unittest.TestCase):
+    """
+    Test the transfer metrics of the compressed responses of the client.
+    """
+
+    @mock.patch("requests.Session.request")
+    def test_transfer_stats(self, mock_request):
+        """
+        Test that the bytes on the wire and the decoded bytes are recorded per endpoint.
+        """
+        body = json.dumps({'elements': [{'id': 1, 'name': 'campaign'}] * 100}).encode()
+        mock_request.side_effect = lambda *args, **kwargs: _make_response(gzip.compress(body), 'gzip')
+        client = _client.LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+
+        data = client.get(url='https://api.linkedin.com/rest/adCampaigns?q=search', endpoint='campaigns')
+        client.get(url='https://api.linkedin.com/rest/adCampaigns?q=search', endpoint='campaigns')
+
+        # Verify that the response is decoded and the compressed size is recorded
+        self.assertEqual(len(data['elements']), 100)
+        self.assertEqual(client.transfer_stats['campaigns'],
+                         {'responses': 2, 'wire_bytes': 2 * len(gzip.compress(body)), 'decoded_bytes': 2 * len(body)})
+
+def _make_response(content, content_encoding=None):
+    """
+    Build a response whose body is read from a raw urllib3 response like a real response.
+    """
+    headers = {'Content-Encoding': content_encoding} if content_encoding else {}
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = urllib3.HTTPResponse(body=io.BytesIO(content), headers=headers, preload_content=False)
+    response.headers = requests.structures.CaseInsensitiveDict(headers)
+    return response
+
+class TestApiRequest(unittest.TestCase):
+    """
+    Test the structured request of the client.
+    """
+
+    def test_from_url(self):
+        """
+        Test that the query string of a URL is kept as is and the parameters are parsed in order.
+        """
+        request = _client.ApiRequest.from_url('https://api.linkedin.com/rest/adAccounts?q=search&search=(id:(values:List(1)))')
+
+        self.assertEqual(request.path, 'https://api.linkedin.com/rest/adAccounts')
+        self.assertEqual(request.params, {'q': 'search', 'search': '(id:(values:List(1)))'})
+        self.assertEqual(request.url, 'https://api.linkedin.com/rest/adAccounts?q=search&search=(id:(values:List(1)))')
+
+    def test_with_param(self):
+        """
+        Test that setting a parameter returns a new request and keeps the order of the parameters.
+        """
+        request = _client.ApiRequest('https://api.linkedin.com/rest/adCampaigns', {'pageSize': 100, 'q': 'search'})
+
+        next_request = request.with_param('pageToken', 'abc').with_param('pageToken', 'def')
+
+        self.assertEqual(next_request.query, 'pageSize=100&q=search&pageToken=def')
+        self.assertEqual(request.query, 'pageSize=100&q=search')
+
+    @mock.patch("requests.Session.request")
+    def test_tunneled_request(self, mock_request):
+        """
+        Test that the query of a tunneled request is sent as the body of a POST request.
+        """
+        mock_request.return_value = _make_response(b'{}')
+        client = _client.LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+
+        client.get(url=_client.ApiRequest('https://api.linkedin.com/rest/adCampaigns', {'q': 'search'}), endpoint='campaigns')
+        client.get(url=_client.ApiRequest('https://api.linkedin.com/rest/adCampaigns', {'q': 'search'}, tunnel=False),
+                   endpoint='campaigns')
+
+        self.assertEqual(mock_request.call_args_list[0][0], ('POST', 'https://api.linkedin.com/rest/adCampaigns'))
+        self.assertEqual(mock_request.call_args_list[0][1]['data'], 'q=search')
+        self.assertEqual(mock_request.call_args_list[1][0], ('GET', 'https://api.linkedin.com/rest/adCampaigns?q=search'))
+
+    @mock.patch("requests.Session.request")
+    def test_request_headers_not_mutated(self, mock_request):
+        """
+        Test that the headers of the caller are copied, not updated with the headers of the request.
+        """
+        mock_request.return_value = _make_response(b'{}')
+        client = _client.LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        headers = {'X-Restli-Protocol-Version': '2.0.0'}
+
+        client.get(url='https://api.linkedin.com/rest/posts?q=dscAdAccount', endpoint='video_ads', headers=headers)
+
+        self.assertEqual(headers, {'X-Restli-Protocol-Version': '2.0.0'})
+        self.assertEqual(mock_request.call_args[1]['headers']['X-HTTP-Method-Override'], 'GET')
+        self.assertEqual(mock_request.call_args[1]['headers']['X-Restli-Protocol-Version'], '2.0.0')
@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import pstats
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from tap_linkedin_ads import parse_profile_args
+from tap_linkedin_ads.profiling import SyncProfiler, profile_stream, profile_worker
+from tap_linkedin_ads.transform import transform_json
+
+def sync_campaigns():
+    return transform_json({'elements': [{'id': 'urn:li:sponsoredCampaign:1'}]}, 'campaigns')
+
+def sync_ad_analytics():
+    return sum(range(1000))
+
+class TestSyncProfiler(unittest.TestCase):
+    """
+    Test the profiling of the sync of the streams.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_profile_streams(self):
+        """
+        Test that the profile of a parent stream excludes the sync of its child streams.
+        """
+        profiler = SyncProfiler(self.directory.name)
+        with profiler.profile('campaigns'):
+            sync_campaigns()
+            with profiler.profile('ad_analytics_by_campaign'):
+                sync_ad_analytics()
+            sync_campaigns()
+
+        campaigns_functions = {key[2] for key in pstats.Stats(profiler.profiles['campaigns']).stats}
+        analytics_functions = {key[2] for key in pstats.Stats(profiler.profiles['ad_analytics_by_campaign']).stats}
+        self.assertIn('sync_campaigns', campaigns_functions)
+        self.assertNotIn('sync_ad_analytics', campaigns_functions)
+        self.assertIn('sync_ad_analytics', analytics_functions)
+        self.assertNotIn('sync_campaigns', analytics_functions)
+
+    def test_write_reports(self):
+        """
+        Test that the profile and the time split of each stream are written to the directory.
+        """
+        profiler = SyncProfiler(self.directory.name)
+        with profile_stream(profiler, 'campaigns'):
+            sync_campaigns()
+        profiler.write_reports()
+
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'campaigns.prof')))
+        with open(os.path.join(self.directory.name, 'campaigns.txt'), encoding='utf-8') as report:
+            first_line = report.readline()
+        phase_times = json.loads(first_line.split(': ', 1)[1])
+        self.assertEqual(set(phase_times), {'network', 'json_decode', 'transform_json', 'singer_transformer',
+                                            'stdout', 'worker_wait', 'other', 'total'})
+        self.assertGreater(phase_times['transform_json'], 0)
+
+    def test_profile_worker_threads(self):
+        """
+        Test that the time of the worker threads is added to the phases of their stream and that
+        the sync thread waiting for them is reported as worker_wait.
+        """
+        profiler = SyncProfiler(self.directory.name)
+
+        def fetch_chunk():
+            with profile_worker(profiler, 'ad_analytics_by_campaign'):
+                for _ in range(100):
+                    sync_campaigns()
+
+        with profile_stream(profiler, 'ad_analytics_by_campaign'), ThreadPoolExecutor(max_workers=2) as executor:
+            for future in [executor.submit(fetch_chunk) for _ in range(2)]:
+                future.result()
+        profiler.write_reports()
+
+        with open(os.path.join(self.directory.name, 'ad_analytics_by_campaign.txt'), encoding='utf-8') as report:
+            phase_times = json.loads(report.readline().split(': ', 1)[1])
+        self.assertGreater(phase_times['transform_json'], 0)
+        self.assertGreater(phase_times['worker_wait'], 0)
+        # Verify that the calls of both workers are in the written profile
+        stats = pstats.Stats(os.path.join(self.directory.name, 'ad_analytics_by_campaign.prof')).stats
+        self.assertEqual(sum(call_count for (_, _, function_name), (_, call_count, _, _, _) in stats.items()
+                             if function_name == 'sync_campaigns'), 200)
+
+    def test_invalid_profiler(self):
+        """
+        Test that an unknown profiler is rejected.
+        """
+        with self.assertRaises(Exception) as err:
+            SyncProfiler(self.directory.name, 'yappi')
+        self.assertEqual(str(err.exception), 'The profiler (yappi) is invalid, expected one of cprofile, pyinstrument')
+
+    @mock.patch('sys.argv', ['tap-linkedin-ads', '--config', 'config.json', '--profile', 'profiles', '--catalog', 'catalog.json'])
+    def test_parse_profile_args(self):
+        """
+        Test that the profiling options are removed from the arguments parsed by singer.
+        """
+        profile_args = parse_profile_args()
+
+        self.assertEqual((profile_args.profile, profile_args.profiler), ('profiles', 'cprofile'))
+        self.assertEqual(sys.argv, ['tap-linkedin-ads', '--config', 'config.json', '--catalog', 'catalog.json'])
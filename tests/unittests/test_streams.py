@@ -1,13 +1,18 @@
+import copy
 import datetime
+import decimal
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 from singer import utils
 from parameterized import parameterized
 import unittest
 from singer.schema import Schema
 from singer.catalog import Catalog, CatalogEntry
-from tap_linkedin_ads.streams import split_into_chunks, get_next_url, shift_sync_window, merge_responses, sync_analytics_endpoint, STREAMS, LinkedInAds
+from tap_linkedin_ads.streams import split_into_chunks, plan_analytics_chunks, get_next_url, shift_sync_window, merge_responses, sync_analytics_endpoint, get_analytics_start, fetch_analytics_chunk, sum_analytics_records, get_projection, parse_bookmark, can_derive_campaign_analytics, STREAMS, LinkedInAds, AnalyticsMerger, CheckpointThrottle, LinkedInAnalyticsRowLimitError
 import tap_linkedin_ads.client as _client
-from tap_linkedin_ads.client import LinkedinClient
+from tap_linkedin_ads.client import LinkedinClient, ApiRequest
+from tap_linkedin_ads.transform import convert_json
 
 MAX_CHUNK_LENGTH = 17
 ACCOUNT_OBJ = STREAMS['accounts']()
@@ -66,11 +71,100 @@ CATALOG = Catalog(streams=[
             {'metadata': {'inclusion': 'available','selected': True},'breadcrumb': ['properties','name']}
     ])])
 
+def get_analytics_catalog(campaign_fields, creative_fields):
+    """
+    Return a catalog of both analytics streams with the given selected fields.
+    """
+    def analytics_entry(stream_name, fields):
+        return CatalogEntry(
+            stream=stream_name,
+            tap_stream_id=stream_name,
+            schema=Schema(properties={field: Schema(type='string') for field in ['end_at', *fields]}),
+            metadata=[{'metadata': {'inclusion': 'automatic'}, 'breadcrumb': ['properties', 'end_at']}] +
+                     [{'metadata': {'inclusion': 'available', 'selected': True}, 'breadcrumb': ['properties', field]}
+                      for field in fields])
+    return Catalog(streams=[analytics_entry('ad_analytics_by_campaign', campaign_fields),
+                            analytics_entry('ad_analytics_by_creative', creative_fields)])
+
 class TestStreamsUtils(unittest.TestCase):
     """
     Test all utility functions of streams module
     """
 
+    def test_sum_analytics_records(self):
+        """
+        Test that `sum_analytics_records` adds the metrics, summing the string metrics as decimals.
+        """
+        date_range = {'start': {'year': 2022, 'month': 8, 'day': 1}}
+        total = {'date_range': date_range, 'pivot_values': ['urn:li:sponsoredCreative:1'], 'clicks': 1, 'cost_in_usd': '0.1'}
+        record = {'date_range': date_range, 'pivot_values': ['urn:li:sponsoredCreative:2'], 'clicks': 2,
+                  'cost_in_usd': '0.2', 'likes': 3}
+
+        self.assertEqual(sum_analytics_records(total, record),
+                         {'date_range': date_range, 'pivot_values': ['urn:li:sponsoredCreative:1'], 'clicks': 3,
+                          'cost_in_usd': '0.3', 'likes': 3})
+
+    @parameterized.expand([
+        ['test_additive_fields', ['clicks', 'cost_in_usd'], ['ad_analytics_by_campaign', 'ad_analytics_by_creative'], True],
+        ['test_non_additive_field', ['clicks', 'approximate_member_reach'],
+         ['ad_analytics_by_campaign', 'ad_analytics_by_creative'], False],
+        ['test_creative_not_selected', ['clicks'], ['ad_analytics_by_campaign'], False],
+    ])
+    def test_can_derive_campaign_analytics(self, name, campaign_fields, selected_streams, expected_value):
+        """
+        Test that the campaign analytics are derived only if both analytics streams are synced
+        and only additive metrics are selected.
+        """
+        catalog = get_analytics_catalog(campaign_fields, ['clicks'])
+        self.assertEqual(can_derive_campaign_analytics(catalog, selected_streams, STREAMS['campaigns'].children),
+                         expected_value)
+
+    @parameterized.expand([
+        ['test_plain_fields', ['id', 'name', 'status'], 'id,name,status'],
+        ['test_urn_id_fields', ['account_id', 'campaign_group_id', 'associated_entity_organization_id'],
+         'account,campaignGroup,associatedEntity'],
+        ['test_audit_fields', ['created_time', 'last_modified_time', 'change_audit_stamps'], 'changeAuditStamps'],
+        ['test_targeting_fields', ['targeting_criteria'], 'targeting,targetingCriteria'],
+    ])
+    def test_get_projection(self, name, fields, expected_projection):
+        """
+        Test that `get_projection` returns the response fields from which the fields of the records are transformed.
+        """
+        stream_fields = ['id', 'name', 'status', 'account', 'account_id', 'campaign_group', 'campaign_group_id',
+                         'associated_entity', 'associated_entity_organization_id', 'change_audit_stamps',
+                         'created_time', 'last_modified_time', 'targeting', 'targeting_criteria']
+        self.assertEqual(get_projection(stream_fields, fields), expected_projection)
+
+    @parameterized.expand([
+        ['test_selected_stream', ['campaigns'], 'id,changeAuditStamps,name'],
+        ['test_selected_analytics_child', ['ad_analytics_by_campaign'], 'id,changeAuditStamps,status'],
+        ['test_selected_creatives_child', ['campaigns', 'creatives'], 'id,changeAuditStamps,name'],
+    ])
+    def test_get_projection_params(self, name, selected_streams, expected_projection):
+        """
+        Test that the projection of the records includes the key and replication key fields,
+        and the fields of the parent records used by the selected children.
+        """
+        self.assertEqual(CAMPAIGN_OBJ.get_projection_params(CATALOG, selected_streams), {'fields': expected_projection})
+
+    def test_get_projection_params_unprojected_stream(self):
+        """
+        Test that the records of the streams without projection are not projected.
+        """
+        self.assertEqual(VIDEO_ADS_OBJ.get_projection_params(CATALOG, ['video_ads']), {})
+
+    @parameterized.expand([
+        ['test_transformer_format', '2019-07-31T15:07:00.123456Z'],
+        ['test_analytics_format', '2019-07-31T15:07:00Z'],
+        ['test_offset_format', '2019-07-31T15:07:00+00:00'],
+        ['test_date_format', '2019-07-31'],
+    ])
+    def test_parse_bookmark(self, name, value):
+        """
+        Test that `parse_bookmark` parses the bookmarks like `strptime_to_utc`.
+        """
+        self.assertEqual(parse_bookmark(value), utils.strptime_to_utc(value))
+
     def test_split_into_chunks(self):
         """
         Test that `test_split_into_chunks` split 65 fields into 4 chunk of MAX_CHUNK_LENGTH
@@ -113,6 +207,47 @@ class TestStreamsUtils(unittest.TestCase):
 
         # Verify that `test_split_into_chunks` return single list of 15 fields.
         self.assertEqual(expected, list(actual))
+    @parameterized.expand([
+        ['test_no_fields', [], ['clicks'], [['dateRange', 'pivotValues']]],
+        ['test_key_fields_only', ['dateRange', 'pivotValues'], ['clicks', 'dateRange', 'pivotValues'],
+         [['dateRange', 'pivotValues']]],
+        ['test_some_fields_selected', ['clicks', 'dateRange'], ['clicks', 'likes', 'dateRange', 'pivotValues'],
+         [['dateRange', 'pivotValues'], ['clicks', 'dateRange', 'pivotValues']]],
+        ['test_all_fields_selected', ['clicks', 'likes', 'dateRange'], ['clicks', 'likes', 'dateRange', 'pivotValues'],
+         [['clicks', 'likes', 'dateRange', 'pivotValues']]],
+        ['test_unknown_available_fields', ['clicks'], [], [['dateRange', 'pivotValues'], ['clicks', 'dateRange', 'pivotValues']]],
+        ['test_all_fields_selected_full_chunks', list(range(36)), list(range(36)),
+         [list(range(18)) + ['dateRange', 'pivotValues'], list(range(18, 36)) + ['dateRange', 'pivotValues']]],
+    ])
+    def test_plan_analytics_chunks(self, name, fields, available_fields, expected_chunks):
+        """
+        Test that `plan_analytics_chunks` only drops the request of the days with non-null values
+        when every available field is requested.
+        """
+        actual_chunks = plan_analytics_chunks(fields, 18, available_fields)
+
+        # Verify the planned chunks
+        self.assertEqual(expected_chunks, actual_chunks)
+
+    def test_plan_analytics_chunks_request_count(self):
+        """
+        Test that `plan_analytics_chunks` requests every selected field and saves the
+        seed request only when all the available fields are selected.
+        """
+        available_fields = ['field{}'.format(i) for i in range(99)]
+        for field_count in range(1, 100):
+            fields = available_fields[:field_count]
+            chunks = plan_analytics_chunks(fields, 18, available_fields)
+            legacy_request_count = 1 + len(list(split_into_chunks(fields, 18)))
+
+            # Verify that every chunk fits into the 20 fields limit of the API
+            self.assertTrue(all(len(chunk) <= 20 for chunk in chunks))
+            # Verify that all the selected fields are requested
+            self.assertEqual(set(fields), {field for chunk in chunks for field in chunk} - {'dateRange', 'pivotValues'})
+            # Verify that one request is saved only if all the fields are selected
+            expected_saving = 1 if field_count == len(available_fields) else 0
+            self.assertEqual(legacy_request_count - expected_saving, len(chunks))
+
     @parameterized.expand([
         ['test_single_page', [None], 1],
         ['test_multiple_page', ["next_url", None], 2]
@@ -125,7 +260,7 @@ class TestStreamsUtils(unittest.TestCase):
         """
         mock_next_url.side_effect = next_url
         client = _client.LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
-        data = list(sync_analytics_endpoint(client, "stream", "path", "query=query"))
+        data = list(sync_analytics_endpoint(client, "stream", ApiRequest('https://api.linkedin.com/rest/path', {'query': 'query'})))
 
         # Verify that get method of client is called expected times.
         self.assertEqual(expected_call_count, mock_get.call_count)
@@ -133,7 +268,7 @@ class TestStreamsUtils(unittest.TestCase):
 
     @parameterized.expand([
         ["test_single_page", [], None],
-        ["test_multiple_page", [{'rel': 'next', 'href': '/foo'}], 'https://api.linkedin.com/foo']
+        ["test_multiple_page", [{'rel': 'next', 'href': '/foo'}], ApiRequest('https://api.linkedin.com/foo')]
     ])
     def test_get_next_url_index_pagination(self, name, links, expected_url):
         """
@@ -144,13 +279,30 @@ class TestStreamsUtils(unittest.TestCase):
                 'links': links
             }
         }
-        mock_next_url = "initial_url"
+        mock_next_url = ApiRequest.from_url("initial_url")
         mock_stream_name = "account_users"
         actual_url = get_next_url(mock_stream_name, mock_next_url, data)
 
         # Verify the next page url
         self.assertEqual(expected_url, actual_url)
 
+    @parameterized.expand([
+        ["test_last_page", {}, None],
+        ["test_first_page", {'nextPageToken': 'abc'}, 'https://api.linkedin.com/rest/adCampaigns?q=search&pageToken=abc'],
+    ])
+    def test_get_next_url_cursor_pagination(self, name, metadata, expected_url):
+        """
+        Test that get_next_url sets the page token of the request in case of cursor based pagination.
+        """
+        request = ApiRequest('https://api.linkedin.com/rest/adCampaigns', {'q': 'search'})
+
+        next_request = get_next_url('campaigns', request, {'metadata': metadata})
+        if next_request:
+            # The next page after the first one replaces the page token
+            next_request = get_next_url('campaigns', next_request, {'metadata': metadata})
+
+        self.assertEqual(expected_url, next_request and next_request.url)
+
     @parameterized.expand([
         ['test_shift_sync_window_non_boundary', 11, 10],
         ['test_shift_sync_window_boundary', 10, 31]
@@ -246,6 +398,53 @@ class TestStreamsUtils(unittest.TestCase):
         # Verify that merge_responses function merge records by primary with same date range value.
         self.assertEqual(expected_output, actual_output)
 
+    @parameterized.expand([
+        ['test_no_parent_bookmarks', None, {'id': 1}, '2022-08-01T00:00:00Z'],
+        ['test_parent_bookmark', {'1': '2022-09-01'}, {'id': 1}, '2022-09-01'],
+        ['test_new_parent', {'2': '2022-09-01'}, {'id': 1}, '2019-06-01T00:00:00Z'],
+        # 2020-01-01T00:00:00Z
+        ['test_new_parent_created_after_start_date', {'2': '2022-09-01'}, {'id': 1, 'created_time': 1577836800000},
+         '2020-01-01T00:00:00.000000Z'],
+        # 2022-08-01T00:00:00Z
+        ['test_settled_parent', {'2': '2022-09-01'}, {'id': 1, 'status': 'ARCHIVED', 'last_modified_time': 1659312000000}, None],
+        ['test_recently_archived_parent', {'2': '2022-08-05'},
+         {'id': 1, 'status': 'ARCHIVED', 'last_modified_time': 1659312000000}, '2019-06-01T00:00:00Z'],
+    ])
+    def test_get_analytics_start(self, name, parent_bookmarks, parent_record, expected_start):
+        """
+        Test that the analytics of a parent are synced from its own bookmark, new parents are
+        backfilled and settled parents are not synced.
+        """
+        start = get_analytics_start(parent_bookmarks, parent_record, '2022-08-01T00:00:00Z', '2019-06-01T00:00:00Z')
+
+        self.assertEqual(start, expected_start)
+
+    @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint")
+    def test_fetch_analytics_chunk_cached(self, mock_endpoint):
+        """
+        Test that a chunk is fetched once and read from the analytics cache afterwards.
+        """
+        client = mock.Mock(profiler=None)
+        cached = {}
+        client.analytics_cache.get.side_effect = cached.get
+        client.analytics_cache.set.side_effect = cached.__setitem__
+        elements = [{'dateRange': {'start': {'year': 2022, 'month': 1, 'day': 1}},
+                     'pivotValues': ['urn:li:sponsoredCampaign:1'], 'clicks': 1}]
+        mock_endpoint.return_value = [{'elements': elements}]
+        key = ('CAMPAIGN', 'urn:li:sponsoredCampaign:1', '2022-01-01', '2022-01-31', 'clicks,dateRange,pivotValues')
+
+        merged = []
+        for _ in range(2):
+            merger = AnalyticsMerger('CAMPAIGN', 1, ['clicks', 'dateRange', 'pivotValues'])
+            fetch_analytics_chunk(client, 'ad_analytics_by_campaign', ApiRequest('adAnalytics', {'q': 'analytics'}),
+                                  'elements', merger, 0, key)
+            merged.append([merger.materialize(row) for _, row in merger.pop_completed()])
+
+        # Verify that the API is called once and the cached chunk gives the same records
+        self.assertEqual(mock_endpoint.call_count, 1)
+        self.assertEqual(merged[0], merged[1])
+        self.assertEqual(len(merged[0]), 1)
+
 class TestLinkedInAds(unittest.TestCase):
     """
     Test LinkedInAds class's functionality.
@@ -339,16 +538,15 @@ class TestLinkedInAds(unittest.TestCase):
 
 
     @parameterized.expand([
-        ['test_no_record', 0, '2022-08-01T00:00:00Z', {'elements': []}],
-        ['test_multiple_record', 1, '2022-08-01T00:00:00Z', {'elements': [{'id': 1}]}]
+        ['test_no_record', 0, '2022-08-01T00:00:00Z', []],
+        ['test_multiple_record', 1, '2022-08-01T00:00:00Z',
+         [{'elements': [{'dateRange': {'start': {'year': 2022, 'month': 8, 'day': 1}}, 'pivotValues': ['urn:li:sponsoredCampaign:1']}]}]]
     ])
     @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records")
     @mock.patch("tap_linkedin_ads.streams.shift_sync_window", return_value=('', '', ''))
-    @mock.patch("tap_linkedin_ads.streams.transform_json")
     @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint")
-    @mock.patch("tap_linkedin_ads.streams.merge_responses")
-    def test_sync_ad_analytics(self, name, expected_record_count, expected_max_bookmark, mock_tranform_data,
-                               mock_merge_response, mock_endpoint, mock_transform, mock_shift_windows, mock_process_record):
+    def test_sync_ad_analytics(self, name, expected_record_count, expected_max_bookmark, mock_pages,
+                               mock_endpoint, mock_shift_windows, mock_process_record):
         """
         Test that `sync_ad_analytics` function work properly for zero records as well as multiple records.
         """
@@ -357,7 +555,7 @@ class TestLinkedInAds(unittest.TestCase):
         bookmark='2022-08-01T00:00:00Z'
         date_window_size = 7
 
-        mock_transform.return_value = mock_tranform_data
+        mock_endpoint.return_value = mock_pages
         mock_process_record.return_value = (expected_max_bookmark, expected_record_count)
         actual_record_count, actual_max_bookmark =  AD_ANALYTICS_BY_CAMPAIGN.sync_ad_analytics(client, CATALOG, bookmark, date_window_size)
 
@@ -366,6 +564,622 @@ class TestLinkedInAds(unittest.TestCase):
         # Verify total no of records
         self.assertEqual(actual_record_count, expected_record_count)
 
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=('2022-08-01T00:00:00Z', 1))
+    @mock.patch("tap_linkedin_ads.streams.shift_sync_window", return_value=('', '', ''))
+    @mock.patch("tap_linkedin_ads.streams.plan_analytics_chunks",
+                return_value=[['dateRange', 'pivotValues'], ['clicks', 'dateRange', 'pivotValues']])
+    @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint")
+    def test_sync_ad_analytics_concurrent_chunks(self, mock_endpoint, mock_plan_chunks,
+                                                 mock_shift_windows, mock_process_record):
+        """
+        Test that `sync_ad_analytics` requests all the chunks of a window and merges
+        their responses in chunk order even if the requests complete out of order.
+        """
+        date_range = {'start': {'year': 2022, 'month': 8, 'day': 1}}
+        pivot_values = ['urn:li:sponsoredCampaign:1']
+
+        def get_pages(client, stream_name, request):
+            # The first chunk completes last
+            if request.params['fields'] == 'dateRange,pivotValues':
+                time.sleep(0.2)
+                return [{'elements': [{'pivotValues': pivot_values, 'dateRange': date_range}]}]
+            return [{'elements': [{'clicks': 1, 'dateRange': date_range, 'pivotValues': pivot_values}]}]
+
+        mock_endpoint.side_effect = get_pages
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+
+        AD_ANALYTICS_BY_CAMPAIGN.sync_ad_analytics(client, CATALOG, '2022-08-01T00:00:00Z', 7)
+
+        # Verify that one request is issued per chunk
+        self.assertEqual(mock_endpoint.call_count, 2)
+        # Verify that the responses are merged into a single record in the field order of the chunks
+        self.assertEqual(mock_process_record.call_count, 1)
+        records = list(mock_process_record.call_args[1]['records'])
+        self.assertEqual(len(records), 1)
+        self.assertEqual(list(records[0]), ['date_range', 'pivot_values', 'clicks', 'pivot', 'pivot_value',
+                                            'campaign', 'start_at', 'campaign_id'])
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=('2022-08-01T00:00:00Z', 1))
+    @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint",
+                return_value=[{'elements': [{'clicks': 1, 'dateRange': {'start': {'year': 2022, 'month': 8, 'day': 1}},
+                                             'pivotValues': ['urn:li:sponsoredCampaign:1']}]}])
+    def test_sync_ad_analytics_shared_executor(self, mock_endpoint, mock_process_record):
+        """
+        Test that the chunks of every date window are fetched by the given analytics executor.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        bookmark = utils.strftime(utils.now() - datetime.timedelta(days=20))
+
+        with ThreadPoolExecutor(max_workers=2) as analytics_executor, \
+            mock.patch.object(analytics_executor, 'submit', wraps=analytics_executor.submit) as mock_submit, \
+            mock.patch("tap_linkedin_ads.streams.ThreadPoolExecutor") as mock_executor:
+            AD_ANALYTICS_BY_CAMPAIGN.sync_ad_analytics(client, CATALOG, bookmark, 10,
+                                                       analytics_executor=analytics_executor)
+
+        # Verify that no executor is created for the windows
+        self.assertEqual(mock_executor.call_count, 0)
+        # Verify that each request of the windows is submitted to the shared executor
+        self.assertGreater(mock_endpoint.call_count, 1)
+        self.assertEqual(mock_submit.call_count, mock_endpoint.call_count)
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=('2022-08-01T00:00:00Z', 1))
+    @mock.patch("tap_linkedin_ads.streams.shift_sync_window", return_value=('', '', ''))
+    @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint")
+    def test_sync_ad_analytics_seed_request(self, mock_endpoint, mock_shift_windows, mock_process_record):
+        """
+        Test that the days with non-null values are requested apart when a field is not selected,
+        so that a day whose selected fields are all `0` is still written.
+        """
+        pivot_values = ['urn:li:sponsoredCampaign:1']
+
+        def get_pages(client, stream_name, request):
+            seed_elements = [{'dateRange': {'start': {'year': 2022, 'month': 8, 'day': day}}, 'pivotValues': pivot_values}
+                             for day in (1, 2)]
+            if request.params['fields'] == 'dateRange,pivotValues':
+                return [{'elements': seed_elements}]
+            # The chunk of the selected fields only returns the day with a non-zero value
+            return [{'elements': [{**seed_elements[0], 'clicks': 1}]}]
+
+        mock_endpoint.side_effect = get_pages
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        catalog = get_analytics_catalog(['clicks'], [])
+        # `likes` is an available field which is not selected
+        catalog_entry = catalog.get_stream('ad_analytics_by_campaign')
+        catalog_entry.schema.properties['likes'] = Schema(type='integer')
+        catalog_entry.metadata.append({'metadata': {'inclusion': 'available', 'selected': False},
+                                       'breadcrumb': ['properties', 'likes']})
+
+        AD_ANALYTICS_BY_CAMPAIGN.sync_ad_analytics(client, catalog, '2022-08-01T00:00:00Z', 7)
+
+        # Verify that the seed request is issued along with the chunk of the selected fields
+        self.assertEqual(sorted(call[0][2].params['fields'] for call in mock_endpoint.call_args_list),
+                         ['clicks,dateRange,pivotValues', 'dateRange,pivotValues'])
+        # Verify that the day returned by the seed request only is written
+        records = list(mock_process_record.call_args[1]['records'])
+        self.assertEqual([(record['start_at'], record.get('clicks')) for record in records],
+                         [('2022-08-01T00:00:00.000000Z', 1), ('2022-08-02T00:00:00.000000Z', None)])
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=('2022-08-01T00:00:00Z', 1))
+    @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint")
+    def test_account_scoped_analytics(self, mock_endpoint, mock_process_records):
+        """
+        Test that the account scoped analytics are requested with the accounts facet, without
+        campaign, and that the synced date windows are checkpointed.
+        """
+        requests = []
+        mock_endpoint.side_effect = lambda client, stream_name, request: \
+            (requests.append(request), [{'elements': [{'pivotValues': ['urn:li:sponsoredCampaign:1'],
+                                                       'dateRange': {'start': {'year': 2022, 'month': 8, 'day': 1}}}]}])[1]
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        stream_obj = STREAMS['ad_analytics_by_campaign']().with_params({'accounts[0]': 'urn:li:sponsoredAccount:1'})
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+        state = {'bookmarks': {'ad_analytics_by_campaign': '{}T00:00:00Z'.format(yesterday.isoformat())}}
+        checkpoints = []
+
+        with mock.patch("tap_linkedin_ads.streams.singer.write_state",
+                        side_effect=lambda state: checkpoints.append(dict(state['checkpoints']['ad_analytics_by_campaign']))):
+            stream_obj.sync_endpoint(client, CATALOG, state, 100, '2019-06-01T00:00:00Z',
+                                     ['ad_analytics_by_campaign'], 30, account_list=['1'])
+
+        # Verify that a single window covers the account
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0].params['accounts[0]'], 'urn:li:sponsoredAccount:1')
+        self.assertNotIn('campaigns[0]', requests[0].params)
+        # Verify that the records are not attributed to a parent campaign
+        self.assertIsNone(mock_process_records.call_args[1]['parent_id'])
+        self.assertEqual(checkpoints, [{'window': {'stream': 'ad_analytics_by_campaign',
+                                                   'end': datetime.date.today().isoformat()}}])
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", autospec=True)
+    @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint")
+    def test_account_scoped_analytics_row_limit(self, mock_endpoint, mock_process_records):
+        """
+        Test that a date window whose response reaches the count of the request is halved until
+        its records fit in a response, and that the records of a capped window are not written.
+        """
+        windows = []
+
+        def get_pages(client, stream_name, request):
+            start = datetime.date(request.params['dateRange.start.year'], request.params['dateRange.start.month'],
+                                  request.params['dateRange.start.day'])
+            end = datetime.date(request.params['dateRange.end.year'], request.params['dateRange.end.month'],
+                                request.params['dateRange.end.day'])
+            windows.append((end - start).days)
+            # A record per day of the window
+            return [{'elements': [{'pivotValues': ['urn:li:sponsoredCampaign:1'],
+                                   'dateRange': {'start': {'year': day.year, 'month': day.month, 'day': day.day}}}
+                                  for day in (start + datetime.timedelta(days=offset)
+                                              for offset in range((end - start).days + 1))]}]
+        mock_endpoint.side_effect = get_pages
+
+        written_days = []
+        def process_records(stream_obj, records, **kwargs):
+            records = list(records)
+            written_days.extend(record['start_at'] for record in records)
+            return kwargs['max_bookmark_value'], len(records)
+        mock_process_records.side_effect = process_records
+
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        stream_obj = STREAMS['ad_analytics_by_campaign']().with_params({'accounts[0]': 'urn:li:sponsoredAccount:1',
+                                                                        'count': 3})
+        bookmark = utils.strftime(utils.now() - datetime.timedelta(days=3))
+
+        stream_obj.sync_ad_analytics(client, CATALOG, bookmark, 30)
+
+        # Verify that the 10 days window is halved until it spans 2 days, which are kept for the next windows
+        self.assertEqual(windows, [10, 5, 2, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1])
+        # Verify that every day is written and only by the windows which fit in a response
+        self.assertEqual(len(written_days), 20)
+        self.assertEqual(len(set(written_days)), 11)
+
+    @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint")
+    def test_analytics_row_limit_single_day(self, mock_endpoint):
+        """
+        Test that a window which can not be shrunk further raises an error instead of losing records.
+        """
+        mock_endpoint.return_value = [{'elements': [{'pivotValues': ['urn:li:sponsoredCampaign:{}'.format(index)],
+                                                     'dateRange': {'start': {'year': 2022, 'month': 8, 'day': 1}}}
+                                                    for index in range(3)]}]
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        stream_obj = STREAMS['ad_analytics_by_campaign']().with_params({'accounts[0]': 'urn:li:sponsoredAccount:1',
+                                                                        'count': 3})
+
+        with self.assertRaises(LinkedInAnalyticsRowLimitError):
+            stream_obj.sync_ad_analytics(client, CATALOG, utils.strftime(utils.now()), 30)
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", autospec=True)
+    @mock.patch("tap_linkedin_ads.streams.shift_sync_window", return_value=('', '', ''))
+    @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint")
+    def test_sync_derived_campaign_analytics(self, mock_endpoint, mock_shift_windows, mock_process_records):
+        """
+        Test that the campaign analytics are summed from the creative analytics of a single request,
+        and that each stream only gets its selected fields.
+        """
+        requests = []
+        date_range = {'start': {'year': 2022, 'month': 8, 'day': 1}}
+
+        def get_pages(client, stream_name, request):
+            requests.append(request)
+            return [{'elements': [{'pivotValues': ['urn:li:sponsoredCreative:1'], 'dateRange': date_range,
+                                   'clicks': 1, 'costInUsd': '0.1', 'likes': 1},
+                                  {'pivotValues': ['urn:li:sponsoredCreative:2'], 'dateRange': date_range,
+                                   'clicks': 2, 'costInUsd': '0.2', 'likes': 1}]}]
+        mock_endpoint.side_effect = get_pages
+
+        written_records = {}
+        def process_records(stream_obj, records, **kwargs):
+            records = list(records)
+            written_records.setdefault(stream_obj.tap_stream_id, []).extend(records)
+            return '2022-08-01T00:00:00Z', len(records)
+        mock_process_records.side_effect = process_records
+
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        catalog = get_analytics_catalog(['clicks', 'cost_in_usd'], ['clicks', 'likes'])
+        stream_obj = STREAMS['ad_analytics_by_creative']().with_params({'campaigns[0]': 'urn:li:sponsoredCampaign:7'})
+
+        results = stream_obj.sync_analytics_streams(client, catalog, '2022-08-01T00:00:00Z', 30, parent_id=7,
+                                                    derived_stream=STREAMS['ad_analytics_by_campaign']())
+
+        # Verify that a single request returns the fields of both streams
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0].params['pivot'], 'CREATIVE')
+        self.assertEqual(requests[0].params['fields'], 'clicks,likes,costInUsd,dateRange,pivotValues')
+        self.assertEqual(results, {'ad_analytics_by_creative': (2, '2022-08-01T00:00:00Z'),
+                                   'ad_analytics_by_campaign': (1, '2022-08-01T00:00:00Z')})
+        # Verify that the creative records do not get the fields selected only for the campaigns
+        self.assertEqual([(record['creative_id'], record['clicks'], record['likes'], 'cost_in_usd' in record)
+                          for record in written_records['ad_analytics_by_creative']],
+                         [(1, 1, 1, False), (2, 2, 1, False)])
+        # Verify that the campaign record of the day is the sum of its creative records
+        [campaign_record] = written_records['ad_analytics_by_campaign']
+        self.assertEqual((campaign_record['campaign_id'], campaign_record['pivot'], campaign_record['clicks'],
+                          campaign_record['cost_in_usd'], 'likes' in campaign_record, 'creative_id' in campaign_record),
+                         (7, 'CAMPAIGN', 3, decimal.Decimal('0.3'), False, False))
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.sync_analytics_streams",
+                return_value={'ad_analytics_by_creative': (2, '2019-07-31T15:07:00.000000Z'),
+                              'ad_analytics_by_campaign': (1, '2019-07-31T15:07:00.000000Z')})
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.sync_ad_analytics")
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.request")
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=("2019-07-31T15:07:00.000000Z", 2))
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.write_schema")
+    def test_sync_endpoint_derived_campaign_analytics(self, mock_write_schema, mock_process_records, mock_request,
+                                                      mock_sync_ad_analytics, mock_sync_analytics_streams):
+        """
+        Test that the campaign analytics of the campaigns are deferred and synced with their creative analytics.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        catalog = get_analytics_catalog(['clicks'], ['clicks'])
+        state = {}
+        mock_request.return_value = {'metadata': {}, 'elements': [{'id': 1}, {'id': 2}]}
+
+        CAMPAIGN_OBJ.sync_endpoint(client, catalog, state, 100, '2019-06-01T00:00:00Z',
+                                   ['ad_analytics_by_campaign', 'ad_analytics_by_creative'], 7, account_list=['12345'])
+
+        # Verify that the campaign analytics are not requested
+        self.assertEqual(mock_sync_ad_analytics.call_count, 0)
+        self.assertEqual([(call[1]['parent_id'], call[1]['derived_stream'].tap_stream_id)
+                          for call in mock_sync_analytics_streams.call_args_list],
+                         [(1, 'ad_analytics_by_campaign'), (2, 'ad_analytics_by_campaign')])
+        # Verify that the bookmarks of both streams are written
+        self.assertEqual(state['bookmarks'], {'ad_analytics_by_campaign': '2019-07-31T15:07:00.000000Z',
+                                              'ad_analytics_by_creative': '2019-07-31T15:07:00.000000Z'})
+        self.assertEqual(set(state['parent_bookmarks']), {'ad_analytics_by_campaign', 'ad_analytics_by_creative'})
+
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.request", return_value={'metadata': {}, 'elements': []})
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.write_schema")
+    def test_sync_endpoint_projection(self, mock_write_schema, mock_request):
+        """
+        Test that the requests of the records are projected on the synced fields.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+
+        CAMPAIGN_OBJ.sync_endpoint(client, CATALOG, {}, 100, '2019-06-01T00:00:00Z', ['campaigns'], 7,
+                                   account_list=['12345'])
+
+        self.assertEqual(mock_request.call_args[1]['url'].params['fields'], 'id,changeAuditStamps,name')
+        # Verify that the params of the stream are not updated
+        self.assertNotIn('fields', CAMPAIGN_OBJ.params)
+
+    def test_analytics_merger_completed_keys(self):
+        """
+        Test that `AnalyticsMerger` only completes a primary key once every chunk has
+        contributed to it or returned all its pages.
+        """
+        def element(day, **fields):
+            return {'dateRange': {'start': {'year': 2022, 'month': 8, 'day': day}},
+                    'pivotValues': ['urn:li:sponsoredCampaign:1'], **fields}
+
+        merger = AnalyticsMerger('CAMPAIGN', 2)
+        merger.add_page(0, [element(1, a=1), element(2, a=2)])
+        merger.add_page(1, [element(1, b=1)])
+
+        # Verify that the key contributed by both chunks is completed
+        completed = merger.pop_completed()
+        self.assertEqual([('urn:li:sponsoredCampaign:1', '2022-8-1')], [key for key, _ in completed])
+        self.assertEqual({**element(1, a=1, b=1), 'pivot': 'CAMPAIGN', 'pivot_value': 'urn:li:sponsoredCampaign:1'},
+                         merger.materialize(completed[0][1]))
+        # Verify that the key not contributed by the second chunk is pending until the chunk is finished
+        self.assertEqual([], merger.pop_completed())
+        merger.finish_chunk(1)
+        self.assertEqual([('urn:li:sponsoredCampaign:1', '2022-8-2')], [key for key, _ in merger.pop_completed()])
+        self.assertEqual({}, merger.pending)
+
+    def test_analytics_merger_completed_order(self):
+        """
+        Test that `AnalyticsMerger` returns the completed keys in the order of the API responses.
+        """
+        def element(pivot_value, day):
+            return {'dateRange': {'start': {'year': 2022, 'month': 8, 'day': day}},
+                    'pivotValues': ['urn:li:sponsoredCreative:{}'.format(pivot_value)], 'clicks': 1}
+
+        merger = AnalyticsMerger('CREATIVE', 1)
+        merger.add_page(0, [element(2, 2), element(1, 2), element(2, 10), element(1, 10)])
+        merger.finish_chunk(0)
+
+        # Verify that the keys are neither grouped by pivot value nor sorted as strings
+        self.assertEqual([('urn:li:sponsoredCreative:2', '2022-8-2'), ('urn:li:sponsoredCreative:1', '2022-8-2'),
+                          ('urn:li:sponsoredCreative:2', '2022-8-10'), ('urn:li:sponsoredCreative:1', '2022-8-10')],
+                         [key for key, _ in merger.pop_completed()])
+
+    def test_analytics_merger_materialize_snake_case(self):
+        """
+        Test that `AnalyticsMerger.materialize` returns the same record as `convert_json` for snake_case field names.
+        """
+        element = {'dateRange': {'start': {'year': 2022, 'month': 8, 'day': 1}},
+                   'pivotValues': ['urn:li:sponsoredCampaign:1'], 'costInUsd': '1.5', 'videoViews': 0}
+        merger = AnalyticsMerger('CAMPAIGN', 1, ['videoViews', 'dateRange', 'pivotValues'])
+        merger.add_page(0, [dict(element)])
+        merger.finish_chunk(0)
+        [(_, row)] = merger.pop_completed()
+
+        expected_record = convert_json({**element, 'pivot': 'CAMPAIGN', 'pivot_value': 'urn:li:sponsoredCampaign:1'})
+        # Verify the record and that the fields follow the layout order
+        self.assertEqual(expected_record, merger.materialize(row, snake_case=True))
+        self.assertEqual(['video_views', 'date_range', 'pivot_values', 'cost_in_usd', 'pivot', 'pivot_value'],
+                         list(merger.materialize(row, snake_case=True)))
+
+    @mock.patch("tap_linkedin_ads.streams.telemetry.increment_counter")
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.sync_ad_analytics", return_value=(1, "2019-07-31T15:07:00.000000Z"))
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.request")
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=("2019-07-31T15:07:00.000000Z", 2))
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.write_schema")
+    def test_sync_endpoint_page_tags_after_children(self, mock_write_schema, mock_process_records, mock_request,
+                                                    mock_sync_ad_analytics, mock_increment_counter):
+        """
+        Test that the pages of a parent stream following a page with children are not tagged
+        with the ID of the last parent record.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        mock_request.side_effect = [{'metadata': {'nextPageToken': 'abc'}, 'elements': [{'id': 1}, {'id': 2}]},
+                                    {'metadata': {}, 'elements': [{'id': 3}, {'id': 4}]}]
+
+        CAMPAIGN_OBJ.sync_endpoint(client, CATALOG, {}, 100, '2019-06-01T00:00:00Z',
+                                   ['campaigns', 'ad_analytics_by_campaign'], 7, account_list=['12345'])
+
+        # Verify that the children of both pages are synced
+        self.assertEqual([call[1]['parent_id'] for call in mock_sync_ad_analytics.call_args_list], [1, 2, 3, 4])
+        # Verify that both pages of the parent stream are tagged without a parent ID
+        page_counts = [call for call in mock_increment_counter.call_args_list if call[0][0] == 'page_count']
+        self.assertEqual([call[1]['parent_id'] for call in page_counts], [None, None])
+        # Verify that the records of the second page are not given a parent ID
+        self.assertEqual([call[1]['parent_id'] for call in mock_process_records.call_args_list], [None, None])
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.sync_ad_analytics", return_value=(1, "2019-07-31T15:07:00.000000Z"))
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.request")
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=("2019-07-31T15:07:00.000000Z", 3))
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.write_schema")
+    def test_sync_endpoint_resume_from_checkpoint(self, mock_write_schema, mock_process_records, mock_request, mock_sync_ad_analytics):
+        """
+        Test that sync_endpoint resumes from the checkpointed page and skips the parent records whose
+        children were completed before the interruption, and checkpoints the progress.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        page_url = 'https://api.linkedin.com/rest/adAccounts/12345/adCampaigns?pageSize=100&q=search&pageToken=abc'
+        state = {'checkpoints': {'campaigns': {'account': '12345',
+                                               'page_url': page_url,
+                                               'completed_parents': {'ad_analytics_by_campaign': 1},
+                                               'max_bookmark': '2019-07-01T00:00:00.000000Z',
+                                               'child_bookmarks': {'ad_analytics_by_campaign': '2019-07-30T00:00:00.000000Z'}}}}
+        mock_request.return_value = {'metadata': {}, 'elements': [{'id': 1}, {'id': 2}, {'id': 3}]}
+
+        CAMPAIGN_OBJ.sync_endpoint(client, CATALOG, state, 100, '2019-06-01T00:00:00Z',
+                                   ['campaigns', 'ad_analytics_by_campaign'], 7, account_list=['67890', '12345'])
+
+        # Verify that only the checkpointed page is requested, the previous accounts are completed
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(mock_request.call_args[1]['url'].url, page_url)
+        # Verify that the children of the completed parent record are not synced again
+        self.assertEqual([call[1]['parent_id'] for call in mock_sync_ad_analytics.call_args_list], [2, 3])
+        # Verify that the completed page is checkpointed with the child bookmarks
+        self.assertEqual(state['checkpoints']['campaigns'],
+                         {'account': '12345', 'page_url': None, 'completed_parents': {},
+                          'max_bookmark': '2019-07-31T15:07:00.000000Z',
+                          'child_bookmarks': {'ad_analytics_by_campaign': '2019-07-31T15:07:00.000000Z'}})
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.sync_ad_analytics", return_value=(1, "2019-07-31T15:07:00.000000Z"))
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.request")
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=("2019-07-31T15:07:00.000000Z", 3))
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.write_schema")
+    def test_sync_endpoint_parent_bookmarks(self, mock_write_schema, mock_process_records, mock_request, mock_sync_ad_analytics):
+        """
+        Test that the analytics of each campaign are synced from its own bookmark and that the
+        per-campaign bookmarks are updated and pruned for settled and removed campaigns.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        state = {'bookmarks': {'ad_analytics_by_campaign': '2019-07-01T00:00:00.000000Z'},
+                 'parent_bookmarks': {'ad_analytics_by_campaign': {'1': '2019-07-20', '2': '2019-07-25', '4': '2019-07-25'}}}
+        mock_request.return_value = {'metadata': {}, 'elements': [
+            {'id': 1},
+            # Archived on 2019-06-01
+            {'id': 2, 'status': 'ARCHIVED', 'changeAuditStamps': {'lastModified': {'time': 1559347200000}}},
+            {'id': 3},
+            # Archived on 2019-06-01 and pruned by a previous sync
+            {'id': 5, 'status': 'ARCHIVED', 'changeAuditStamps': {'lastModified': {'time': 1559347200000}}}]}
+
+        CAMPAIGN_OBJ.sync_endpoint(client, CATALOG, state, 100, '2019-06-01T00:00:00Z',
+                                   ['campaigns', 'ad_analytics_by_campaign'], 7, account_list=['12345'])
+
+        # Verify that each campaign is synced from its own bookmark and the new campaign is backfilled
+        self.assertEqual([(call[1]['parent_id'], call[1]['last_datetime']) for call in mock_sync_ad_analytics.call_args_list],
+                         [(1, '2019-07-20'), (2, '2019-07-25'), (3, '2019-06-01T00:00:00Z')])
+        # Verify that the settled and removed campaigns are pruned from the bookmarks
+        today = datetime.date.today().isoformat()
+        self.assertEqual(state['parent_bookmarks']['ad_analytics_by_campaign'], {'1': today, '3': today})
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.sync_ad_analytics", return_value=(1, "2019-07-31T15:07:00.000000Z"))
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.request")
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=("2019-07-31T15:07:00.000000Z", 3))
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.write_schema")
+    def test_sync_endpoint_checkpoint_state_messages(self, mock_write_schema, mock_process_records, mock_request,
+                                                     mock_sync_ad_analytics):
+        """
+        Test that the checkpoints of the parents are throttled and that the per-campaign bookmarks
+        are only emitted once the campaigns are synced.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        state = {}
+        mock_request.return_value = {'metadata': {}, 'elements': [{'id': 1}, {'id': 2}, {'id': 3}]}
+        state_messages = []
+
+        with mock.patch("tap_linkedin_ads.streams.singer.write_state",
+                        side_effect=lambda state: state_messages.append(copy.deepcopy(state))):
+            CAMPAIGN_OBJ.sync_endpoint(client, CATALOG, state, 100, '2019-06-01T00:00:00Z',
+                                       ['campaigns', 'ad_analytics_by_campaign'], 7, account_list=['12345'])
+
+        # Verify that a single checkpoint is emitted for the 3 campaigns and the page, then the bookmark
+        self.assertEqual(len(state_messages), 2)
+        self.assertEqual(state_messages[0]['checkpoints']['campaigns']['completed_parents'],
+                         {'ad_analytics_by_campaign': 1})
+        self.assertNotIn('parent_bookmarks', state_messages[0])
+        today = datetime.date.today().isoformat()
+        self.assertEqual(state_messages[1]['parent_bookmarks'],
+                         {'ad_analytics_by_campaign': {'1': today, '2': today, '3': today}})
+
+    @mock.patch("tap_linkedin_ads.streams.time.monotonic", side_effect=[0, 30, 60, 61, 130])
+    def test_checkpoint_throttle(self, mock_monotonic):
+        """
+        Test that the checkpoints are emitted at most once every interval.
+        """
+        checkpoint_throttle = CheckpointThrottle(60)
+        self.assertEqual([checkpoint_throttle.ready() for _ in range(5)], [True, False, True, False, True])
+
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.sync_ad_analytics", return_value=(1, "2019-07-31T15:07:00.000000Z"))
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.request")
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=("2019-07-31T15:07:00.000000Z", 1))
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.write_schema")
+    def test_sync_endpoint_status_filtered_parent_bookmarks(self, mock_write_schema, mock_process_records, mock_request,
+                                                            mock_sync_ad_analytics):
+        """
+        Test that the bookmarks of the campaigns filtered out by a status search are not pruned.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        state = {'parent_bookmarks': {'ad_analytics_by_campaign': {'1': '2019-07-20', '2': '2019-07-25'}}}
+        mock_request.return_value = {'metadata': {}, 'elements': [{'id': 1}]}
+
+        CAMPAIGN_OBJ.with_params({'search': '(status:(values:List(ACTIVE)))'}).sync_endpoint(
+            client, CATALOG, state, 100, '2019-06-01T00:00:00Z', ['campaigns', 'ad_analytics_by_campaign'], 7,
+            account_list=['12345'])
+
+        self.assertEqual(state['parent_bookmarks']['ad_analytics_by_campaign'],
+                         {'1': datetime.date.today().isoformat(), '2': '2019-07-25'})
+
+    @mock.patch("tap_linkedin_ads.streams.Creatives.parent_batch_size", 2)
+    @mock.patch("tap_linkedin_ads.streams.Creatives.sync_endpoint", autospec=True)
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.request")
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=("2019-07-31T15:07:00.000000Z", 3))
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.write_schema")
+    def test_sync_endpoint_batched_creatives(self, mock_write_schema, mock_process_records, mock_request, mock_sync_creatives):
+        """
+        Test that the creatives of the campaigns are fetched for batches of campaigns.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        mock_request.return_value = {'metadata': {}, 'elements': [{'id': 1}, {'id': 2}, {'id': 3}]}
+        synced_batches = []
+        mock_sync_creatives.side_effect = lambda stream_obj, **kwargs: \
+            (synced_batches.append((kwargs['parent_id'], stream_obj.params['campaigns'])), (1, "2019-07-31T15:07:00.000000Z"))[1]
+
+        CAMPAIGN_OBJ.sync_endpoint(client, CATALOG, {}, 100, '2019-06-01T00:00:00Z',
+                                   ['campaigns', 'creatives'], 7, account_list=['12345'])
+
+        # Verify that one request is made for each batch of campaigns
+        self.assertEqual(synced_batches,
+                         [([1, 2], 'List(urn%3Ali%3AsponsoredCampaign%3A1,urn%3Ali%3AsponsoredCampaign%3A2)'),
+                          ([3], 'List(urn%3Ali%3AsponsoredCampaign%3A3)')])
+        # Verify that the params of the stream class are left unchanged
+        self.assertNotIn('campaigns', STREAMS['creatives'].params)
+
+    def test_account_scoped_creatives_requests(self):
+        """
+        Test that the account scoped creatives are requested once per account, without campaigns criteria.
+        """
+        creatives = STREAMS['creatives']()
+        requests = creatives.get_requests(100, account_list=['1', '2'])
+
+        self.assertEqual([(account, request.url) for account, request in requests],
+                         [('1', 'https://api.linkedin.com/rest/adAccounts/1/creatives?pageSize=100&q=criteria&sortOrder=ASCENDING'),
+                          ('2', 'https://api.linkedin.com/rest/adAccounts/2/creatives?pageSize=100&q=criteria&sortOrder=ASCENDING')])
+        # Verify that the campaigns stream does not sync its account scoped child
+        self.assertEqual(CAMPAIGN_OBJ.without_children(['creatives']).children,
+                         ['ad_analytics_by_campaign', 'ad_analytics_by_creative'])
+        self.assertIn('creatives', CAMPAIGN_OBJ.children)
+
+    def test_with_params(self):
+        """
+        Test that with_params returns a copy of the stream and leaves the stream and its class unchanged.
+        """
+        stream_obj = STREAMS['ad_analytics_by_campaign']()
+        parent_obj = stream_obj.with_params(stream_obj.get_parent_params([1]))
+
+        self.assertEqual(parent_obj.params['campaigns[0]'], 'urn:li:sponsoredCampaign:1')
+        self.assertNotIn('campaigns[0]', stream_obj.params)
+        self.assertNotIn('campaigns[0]', STREAMS['ad_analytics_by_campaign'].params)
+        # Verify that the params of a stream can not be updated in place
+        with self.assertRaises(TypeError):
+            parent_obj.params['campaigns[0]'] = 'urn:li:sponsoredCampaign:2'
+
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.get")
+    def test_video_ads_prefetch_pages(self, mock_get):
+        """
+        Test that the posts of the accounts are fetched ahead of their sync and served in the order of the pages.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        video_ads = STREAMS['video_ads']()
+        first_urls = [video_ads.get_requests(100, account)[0][1] for account in (1, 2)]
+        next_url = ApiRequest.from_url('https://api.linkedin.com/rest/posts?q=dscAdAccount&start=100')
+        pages = {first_urls[0]: {'elements': [{'id': 1}], 'paging': {'links': [{'rel': 'next', 'href': '/rest/posts?q=dscAdAccount&start=100'}]}},
+                 next_url: {'elements': [{'id': 2}]},
+                 first_urls[1]: {'elements': [{'id': 3}]}}
+        mock_get.side_effect = lambda url, **kwargs: pages[url]
+
+        video_ads.prefetch_pages(client, 100, [1, 2])
+        synced_pages = [video_ads.get_page(client, url) for url in (first_urls[0], next_url, first_urls[1])]
+        video_ads.stop_prefetch()
+
+        # Verify that the pages are served in the order of the sync and fetched once
+        self.assertEqual(synced_pages, [pages[first_urls[0]], pages[next_url], pages[first_urls[1]]])
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.get", return_value={'elements': [{'id': 1}]})
+    def test_video_ads_check_access(self, mock_get):
+        """
+        Test that the access probe of video_ads requests a single post.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        client.config = {'accounts': '12345'}
+
+        self.assertTrue(STREAMS['video_ads']().check_access(client))
+        self.assertIn('count=1&dscAdAccount=urn%3Ali%3AsponsoredAccount%3A12345', mock_get.call_args[1]['url'])
+
+    @mock.patch("tap_linkedin_ads.streams.VideoAds.prefetch_workers", 1)
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.process_records", return_value=("2019-07-31T15:07:00.000000Z", 1))
+    @mock.patch("tap_linkedin_ads.streams.LinkedInAds.write_schema")
+    @mock.patch("tap_linkedin_ads.client.LinkedinClient.get")
+    def test_video_ads_prefetch_stopped_account(self, mock_get, mock_write_schema, mock_process_records):
+        """
+        Test that the chain of an account whose sync stops before its last page frees its worker
+        for the chains of the next accounts.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        video_ads = STREAMS['video_ads']()
+        # The empty first page of the account 1 stops its sync, its chain keeps fetching the next pages
+        next_page = {'elements': [], 'paging': {'links': [{'rel': 'next', 'href': '/rest/posts?q=dscAdAccount&start=100'}]}}
+        mock_get.side_effect = lambda url, **kwargs: \
+            {'elements': [{'content_reference': 'urn:li:ugcPost:2'}]} if '3A2' in url.url else next_page
+
+        video_ads.prefetch_pages(client, 100, [1, 2])
+        try:
+            for account in (1, 2):
+                video_ads.sync_endpoint(client=client, catalog=CATALOG, state={}, page_size=100,
+                                        start_date='2019-06-01T00:00:00Z', selected_streams=['video_ads'],
+                                        date_window_size=7, parent_id=account)
+        finally:
+            video_ads.stop_prefetch()
+
+        # Verify that the account 2 is synced by the single worker once the chain of the account 1 is stopped
+        self.assertEqual(mock_process_records.call_count, 1)
+
+    @mock.patch("tap_linkedin_ads.streams.sync_analytics_endpoint", return_value=[])
+    def test_sync_ad_analytics_resume_date(self, mock_endpoint):
+        """
+        Test that sync_ad_analytics starts from the resume date and reports each synced date window.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        today = datetime.date.today()
+        resume_date = today - datetime.timedelta(days=5)
+        bookmark = utils.strftime(utils.now() - datetime.timedelta(days=20))
+        on_window_synced = mock.Mock()
+
+        AD_ANALYTICS_BY_CAMPAIGN.sync_ad_analytics(client, CATALOG, bookmark, 30, parent_id=1,
+                                                   resume_date=resume_date, on_window_synced=on_window_synced)
+
+        # Verify that the window starts from the resume date
+        query_string = mock_endpoint.call_args[0][2].query
+        self.assertIn('dateRange.start.day={}&dateRange.start.month={}&dateRange.start.year={}'.format(
+            resume_date.day, resume_date.month, resume_date.year), query_string)
+        # Verify that the synced window is reported
+        on_window_synced.assert_called_once_with(today)
+
     @mock.patch('singer.write_schema', side_effect=OSError('error'))
     @mock.patch('tap_linkedin_ads.streams.LOGGER.info')
     def test_write_schema(self, mock_logger, mock_write_schema):
@@ -1,9 +1,10 @@
+import datetime
 import unittest
 from unittest import mock
 from parameterized import parameterized
 from singer.schema import Schema
 from singer.catalog import Catalog, CatalogEntry
-from tap_linkedin_ads.sync import get_page_size, get_streams_to_sync, update_currently_syncing, sync
+from tap_linkedin_ads.sync import get_account_scoped_streams, get_full_refresh_streams, get_page_size, get_stream_params, get_streams_to_sync, update_currently_syncing, sync
 from tap_linkedin_ads.client import LinkedinClient
 
 DEFAULT_PAGE_SIZE = 100
@@ -113,6 +114,49 @@ class TestSyncUtils(unittest.TestCase):
         # If `page_size` param is not available in the config then `get_page_size` should return default value
         self.assertEqual(actual_page_size, expected_page_size)
 
+    def test_video_ads_page_size(self):
+        """
+        Test that the page size of video_ads is read from its own config parameter.
+        """
+        self.assertEqual(get_page_size({'page_size': 300, 'video_ads_page_size': 500}, 'video_ads_page_size', 100), 500)
+        self.assertEqual(get_page_size({'page_size': 300}, 'video_ads_page_size', 100), 100)
+
+    def test_get_stream_params(self):
+        """
+        Test that the account filters and the video_ads page size are read from the config.
+        """
+        config = {'accounts': '1,2', 'video_ads_page_size': 50}
+        stream_params = get_stream_params(config, ['1', '2'], ['accounts', 'account_users', 'campaigns'])
+
+        self.assertEqual(stream_params, {
+            'video_ads': {'count': 50},
+            'accounts': {'search': '(id:(values:List(urn%3Ali%3AsponsoredAccount%3A1,urn%3Ali%3AsponsoredAccount%3A2)))'},
+            'account_users': {'accounts[0]': 'urn:li:sponsoredAccount:1', 'accounts[1]': 'urn:li:sponsoredAccount:2'}})
+
+    def test_get_stream_params_status_filter(self):
+        """
+        Test that the status filter is added to the searches of the status filtered streams out of a full refresh.
+        """
+        stream_params = get_stream_params({'status_filter': 'active, paused'}, [], ['campaigns'], ['campaign_groups'])
+
+        self.assertEqual(stream_params, {'video_ads': {'count': 100},
+                                         'campaigns': {'search': '(status:(values:List(ACTIVE,PAUSED)))'}})
+
+    @parameterized.expand([
+        ['test_no_status_filter', {}, {}, []],
+        ['test_first_sync', {'status_filter': 'ACTIVE'}, {}, ['campaign_groups', 'campaigns']],
+        ['test_recent_full_refresh', {'status_filter': 'ACTIVE'}, {'campaign_groups': 7, 'campaigns': 6}, ['campaign_groups']],
+        ['test_full_refresh_days', {'status_filter': 'ACTIVE', 'full_refresh_days': 1},
+         {'campaign_groups': 0, 'campaigns': 1}, ['campaigns']],
+    ])
+    def test_get_full_refresh_streams(self, name, config, full_refresh_days_ago, expected_streams):
+        """
+        Test that the status filtered streams are fully refreshed once their last full refresh is older than the full refresh days.
+        """
+        state = {'full_refreshes': {stream_name: (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+                                    for stream_name, days in full_refresh_days_ago.items()}}
+        self.assertEqual(get_full_refresh_streams(config, state), expected_streams)
+
     @parameterized.expand([
         ['test_only_parent_selected', ['campaigns'], ['campaigns']],
         ['test_only_single_child_selected', ['ad_analytics_by_campaign'], ['campaigns']],
@@ -128,6 +172,38 @@ class TestSyncUtils(unittest.TestCase):
         
         self.assertEqual(expected_parent_streams, actual_parent_streams)
     
+    def test_get_streams_to_sync_account_scoped(self):
+        """
+        Test that the account scoped children are synced like parent streams, without their parent.
+        """
+        self.assertEqual(get_streams_to_sync(['creatives', 'ad_analytics_by_campaign'], ['creatives']),
+                         ['creatives', 'campaigns'])
+        self.assertEqual(get_streams_to_sync(['creatives'], ['creatives']), ['creatives'])
+        # Verify that the campaigns are not synced for the account scoped analytics
+        self.assertEqual(get_streams_to_sync(['ad_analytics_by_creative'], ['creatives', 'ad_analytics_by_creative']),
+                         ['ad_analytics_by_creative'])
+
+    @parameterized.expand([
+        ['test_default_scope', {}, []],
+        ['test_account_scope', {'creatives_scope': 'account'}, ['creatives']],
+        ['test_campaign_scope', {'creatives_scope': 'campaign'}, []],
+        ['test_account_scoped_analytics', {'creatives_scope': 'campaign', 'analytics_scope': 'account'},
+         ['ad_analytics_by_campaign', 'ad_analytics_by_creative']],
+    ])
+    def test_get_account_scoped_streams(self, name, config, expected_streams):
+        """
+        Test that the creatives are synced for each campaign unless the account scope is configured.
+        """
+        self.assertEqual(get_account_scoped_streams(config), expected_streams)
+
+    def test_invalid_creatives_scope(self):
+        """
+        Test that an unknown creatives scope is rejected.
+        """
+        with self.assertRaises(Exception) as err:
+            get_account_scoped_streams({'creatives_scope': 'ad'})
+        self.assertEqual(str(err.exception), 'The entered creatives scope (ad) is invalid, expected one of account, campaign')
+
     @parameterized.expand([
         ['test_reset_existing_currently_syncing', {'currently_syncing': 'a'}, None, 0],
         ['test_new_set_currently_syncing', {}, 'a', 1]
@@ -164,4 +240,150 @@ class TestSync(unittest.TestCase):
                                               page_size=100, 
                                               start_date="2019-06-01T00:00:00Z", 
                                               selected_streams=['accounts', 'video_ads', 'account_users', 'campaigns', 'ad_analytics_by_campaign'], 
-                                              date_window_size=expected_date_window, account_list=[config['accounts']])
+                                              date_window_size=expected_date_window, account_list=[config['accounts']],
+                                              stream_params=get_stream_params(config, [config['accounts']], ['accounts', 'account_users', 'campaigns']),
+                                              analytics_executor=mock.ANY)
+
+    @mock.patch('tap_linkedin_ads.streams.LinkedInAds.sync_endpoint', autospec=True, return_value=(1, '2020-06-01T00:00:00Z'))
+    @mock.patch('tap_linkedin_ads.client.LinkedinClient.get')
+    def test_sync_resume_currently_syncing(self, mock_client_get, mock_sync_endpoint):
+        """
+        Test that sync starts from the currently syncing stream, keeps only its checkpoint
+        and removes the checkpoints of the completed streams.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        config = {'start_date': '2019-06-01T00:00:00Z', 'accounts': '12345'}
+        state = {'currently_syncing': 'campaigns',
+                 'checkpoints': {'campaigns': {'account': '12345', 'page_url': None},
+                                 'accounts': {'account': None, 'page_url': None}}}
+        synced_checkpoints = []
+        mock_sync_endpoint.side_effect = lambda stream_obj, **kwargs: \
+            (synced_checkpoints.append(dict(kwargs['state'].get('checkpoints', {}))), (1, '2020-06-01T00:00:00Z'))[1]
+
+        sync(client, config, CATALOG, state)
+
+        # Verify that the interrupted stream is synced first
+        self.assertEqual(['campaigns', 'accounts', 'account_users'],
+                         [call[0][0].tap_stream_id for call in mock_sync_endpoint.call_args_list])
+        # Verify that only the checkpoint of the interrupted stream is resumed
+        self.assertEqual({'campaigns': {'account': '12345', 'page_url': None}}, synced_checkpoints[0])
+        # Verify that the checkpoints are removed once the streams are completed
+        self.assertNotIn('checkpoints', state)
+
+    @mock.patch('tap_linkedin_ads.streams.LinkedInAds.sync_endpoint', autospec=True)
+    @mock.patch('tap_linkedin_ads.client.LinkedinClient.get')
+    def test_sync_full_refresh(self, mock_client_get, mock_sync_endpoint):
+        """
+        Test that a full refresh syncs the campaigns without the status filter and from the start date.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        config = {'start_date': '2019-06-01T00:00:00Z', 'accounts': '12345', 'status_filter': 'ACTIVE'}
+        state = {'bookmarks': {'campaigns': '2020-05-01T00:00:00Z'}}
+        synced_streams = {}
+        def sync_endpoint(stream_obj, **kwargs):
+            synced_streams[stream_obj.tap_stream_id] = (dict(stream_obj.params),
+                                                        dict(kwargs['state'].get('bookmarks', {})))
+            return 1, '2020-06-01T00:00:00Z'
+        mock_sync_endpoint.side_effect = sync_endpoint
+
+        sync(client, config, CATALOG, state)
+
+        # Verify that the campaigns are synced without the status filter and bookmark
+        campaign_params, campaign_bookmarks = synced_streams['campaigns']
+        self.assertNotIn('search', campaign_params)
+        self.assertNotIn('campaigns', campaign_bookmarks)
+        self.assertEqual(state['bookmarks']['campaigns'], '2020-06-01T00:00:00Z')
+        self.assertEqual(state['full_refreshes'], {'campaigns': datetime.date.today().isoformat()})
+
+        # Verify that the next sync filters the campaigns by status
+        sync(client, config, CATALOG, state)
+        self.assertEqual(synced_streams['campaigns'][0]['search'], '(status:(values:List(ACTIVE)))')
+        self.assertEqual(synced_streams['campaigns'][1]['campaigns'], '2020-06-01T00:00:00Z')
+
+    @mock.patch('tap_linkedin_ads.streams.LinkedInAds.process_records', return_value=('2020-06-01T00:00:00Z', 1))
+    @mock.patch('tap_linkedin_ads.client.LinkedinClient.request')
+    def test_sync_status_filter_creatives(self, mock_request, mock_process_records):
+        """
+        Test that with the status filter and the default creatives scope, the creatives are only
+        requested for the campaigns returned by the filtered search.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        config = {'start_date': '2019-06-01T00:00:00Z', 'accounts': '12345', 'status_filter': 'ACTIVE'}
+        today = datetime.date.today().isoformat()
+        state = {'full_refreshes': {'campaigns': today, 'campaign_groups': today}}
+        creatives_entry = CatalogEntry(
+            stream='creatives',
+            tap_stream_id='creatives',
+            key_properties='id',
+            schema=Schema(properties={'id': Schema(type='integer'), 'campaign_id': Schema(type='integer')}),
+            metadata=[{'breadcrumb': [], 'metadata': {'selected': True}},
+                      {'metadata': {'inclusion': 'automatic'}, 'breadcrumb': ['properties', 'id']},
+                      {'metadata': {'inclusion': 'available', 'selected': True},
+                       'breadcrumb': ['properties', 'campaign_id']}])
+        catalog = Catalog(streams=[CATALOG.get_stream('campaigns'), creatives_entry])
+        requests = []
+        def request(method, url, endpoint, **kwargs):
+            requests.append((endpoint, url))
+            if endpoint == 'campaigns':
+                return {'elements': [{'id': 1, 'status': 'ACTIVE'}], 'metadata': {}}
+            return {'elements': [{'id': 'urn:li:sponsoredCreative:10', 'campaign': 'urn:li:sponsoredCampaign:1'}],
+                    'metadata': {}}
+        mock_request.side_effect = request
+
+        sync(client, config, catalog, state)
+
+        # Verify that the campaigns are searched by status and the creatives requested for the returned campaign
+        self.assertEqual([endpoint for endpoint, _ in requests], ['campaigns', 'creatives'])
+        self.assertEqual(requests[0][1].params['search'], '(status:(values:List(ACTIVE)))')
+        self.assertEqual(requests[1][1].params['campaigns'], 'List(urn%3Ali%3AsponsoredCampaign%3A1)')
+
+    @mock.patch('tap_linkedin_ads.sync.ThreadPoolExecutor')
+    @mock.patch('tap_linkedin_ads.streams.LinkedInAds.sync_endpoint', return_value=(1, '2020-06-01T00:00:00Z'))
+    @mock.patch('tap_linkedin_ads.client.LinkedinClient.get')
+    def test_sync_shares_analytics_executor(self, mock_client_get, mock_sync_endpoint, mock_executor):
+        """
+        Test that a single analytics executor is passed to the sync of every stream and shut down after the sync.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        config = {'start_date': '2019-06-01T00:00:00Z', 'accounts': '12345'}
+
+        sync(client, config, CATALOG, {})
+
+        self.assertEqual(mock_executor.call_count, 1)
+        self.assertEqual({id(call[1]['analytics_executor']) for call in mock_sync_endpoint.call_args_list},
+                         {id(mock_executor.return_value)})
+        mock_executor.return_value.shutdown.assert_called_once()
+
+    @mock.patch('tap_linkedin_ads.sync.AnalyticsCache')
+    @mock.patch('tap_linkedin_ads.streams.LinkedInAds.sync_endpoint', side_effect=Exception('sync error'))
+    @mock.patch('tap_linkedin_ads.client.LinkedinClient.get')
+    def test_sync_closes_analytics_cache(self, mock_client_get, mock_sync_endpoint, mock_analytics_cache):
+        """
+        Test that the analytics cache is opened with the default immutable days for an empty string
+        and closed when the sync fails.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        config = {'start_date': '2019-06-01T00:00:00Z', 'accounts': '12345',
+                  'analytics_cache_path': 'analytics.db', 'analytics_cache_immutable_days': ''}
+
+        with self.assertRaises(Exception):
+            sync(client, config, CATALOG, {})
+
+        mock_analytics_cache.assert_called_once_with('analytics.db', 30)
+        mock_analytics_cache.return_value.close.assert_called_once()
+        self.assertIsNone(client.analytics_cache)
+
+    @mock.patch('tap_linkedin_ads.client.LinkedinClient.request',
+                return_value={'elements': [{'id': 'urn:li:sponsoredAccount:12345'}], 'metadata': {}})
+    def test_sync_accounts_reuses_check_accounts(self, mock_request):
+        """
+        Test that the first page of the accounts stream is the cached response of check_accounts.
+        """
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        config = {'start_date': '2019-06-01T00:00:00Z', 'accounts': '12345'}
+        client.cache_endpoints('accounts')
+
+        client.check_accounts(config)
+        sync(client, config, Catalog(streams=[CATALOG.get_stream('accounts')]), {})
+
+        self.assertEqual(mock_request.call_count, 1)
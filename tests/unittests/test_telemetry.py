@@ -0,0 +1,111 @@
+import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from tap_linkedin_ads import telemetry
+from tap_linkedin_ads.client import LinkedinClient, LinkedInRateLimitExceeededError
+from tap_linkedin_ads.telemetry import Metric, MetricCounters, metric_tags, get_metric_tags
+
+def get_points(mock_log):
+    return [(point.metric_type, point.metric, point.value, point.tags) for _, point in
+            (call[0] for call in mock_log.call_args_list)]
+
+class TestMetricTags(unittest.TestCase):
+    """
+    Test the tags of the metrics of the current context.
+    """
+    def test_nested_tags(self):
+        """
+        Test that the tags of the nested blocks are merged and restored on exit.
+        """
+        with metric_tags(stream='campaigns', account='1'):
+            with metric_tags(stream='creatives', parent_id=[1, 2]):
+                self.assertEqual(get_metric_tags(), {'stream': 'creatives', 'account': '1', 'parent_id': '1,2'})
+            self.assertEqual(get_metric_tags(parent_id=None), {'stream': 'campaigns', 'account': '1'})
+        self.assertEqual(get_metric_tags(), {})
+
+    def test_worker_tags(self):
+        """
+        Test that a worker thread running in a copy of the context has the tags of the submitting thread.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with metric_tags(stream='ad_analytics_by_campaign', parent_id=1):
+                future = executor.submit(contextvars.copy_context().run, get_metric_tags)
+            self.assertEqual(future.result(), {'stream': 'ad_analytics_by_campaign', 'parent_id': 1})
+
+class TestMetricCounters(unittest.TestCase):
+    """
+    Test the counters aggregated by metric and tags.
+    """
+    def setUp(self):
+        # Drop the counters incremented by the other tests
+        telemetry.COUNTERS.values.clear()
+
+    @mock.patch('tap_linkedin_ads.telemetry.metrics.log')
+    def test_flush(self, mock_log):
+        """
+        Test that the counters are emitted once per metric and tags when flushed.
+        """
+        counters = MetricCounters()
+        with metric_tags(stream='campaigns'):
+            counters.increment(Metric.page_count)
+            counters.increment(Metric.page_count)
+            counters.increment(Metric.http_wire_bytes, 100, endpoint='campaigns')
+        counters.increment(Metric.page_count, stream='creatives')
+        self.assertEqual(mock_log.call_count, 0)
+
+        counters.flush()
+        self.assertEqual(sorted(get_points(mock_log), key=str),
+                         sorted([('counter', 'page_count', 2, {'stream': 'campaigns'}),
+                                 ('counter', 'http_wire_bytes', 100, {'stream': 'campaigns', 'endpoint': 'campaigns'}),
+                                 ('counter', 'page_count', 1, {'stream': 'creatives'})], key=str))
+        # Verify that the counters are reset once emitted
+        counters.flush()
+        self.assertEqual(mock_log.call_count, 3)
+
+    @mock.patch('tap_linkedin_ads.telemetry.metrics.log')
+    def test_log_backoff(self, mock_log):
+        """
+        Test that a retry is counted by status and its sleep is emitted as a timer.
+        """
+        error = LinkedInRateLimitExceeededError('HTTP-error-code: 429')
+        error.status_code = 429
+        with metric_tags(stream='campaigns'):
+            telemetry.log_backoff({'exception': error, 'wait': 1.5, 'tries': 1})
+        telemetry.flush_counters()
+
+        tags = {'stream': 'campaigns', 'error': 'LinkedInRateLimitExceeededError', 'http_status_code': 429}
+        self.assertEqual(get_points(mock_log), [('timer', 'backoff_duration', 1.5, tags),
+                                                ('counter', 'retry_count', 1, tags)])
+
+class TestRequestMetrics(unittest.TestCase):
+    """
+    Test the metrics of the requests of the client.
+    """
+    def setUp(self):
+        # Drop the counters incremented by the other tests
+        telemetry.COUNTERS.values.clear()
+
+    @mock.patch('singer.metrics.log')
+    @mock.patch('tap_linkedin_ads.client.requests.Session.request')
+    def test_request_metrics(self, mock_request, mock_log):
+        """
+        Test that the request timer and counters are tagged with the stream, account and parent ID.
+        """
+        mock_request.return_value = mock.Mock(status_code=200, headers={}, content=b'{}', raw=None,
+                                              json=mock.Mock(return_value={}))
+        client = LinkedinClient('client_id', 'client_secret', 'refresh_token', 'access_token', 'config_path')
+        with metric_tags(stream='creatives', account='1', parent_id=2):
+            client.get(url='https://api.linkedin.com/rest/creatives', endpoint='creatives')
+        telemetry.flush_counters()
+
+        points = {point[1]: point for point in get_points(mock_log)}
+        self.assertEqual({'stream': 'creatives', 'account': '1', 'parent_id': 2},
+                         {key: points['http_request_duration'][3][key] for key in ('stream', 'account', 'parent_id')})
+        self.assertEqual(points['http_request_count'][2:],
+                         (1, {'stream': 'creatives', 'account': '1', 'parent_id': 2, 'endpoint': 'creatives',
+                              'http_status_code': 200}))
+        self.assertEqual(points['http_wire_bytes'][2], 2)
+        self.assertEqual(points['http_decoded_bytes'][2], 2)
+        self.assertNotIn('wire_bytes', points['http_request_duration'][3])
+        self.assertEqual(points['json_decode_duration'][3]['parent_id'], 2)
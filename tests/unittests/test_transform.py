@@ -5,7 +5,7 @@ from parameterized import parameterized
 from tap_linkedin_ads.transform import (convert, snake_case_to_camel_case, convert_array, convert_json,
                                         transform_accounts, transform_analytics, transform_json,
                                         transform_campaigns, transform_creatives, transform_audit_fields,
-                                        transform_urn, transform_data, string_to_decimal)
+                                        transform_urn, transform_data, string_to_decimal, flatten_facets)
 
 
 class TestConvertCamelcaseToSnakeCase(unittest.TestCase):
@@ -124,6 +124,12 @@ class TestStringToDecimal(unittest.TestCase):
     @parameterized.expand([
         ("10.111", Decimal("10.111")),
         ("abc", None),
+        ("0", Decimal("0")),
+        ("-10.5", Decimal("-10.5")),
+        ("$1,234.50", Decimal("1234.50")),
+        ("-$1,234.50", Decimal("-1234.50")),
+        ("1.2.3", None),
+        (None, None),
     ])
     def test_correct_value(self, value, expected_value):
         """
@@ -135,6 +141,15 @@ class TestStringToDecimal(unittest.TestCase):
         # Verify return value is expected
         self.assertEqual(return_value, expected_value)
 
+    def test_cached_value(self):
+        """
+        Test that the repeated values are decoded once.
+        """
+        string_to_decimal("123.456789")
+        with mock.patch("tap_linkedin_ads.transform.Decimal") as mock_decimal:
+            self.assertEqual(string_to_decimal("123.456789"), Decimal("123.456789"))
+        self.assertEqual(mock_decimal.call_count, 0)
+
 
 class TestTransformAccounts(unittest.TestCase):
     """
@@ -299,6 +314,34 @@ class TestTransformCampaign(unittest.TestCase):
         self.assertEqual(transformed_dict, expected_dict)
 
 
+class TestFlattenFacets(unittest.TestCase):
+    """
+    Test `flatten_facets` function.
+    """
+
+    @parameterized.expand([
+        ("urn_list", {"employers": ["urn:li:organization:1"]}, [{"type": "employers", "values": ["urn:li:organization:1"]}]),
+        ("dict_list", {"employers": [{"1": 1}, {"2": 2}]}, [{"type": "employers", "values": ["{'1': 1}", "{'2': 2}"]}]),
+        ("dict", {"employers": {"1": 1}}, [{"type": "employers", "values": ["{'1': 1}"]}]),
+        ("empty_list", {"employers": []}, [{"type": "employers", "values": []}]),
+        ("scalar", {"employers": 1}, [{"type": "employers", "values": ["1"]}]),
+    ])
+    def test_flatten_facets(self, name, facets, expected_facets):
+        """
+        Test that the facets are flattened in order to a list of type/values.
+        """
+        self.assertEqual(flatten_facets(facets), expected_facets)
+
+    def test_transform_campaigns_missing_sections(self):
+        """
+        Test that the missing targeting sections are flattened to empty lists.
+        """
+        transformed_dict = transform_campaigns({"targeting": {}, "targeting_criteria": {}})
+
+        self.assertEqual(transformed_dict, {"targeting": {"excluded_targeting_facets": [], "included_targeting_facets": []},
+                                            "targeting_criteria": {"exclude": []}})
+
+
 class TestTransformCreatives(unittest.TestCase):
     """
     Test `transform_creatives` function.
@@ -322,10 +365,28 @@ class TestTransformCreatives(unittest.TestCase):
     test_dict_2 = {
         "refrence": ""
     }
+    test_dict_3 = {
+        "variables": {
+            "click_uri": "https://www.example.com",
+            "data": {
+                "com.linkedin.ads.first": {"1": 1},
+                "com.linkedin.ads.second": {"2": {"3": 3}}
+            }
+        }
+    }
+    exp_dict_3 = {
+        'variables': {
+            'click_uri': 'https://www.example.com',
+            'type': 'com.linkedin.ads.second',
+            'values': []
+        }
+    }
 
     @parameterized.expand([
         (test_dict_1, exp_dict_1),
         (test_dict_2, {**test_dict_2}),
+        (test_dict_3, exp_dict_3),
+        ({"variables": {"data": {}}}, {"variables": {"data": {}}}),
     ])
     def test_transform_creatives(self, test_dict_1, expected_dict):
         """